@@ -1,13 +1,25 @@
 import streamlit as st
 import pandas as pd
-import joblib
-import requests
 import plotly.express as px
 import plotly.graph_objects as go
 #import base64 #for adding the background
 from datetime import datetime, timedelta
 import numpy as np
-
+import os
+import time
+
+from gradguide import telemetry
+from gradguide.charts import FigureTemplate
+from gradguide.core import Predictor, UniversityLookup
+from gradguide.countries import canonical_country_name
+from gradguide.explain import top_reasons
+from gradguide.features import FALLBACK_LABELS, path_label
+from gradguide.finance import (DEFAULT_SCENARIOS, Assumptions, cost_breakdown, payment_grid,
+                               repayment_schedule, simulate, summarize)
+from gradguide.rankings import default_metrics, format_rankings, ranking_table
+
+# Timed from here to the end of the pages
+rerun_started = time.perf_counter()
 
 # Page config
 st.set_page_config(
@@ -19,336 +31,195 @@ st.set_page_config(
 
 # Load model
 @st.cache_resource
-def load_model():
-    return joblib.load("career_path_model.pkl")
-
-model = load_model()
-
-# --- Load Static Data at the Start ---
-# This data can be moved to an external file like universities.json for easier updates
-UNIVERSITY_DATA = {
-    "USA": [
-        "Massachusetts Institute of Technology", "Stanford University", "Harvard University",
-        "California Institute of Technology", "University of California Berkeley",
-        "Carnegie Mellon University", "Georgia Institute of Technology", "University of Illinois",
-        "University of Michigan", "University of Washington", "Cornell University",
-        "University of Texas at Austin", "Princeton University", "UCLA", "Columbia University"
-    ],
-    "UK": [
-        "University of Cambridge", "University of Oxford", "Imperial College London",
-        "University College London", "King's College London", "University of Edinburgh",
-        "University of Manchester", "London School of Economics", "University of Warwick",
-        "University of Bristol", "University of Glasgow", "Durham University",
-        "University of Sheffield", "University of Nottingham", "University of Southampton"
-    ],
-    "Germany": [
-        "Technical University of Munich", "ETH Zurich", "University of Heidelberg",
-        "Ludwig Maximilian University", "Humboldt University Berlin", "RWTH Aachen University",
-        "University of Freiburg", "University of Göttingen", "Technical University of Berlin",
-        "University of Hamburg", "University of Stuttgart", "Karlsruhe Institute of Technology",
-        "University of Cologne", "University of Münster", "University of Würzburg"
-    ],
-    "India": [
-        "Indian Institute of Technology Delhi", "Indian Institute of Technology Bombay",
-        "Indian Institute of Technology Madras", "Indian Institute of Technology Kanpur",
-        "Indian Institute of Technology Kharagpur", "Indian Institute of Science Bangalore",
-        "National Institute of Technology Trichy", "Delhi Technological University",
-        "Birla Institute of Technology", "Vellore Institute of Technology",
-        "Indian Institute of Technology Roorkee", "BITS Pilani", "Anna University",
-        "Jadavpur University", "Indian Institute of Technology Guwahati"
-    ],
-    "Canada": [
-        "University of Toronto", "University of British Columbia", "McGill University",
-        "University of Alberta", "University of Waterloo", "McMaster University",
-        "University of Montreal", "University of Calgary", "Queen's University",
-        "Simon Fraser University", "University of Ottawa", "Western University",
-        "University of Victoria", "Concordia University", "Carleton University"
-    ],
-    "Australia": [
-        "Australian National University", "University of Melbourne", "University of Sydney",
-        "University of Queensland", "University of New South Wales", "Monash University",
-        "University of Western Australia", "University of Adelaide", "Macquarie University",
-        "Queensland University of Technology", "University of Technology Sydney",
-        "Griffith University", "Deakin University", "Curtin University", "RMIT University"
-    ]
-}
-
-# Extended university data with more comprehensive mappings
-EXTENDED_UNIVERSITY_DATA = {
-    "United States": UNIVERSITY_DATA["USA"],
-    "USA": UNIVERSITY_DATA["USA"],
-    "US": UNIVERSITY_DATA["USA"],
-    "United Kingdom": UNIVERSITY_DATA["UK"],
-    "UK": UNIVERSITY_DATA["UK"],
-    "Britain": UNIVERSITY_DATA["UK"],
-    "Germany": UNIVERSITY_DATA["Germany"],
-    "Deutschland": UNIVERSITY_DATA["Germany"],
-    "India": UNIVERSITY_DATA["India"],
-    "Bharat": UNIVERSITY_DATA["India"],
-    "Canada": UNIVERSITY_DATA["Canada"],
-    "Australia": UNIVERSITY_DATA["Australia"],
-    "AUS": UNIVERSITY_DATA["Australia"]
-}
-
-
-# --- Function to Fetch Data with Caching ---
-@st.cache_data(ttl=3600)  # Cache data for 1 hour
-def get_university_data(country):
-    """Fetches university data from API or fallback, returns a DataFrame."""
-    try:
-        url = f"http://universities.hipolabs.com/search?country={country}"
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-
-        data = response.json()
-        if not data:
-            st.info(f"Live search returned no results for {country}. Showing a cached list.")
-            univ_names = UNIVERSITY_DATA.get(country, [])
-        else:
-            univ_names = [u["name"] for u in data[:15]]
+def predictor():
+    # GRADGUIDE_FAST_PATH=1 opts into the compiled engine: same predictions, lower
+    # single-profile latency, and its arrays are memory-mapped so all workers share them.
+    # The form offers a few labels the model has no code for; those are scored as the
+    # fallback label and the page says so.
+    return Predictor(unknown="fallback")
 
-    except requests.exceptions.RequestException:
-        st.warning(f"Live university service is unavailable. Showing a cached list.")
-        univ_names = UNIVERSITY_DATA.get(country, [])
 
-    if not univ_names:
-        return pd.DataFrame()  # Return empty DataFrame if no names found
+# Switches to a newly promoted model version (checked every few seconds) between reruns
+predictor().refresh()
 
-    universities = []
-    for univ in univ_names:
-        universities.append({
-            'University': univ,
-            'QS Ranking': np.random.randint(1, 500),
-            'Acceptance Rate': f"{np.random.randint(15, 85)}%",
-            'Avg Fee (Lakhs)': np.random.randint(20, 100) if country != "India" else np.random.randint(5, 25),
-            'Program Strength': np.random.choice(['⭐⭐⭐⭐⭐', '⭐⭐⭐⭐', '⭐⭐⭐'])
-        })
-    return pd.DataFrame(universities)
-
-
-def get_cached_universities(country_input):
-    """Get cached university data with flexible country matching."""
-    # Try direct lookup first
-    if country_input in EXTENDED_UNIVERSITY_DATA:
-        return EXTENDED_UNIVERSITY_DATA[country_input]
-    
-    # Try case-insensitive lookup
-    country_lower = country_input.lower()
-    for key, value in EXTENDED_UNIVERSITY_DATA.items():
-        if key.lower() == country_lower:
-            return value
-    
-    # Try partial matching
-    for key, value in EXTENDED_UNIVERSITY_DATA.items():
-        if country_lower in key.lower() or key.lower() in country_lower:
-            return value
-    
-    return []
 
+def show_chart(fig, chart):
+    """``st.plotly_chart`` at full width, timed as the ``chart`` render."""
+    with telemetry.span("chart_render", chart=chart):
+        st.plotly_chart(fig, use_container_width=True)
 
-def fetch_universities_with_fallback(country_input):
-    """Fetch universities with robust fallback mechanism."""
-    try:
-        # Try API call first
-        url = f"http://universities.hipolabs.com/search?country={country_input}"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        if data:
-            return data, "api"
-        else:
-            # API returned empty, use cached data
-            cached_unis = get_cached_universities(country_input)
-            if cached_unis:
-                # Convert to API format for consistency
-                cached_data = [{"name": uni, "web_pages": [f"https://{uni.lower().replace(' ', '')}.edu"]} for uni in cached_unis]
-                return cached_data, "cached"
-            else:
-                return [], "none"
-    
-    except requests.exceptions.RequestException as e:
-        # API failed, use cached data
-        cached_unis = get_cached_universities(country_input)
-        if cached_unis:
-            cached_data = [{"name": uni, "web_pages": [f"https://{uni.lower().replace(' ', '')}.edu"]} for uni in cached_unis]
-            return cached_data, "cached"
-        else:
-            return [], "error"
 
+@st.cache_resource
+@telemetry.timed("chart_build", chart="timeline")
+def timeline_figure(prediction):
+    """Builds the preparation timeline chart; there is one per prediction class."""
+    if prediction == 1:  # MS
+        timeline_data = {
+            'Phase': ['Exam Prep', 'Applications', 'Interviews', 'Visa Process'],
+            'Duration': [6, 3, 2, 2],
+            'Priority': ['High', 'High', 'Medium', 'High']
+        }
+    else:  # MTech
+        timeline_data = {
+            'Phase': ['GATE Prep', 'College Research', 'Applications', 'Counseling'],
+            'Duration': [8, 2, 1, 1],
+            'Priority': ['High', 'Medium', 'High', 'Medium']
+        }
+
+    timeline_df = pd.DataFrame(timeline_data)
+    return px.bar(timeline_df, x='Phase', y='Duration', color='Priority',
+                  title="Preparation Timeline (Months)")
+
+
+@st.cache_resource(max_entries=256)
+@telemetry.timed("chart_build", chart="contributions")
+def contribution_figure(reasons):
+    """Horizontal bars of how much each answer moved the MS (Abroad) probability.
+
+    Cached on the reasons, so resubmitting a profile reuses its figure.
+    """
+    reasons_df = pd.DataFrame(reasons, columns=["Feature", "Contribution"])
+    reasons_df["Feature"] = reasons_df["Feature"].str.strip()
+    reasons_df["Effect"] = np.where(reasons_df["Contribution"] >= 0,
+                                    "Towards MS (Abroad)", "Towards MTech (India)")
+    fig = px.bar(reasons_df[::-1], x="Contribution", y="Feature", color="Effect", orientation="h",
+                 color_discrete_map={"Towards MS (Abroad)": "#2e7d32",
+                                     "Towards MTech (India)": "#1565c0"},
+                 title="What Drove This Recommendation")
+    fig.update_layout(xaxis_tickformat="+.0%", yaxis_title=None)
+    return fig
 
-def search_university_by_name_with_fallback(university_name):
-    """Search for specific university with fallback."""
-    try:
-        url = f"http://universities.hipolabs.com/search?name={university_name}"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        if data:
-            return data, "api"
-        else:
-            # Search in cached data
-            found_unis = []
-            search_term = university_name.lower()
-            
-            for country_unis in EXTENDED_UNIVERSITY_DATA.values():
-                for uni in country_unis:
-                    if search_term in uni.lower():
-                        found_unis.append({
-                            "name": uni,
-                            "country": "Multiple countries available",
-                            "state-province": "N/A",
-                            "web_pages": [f"https://{uni.lower().replace(' ', '')}.edu"]
-                        })
-            
-            return found_unis, "cached" if found_unis else "none"
-    
-    except requests.exceptions.RequestException:
-        # API failed, search in cached data
-        found_unis = []
-        search_term = university_name.lower()
-        
-        for country_unis in EXTENDED_UNIVERSITY_DATA.values():
-            for uni in country_unis:
-                if search_term in uni.lower():
-                    found_unis.append({
-                        "name": uni,
-                        "country": "Multiple countries available",
-                        "state-province": "N/A",
-                        "web_pages": [f"https://{uni.lower().replace(' ', '')}.edu"]
-                    })
-        
-        return found_unis, "cached" if found_unis else "error"
 
+@st.cache_resource
+@telemetry.timed("chart_build", chart="importances")
+def importance_figure(_model, version):
+    """Global feature importances of a model version; the same for every student."""
+    importances = pd.Series(_model.importances()).sort_values()
+    importances.index = importances.index.str.strip()
+    fig = px.bar(x=importances.values, y=importances.index, orientation="h",
+                 labels={"x": "Importance", "y": ""},
+                 title="What the Model Weighs Overall")
+    fig.update_layout(xaxis_tickformat=".0%")
+    return fig
 
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        color: white;
-        text-align: center;
-    }
-    .metric-card {
-        background: #f0f2f6;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 4px solid #667eea;
-    }
-    .success-box {
-        background: linear-gradient(45deg, #56CCF2, #2F80ED);
-        padding: 1rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
 
-# Header
-st.markdown("""
-<div class="main-header">
-    <h1>🎓 GradGuide - Smart Career Planner</h1>
-    <p>Your AI-powered companion for MS/MTech decision making</p>
-</div>
-""", unsafe_allow_html=True)
+# Charts redrawn on most reruns are styled once per process; reruns refill their traces
+COST_CATEGORIES = ['Tuition', 'Living', 'Others', 'Scholarship (Saved)', 'Family Support', 'part-time']
+EXAMS = ['GRE Verbal', 'GRE Quant', 'TOEFL', 'GATE', 'IELTS']
 
-# Sidebar navigation
-st.sidebar.title("🗺 Navigation")
-step = st.sidebar.radio("Choose Your Journey", [
-    "🎯 Career Prediction",
-    "🏛 University Explorer",
-    "💰 Financial Planner",
-    "📊 Progress Tracker"
-])
 
-# Encoding dictionaries
-career_goal_dict = {"Academia": 0, "Industry": 1, "Research": 2}
-country_dict = {"USA": 0, "UK": 1, "Germany": 2, "India": 3, "Other": 4}
+@st.cache_resource
+@telemetry.timed("chart_build", chart="waterfall")
+def waterfall_template():
+    """Financial breakdown waterfall plus the two scenario percentile bands."""
+    fig = go.Figure()
+    fig.add_trace(go.Waterfall(
+        name="Financial Flow",
+        orientation="v",
+        x=COST_CATEGORIES,
+        connector={"line": {"color": "rgb(63, 63, 63)"}},
+    ))
+    for width, label in [(2, "5th-95th percentile"), (8, "25th-75th percentile")]:
+        fig.add_trace(go.Scatter(
+            x=COST_CATEGORIES, mode="markers", name=label,
+            marker={"color": "rgba(0, 0, 0, 0)"},
+            error_y={"type": "data", "symmetric": False, "thickness": width, "width": 0,
+                     "color": "rgba(118, 75, 162, 0.6)"},
+        ))
+    fig.update_layout(title="Financial Breakdown (INR Lakhs)", showlegend=True)
+    return FigureTemplate(fig)
+
 
-# ================ CAREER PREDICTION ================
-if step == "🎯 Career Prediction":
-    #set_background("https://images.unsplash.com/photo-1506784983877-45594efa4cbe")
-    st.header("🎯 Find Your Perfect Path")
+@st.cache_resource
+@telemetry.timed("chart_build", chart="repayment")
+def repayment_template():
+    """Stacked monthly principal and interest; traces are Principal, then Interest."""
+    # plotly express drops traces without rows, so start from a one-month placeholder
+    placeholder = pd.DataFrame({"Month": [1], "Principal": [0.0], "Interest": [0.0]})
+    return FigureTemplate(px.area(placeholder, x="Month", y=["Principal", "Interest"],
+                                  title="Monthly Repayment Split (INR Lakhs)"))
 
-    col1, col2 = st.columns(2)
 
-    with col1:
-        st.subheader("📚 Academic Profile")
-        cgpa = st.number_input("CGPA", 0.0, 10.0, 7.5, step=0.1, help="Your current CGPA")
-        gre = st.number_input("GRE Score", 0, 340, 0, help="Enter 0 if not taken")
-        toefl = st.number_input("TOEFL Score", 0, 120, 0, help="Enter 0 if not taken")
-        gate_score = st.number_input("GATE Score", 0, 1000, 0, help="Enter 0 if not taken")
+@st.cache_resource
+@telemetry.timed("chart_build", chart="progress")
+def progress_template():
+    """One bar per exam in ``EXAMS``."""
+    fig = go.Figure(go.Bar(
+        x=EXAMS,
+        marker_color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
+    ))
+    fig.update_layout(title="Preparation Progress Overview", yaxis_title="Progress (%)")
+    return FigureTemplate(fig)
+
+
+# Financial Planner scenario engine
+SCENARIO_COUNTS = [100_000, 200_000, 500_000, 1_000_000]
+LOAN_RATES = [8, 9, 10, 11, 12, 13, 14]  # % p.a.
+LOAN_TENURES = [3, 5, 7, 10, 15]  # years
+
+
+@st.cache_data(max_entries=64)
+def scenario_summary(tuition, living, misc, scholarship, family_support, part_time,
+                     n_scenarios, assumptions):
+    """Monte Carlo loan statistics; fixed seed, so reruns show the same numbers."""
+    return summarize(simulate(tuition, living, misc, scholarship, family_support, part_time,
+                              n=n_scenarios, assumptions=assumptions))
+
+
+@st.cache_resource
+def university_lookup():
+    """Catalogue/API/built-in university lookups shared by every session."""
+    # The catalogue refreshes itself from the full hipolabs dump in the background
+    refresh = os.environ.get("GRADGUIDE_CATALOGUE_REFRESH", "1") == "1"
+    return UniversityLookup(refresh=refresh)
+
+
+def get_university_data(country):
+    """Fetches university data from API or fallback, returns a DataFrame."""
+    country = canonical_country_name(country)
+    records, source = university_lookup().top_universities(country)
+    if source == "none":
+        st.info(f"Live search returned no results for {country}. Showing a cached list.")
+    elif source == "error":
+        st.warning(f"Live university service is unavailable. Showing a cached list.")
+    return _ranking_table([u["name"] for u in records], country)
+
+
+@telemetry.timed("ranking_table")
+def _ranking_table(univ_names, country):
+    """Builds the ranking table shown for a list of university names."""
+    if not univ_names:
+        return pd.DataFrame()  # Return empty DataFrame if no names found
+    # Same figures for a university on every rerun; real ones from the metrics CSV if set
+    return format_rankings(ranking_table(univ_names, country, metrics=default_metrics()))
+
+
+def fetch_universities_with_fallback(country_input):
+    """Fetch universities with robust fallback mechanism."""
+    return university_lookup().by_country(country_input)
 
-    with col2:
-        st.subheader("🎯 Profile Strengths")
-        sop = st.select_slider("SOP Quality", [1, 2, 3, 4, 5], 3, help="Statement of Purpose strength")
-        lor = st.select_slider("LOR Quality", [1, 2, 3, 4, 5], 3, help="Letter of Recommendation strength")
-        univ_rating = st.select_slider("Target University Rating", [1, 2, 3, 4, 5], 3)
-        chance = st.slider("Self-assessed Admission Chance", 0.0, 1.0, 0.5, help="Your confidence level")
-
-    col3, col4 = st.columns(2)
-    with col3:
-        research = st.selectbox("Research Experience", ["No", "Yes"])
-        career_goal = st.selectbox("Career Goal", ["Industry", "Academia", "Research", "Entrepreneurship"])
-
-    with col4:
-        budget = st.number_input("Budget (INR Lakhs)", 1, 200, 25)
-        pref_country = st.selectbox("Preferred Country", ["India", "USA", "UK", "Germany", "Canada", "Other"])
-
-    if st.button("🚀 Get My Recommendation", type="primary"):
-        # Process inputs
-        research_val = 1 if research == "Yes" else 0
-        career_goal_val = career_goal_dict.get(career_goal, 1)
-        country_val = country_dict.get(pref_country, 4)
-
-        input_data = pd.DataFrame([{
-            "CGPA": cgpa, "GRE Score": gre, "TOEFL Score": toefl,
-            "SOP": sop, "LOR ": lor, "University Rating": univ_rating,
-            "Chance of Admit ": chance, "Research": research_val,
-            "Budget (INR Lakhs)": budget, "Career Goal": career_goal_val,
-            "GATE Score": gate_score, "Preferred Country": country_val
-        }])
-
-        prediction = model.predict(input_data)[0]
-        path = "MS (Abroad)" if prediction == 1 else "MTech (India)"
-
-        st.markdown(f"""
-        <div class="success-box">
-            <h2>🎯 Recommended Path: {path}</h2>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Preparation timeline
-        st.subheader("📅 Suggested Preparation Timeline")
-
-        if prediction == 1:  # MS
-            timeline_data = {
-                'Phase': ['Exam Prep', 'Applications', 'Interviews', 'Visa Process'],
-                'Duration': [6, 3, 2, 2],
-                'Priority': ['High', 'High', 'Medium', 'High']
-            }
-        else:  # MTech
-            timeline_data = {
-                'Phase': ['GATE Prep', 'College Research', 'Applications', 'Counseling'],
-                'Duration': [8, 2, 1, 1],
-                'Priority': ['High', 'Medium', 'High', 'Medium']
-            }
-
-        timeline_df = pd.DataFrame(timeline_data)
-        fig = px.bar(timeline_df, x='Phase', y='Duration', color='Priority',
-                     title="Preparation Timeline (Months)")
-        st.plotly_chart(fig, use_container_width=True)
 
-# ================ UNIVERSITY EXPLORER (API BASED WITH FALLBACK) ================
-elif step == "🏛 University Explorer":
-    st.header("🏛 Discover Your Dream Universities")
+def search_university_by_name_with_fallback(university_name):
+    """Search for specific university with fallback."""
+    return university_lookup().search_name(university_name)
+
 
+def university_matches(**profile):
+    """Universities in the preferred country that best fit the profile and budget."""
+    matches, source = university_lookup().match_universities(**profile)
+    if matches is None or matches.empty:
+        return matches, source
+    matches = format_rankings(matches)
+    matches["Admit Chance"] = matches["Admit Chance"].map("{:g}%".format)
+    return matches, source
+
+
+# Independent page sections: each reruns on its own when one of its widgets changes
+@st.fragment
+@telemetry.timed("fragment", fragment="country_search")
+@telemetry.profiled("fragment-country_search")
+def country_search():
+    """Country search of the University Explorer."""
     country = st.text_input("Enter Country (e.g., United States, Canada, Germany)").strip()
 
     program = st.selectbox("Program Type", ["MS", "MTech", "PhD"])
@@ -362,6 +233,8 @@ elif step == "🏛 University Explorer":
                     # Display source information
                     if source == "api":
                         st.success(f"✅ Found {len(data)} universities in {country} (Live data)")
+                    elif source == "local":
+                        st.success(f"✅ Found {len(data)} universities in {country}")
                     elif source == "cached":
                         st.info(f"📋 Showing cached universities for {country} (API unavailable)")
                     
@@ -372,7 +245,8 @@ elif step == "🏛 University Explorer":
                         }
                         for u in data[:20]  # Limit to top 20
                     ]
-                    df = pd.DataFrame(univ_list)
+                    with telemetry.span("dataframe_build", table="universities"):
+                        df = pd.DataFrame(univ_list)
 
                     st.success(f"🎓 Top {program} Universities in {country}")
                     st.dataframe(df, use_container_width=True)
@@ -383,8 +257,13 @@ elif step == "🏛 University Explorer":
                     st.error(f"⚠ Failed to fetch universities for '{country}' and no cached data available. Please try a different country name.")
         else:
             st.warning("⚠ Please enter a country name.")
-    
-    st.markdown("---")
+
+
+@st.fragment
+@telemetry.timed("fragment", fragment="name_search")
+@telemetry.profiled("fragment-name_search")
+def name_search():
+    """University name search of the University Explorer."""
     university_name = st.text_input("🎯 Or Search for a Specific University")
 
     if st.button("🔎 Search University by Name"):
@@ -395,6 +274,8 @@ elif step == "🏛 University Explorer":
                 if results:
                     if source == "api":
                         st.success(f"✅ Found {len(results)} universities matching '{university_name}' (Live data)")
+                    elif source == "local":
+                        st.success(f"✅ Found {len(results)} universities matching '{university_name}'")
                     elif source == "cached":
                         st.info(f"📋 Found {len(results)} universities matching '{university_name}' in cached data (API unavailable)")
 
@@ -413,91 +294,67 @@ elif step == "🏛 University Explorer":
         else:
             st.warning("⚠ Please enter a university name to search.")
 
-# ================ FINANCIAL PLANNER ================
-elif step == "💰 Financial Planner":
-    st.header("💰 Smart Financial Planning")
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.subheader("💸 Cost Breakdown")
-        tuition = st.number_input("Tuition Fee (INR Lakhs)", 1, 200, 40)
-        living = st.number_input("Living Expenses (INR Lakhs)", 1, 100, 25)
-        misc = st.number_input("Other Expenses (INR Lakhs)", 1, 50, 10)
-
-    with col2:
-        st.subheader("💡 Financial Aid")
-        scholarship = st.slider("Expected Scholarship (%)", 0, 100, 20)
-        family_support = st.number_input("Family Support (INR Lakhs)", 0, 150, 30)
-        income_source = st.number_input("Another source of income/part-time",0,100000,300)
-        #loan_needed = st.checkbox("Education Loan Required?")
-
-    # Calculate costs
-    total_cost = tuition + living + misc
-    scholarship_amount = (tuition * scholarship) / 100
-    part_time =income_source / 100
-    net_cost = total_cost - scholarship_amount - family_support-part_time
-
-    # Financial breakdown chart
-    cost_data = {
-        'Category': ['Tuition', 'Living', 'Others', 'Scholarship (Saved)', 'Family Support','part-time'],
-        'Amount': [tuition, living, misc, -scholarship_amount, -family_support,-part_time],
-        'Type': ['Expense', 'Expense', 'Expense', 'Savings', 'Support','income'],
-    }
-
-    fig = go.Figure()
-    fig.add_trace(go.Waterfall(
-        name="Financial Flow",
-        orientation="v",
-        x=cost_data['Category'],
-        y=cost_data['Amount'],
-        connector={"line": {"color": "rgb(63, 63, 63)"}},
-    ))
-    fig.update_layout(title="Financial Breakdown (INR Lakhs)", showlegend=False)
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Results
-    col3, col4, col5 = st.columns(3)
-    with col3:
-        st.metric("💰 Total Cost", f"₹{total_cost:.1f}L")
-    with col4:
-        st.metric("🎁 Total Savings", f"₹{scholarship_amount + family_support:.1f}L")
-    with col5:
-        if net_cost > 0:
-            st.metric("📋 Loan Needed", f"₹{net_cost:.1f}L", delta=f"{net_cost / total_cost * 100:.1f}%")
-        else:
-            st.metric("✅ Surplus", f"₹{abs(net_cost):.1f}L", delta="No loan needed")
-
-# ================ PROGRESS TRACKER ================
-elif step == "📊 Progress Tracker":
-    st.header("📊 Track Your Preparation Journey")
 
-    # Exam preparation tracker
+@st.fragment
+@telemetry.timed("fragment", fragment="loan_repayment")
+@telemetry.profiled("fragment-loan_repayment")
+def loan_repayment(loan_p50, loan_p95):
+    """EMI and repayment schedule for the simulated median or 95th percentile loan."""
+    st.subheader("🏦 Loan Repayment")
+    col9, col10, col11 = st.columns(3)
+    with col9:
+        plan_for = st.radio("Plan For", ["Median loan", "95th percentile loan"])
+    with col10:
+        loan_rate = st.slider("Interest Rate (% p.a.)", 6.0, 16.0, 10.0, step=0.5)
+    with col11:
+        loan_tenure = st.select_slider("Tenure (years)", LOAN_TENURES, 10)
+    principal = loan_p50 if plan_for == "Median loan" else loan_p95
+
+    if principal > 0:
+        schedule = repayment_schedule(principal, loan_rate, loan_tenure)
+        st.metric("💳 Monthly EMI", f"₹{schedule['EMI'].iloc[0] * 1e5:,.0f}",
+                  delta=f"₹{schedule['Interest'].sum():.1f}L total interest", delta_color="inverse")
+        month = schedule["Month"].to_numpy()
+        with repayment_template().filled([{"x": month, "y": schedule["Principal"].to_numpy()},
+                                          {"x": month, "y": schedule["Interest"].to_numpy()}]) as fig:
+            show_chart(fig, "repayment")
+
+        emi, interest = payment_grid(principal, LOAN_RATES, LOAN_TENURES)
+        st.write("Monthly EMI (₹) by interest rate and tenure")
+        st.dataframe((emi * 1e5).round(0), use_container_width=True)
+    else:
+        st.success("✅ No loan needed in this scenario")
+
+
+@st.fragment
+@telemetry.timed("fragment", fragment="exam_progress")
+@telemetry.profiled("fragment-exam_progress")
+def exam_progress():
+    """Exam preparation sliders and their progress chart."""
     st.subheader("📚 Exam Preparation Status")
 
-    exams = ['GRE Verbal', 'GRE Quant', 'TOEFL', 'GATE', 'IELTS']
     progress = []
 
     col1, col2 = st.columns(2)
     with col1:
-        for i, exam in enumerate(exams):
+        for i, exam in enumerate(EXAMS):
             if i < 3:
                 progress.append(st.slider(f"{exam} Preparation", 0, 100, 60, key=exam))
     with col2:
-        for i, exam in enumerate(exams):
+        for i, exam in enumerate(EXAMS):
             if i >= 3:
                 progress.append(st.slider(f"{exam} Preparation", 0, 100, 40, key=exam))
 
     # Progress visualization
-    fig = go.Figure(go.Bar(
-        x=exams,
-        y=progress,
-        marker_color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
-    ))
-    fig.update_layout(title="Preparation Progress Overview", yaxis_title="Progress (%)")
-    st.plotly_chart(fig, use_container_width=True)
+    with progress_template().filled([{"y": progress}]) as fig:
+        show_chart(fig, "progress")
+
 
-    # Application checklist
+@st.fragment
+@telemetry.timed("fragment", fragment="application_checklist")
+@telemetry.profiled("fragment-application_checklist")
+def application_checklist():
+    """Application checklist and overall completion."""
     st.subheader("✅ Application Checklist")
 
     checklist_items = [
@@ -525,6 +382,252 @@ elif step == "📊 Progress Tracker":
         st.balloons()
         st.success("🎉 Congratulations! You're ready to apply!")
 
+
+# Custom CSS
+st.markdown("""
+<style>
+    .main-header {
+        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+        padding: 2rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        color: white;
+        text-align: center;
+    }
+    .metric-card {
+        background: #f0f2f6;
+        padding: 1rem;
+        border-radius: 10px;
+        border-left: 4px solid #667eea;
+    }
+    .success-box {
+        background: linear-gradient(45deg, #56CCF2, #2F80ED);
+        padding: 1rem;
+        border-radius: 10px;
+        color: white;
+        text-align: center;
+        margin: 1rem 0;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# Header
+st.markdown("""
+<div class="main-header">
+    <h1>🎓 GradGuide - Smart Career Planner</h1>
+    <p>Your AI-powered companion for MS/MTech decision making</p>
+</div>
+""", unsafe_allow_html=True)
+
+# Sidebar navigation
+st.sidebar.title("🗺 Navigation")
+step = st.sidebar.radio("Choose Your Journey", [
+    "🎯 Career Prediction",
+    "🏛 University Explorer",
+    "💰 Financial Planner",
+    "📊 Progress Tracker"
+])
+
+def main(step):
+    """Renders the journey step picked in the sidebar."""
+    # ================ CAREER PREDICTION ================
+    if step == "🎯 Career Prediction":
+        #set_background("https://images.unsplash.com/photo-1506784983877-45594efa4cbe")
+        st.header("🎯 Find Your Perfect Path")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("📚 Academic Profile")
+            cgpa = st.number_input("CGPA", 0.0, 10.0, 7.5, step=0.1, help="Your current CGPA")
+            gre = st.number_input("GRE Score", 0, 340, 0, help="Enter 0 if not taken")
+            toefl = st.number_input("TOEFL Score", 0, 120, 0, help="Enter 0 if not taken")
+            gate_score = st.number_input("GATE Score", 0, 1000, 0, help="Enter 0 if not taken")
+
+        with col2:
+            st.subheader("🎯 Profile Strengths")
+            sop = st.select_slider("SOP Quality", [1, 2, 3, 4, 5], 3, help="Statement of Purpose strength")
+            lor = st.select_slider("LOR Quality", [1, 2, 3, 4, 5], 3, help="Letter of Recommendation strength")
+            univ_rating = st.select_slider("Target University Rating", [1, 2, 3, 4, 5], 3)
+            chance = st.slider("Self-assessed Admission Chance", 0.0, 1.0, 0.5, help="Your confidence level")
+
+        col3, col4 = st.columns(2)
+        with col3:
+            research = st.selectbox("Research Experience", ["No", "Yes"])
+            career_goal = st.selectbox("Career Goal", ["Industry", "Academia", "Research", "Entrepreneurship"])
+
+        with col4:
+            budget = st.number_input("Budget (INR Lakhs)", 1, 200, 25)
+            pref_country = st.selectbox("Preferred Country", ["India", "USA", "UK", "Germany", "Canada", "Other"])
+
+        if st.button("🚀 Get My Recommendation", type="primary"):
+            # One model version for the whole answer, even if a new one is promoted meanwhile
+            model = predictor().current()
+            encoded = model.encode(
+                cgpa=cgpa, gre=gre, toefl=toefl, gate_score=gate_score, sop=sop,
+                lor=lor, univ_rating=univ_rating, chance=chance, research=research,
+                career_goal=career_goal, budget=budget, pref_country=pref_country
+            )
+            for column, labels in encoded.remapped.items():
+                st.info(f"The model has not been trained on {column.lower()} "
+                        f"'{', '.join(labels)}' yet, so it was scored as '{FALLBACK_LABELS[column]}'.")
+            prediction = model.predict_encoded(encoded)
+            path = path_label(prediction)
+
+            st.markdown(f"""
+            <div class="success-box">
+                <h2>🎯 Recommended Path: {path}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+            # Why: probability and the answers that moved it most
+            explanation = model.explain_encoded(encoded)
+            ms_probability = explanation.probabilities[0, model.explainer.positive]
+            col5, col6 = st.columns(2)
+            col5.metric("MS (Abroad) Probability", f"{ms_probability:.0%}")
+            col6.metric("Average Student", f"{explanation.baseline:.0%}",
+                        help="MS (Abroad) probability before any of your answers are considered")
+            reasons = top_reasons(explanation, model.schema.feature_names, limit=6)
+            show_chart(contribution_figure(reasons), "contributions")
+            with st.expander("🌐 What the model weighs overall"):
+                show_chart(importance_figure(model, model.version), "importances")
+
+            # Preparation timeline
+            st.subheader("📅 Suggested Preparation Timeline")
+            show_chart(timeline_figure(prediction), "timeline")
+
+            # Universities that fit the profile within budget
+            st.subheader(f"🏛 Universities That Fit Your Profile in {pref_country}")
+            matches, source = university_matches(
+                cgpa=cgpa, gre=gre, toefl=toefl, gate_score=gate_score, research=research,
+                budget=budget, pref_country=pref_country
+            )
+            if matches is None:
+                st.info(f"No universities listed for {pref_country}. Pick a country to see matches.")
+            elif matches.empty:
+                st.info(f"No universities in {pref_country} fit a budget of {budget} lakhs. "
+                        f"Try a higher budget or another country.")
+            else:
+                if source in ("cached", "none", "error"):
+                    st.caption("Matched against the built-in university list.")
+                st.dataframe(matches, use_container_width=True, hide_index=True)
+
+    # ================ UNIVERSITY EXPLORER (API BASED WITH FALLBACK) ================
+    elif step == "🏛 University Explorer":
+        st.header("🏛 Discover Your Dream Universities")
+        country_search()
+        st.markdown("---")
+        name_search()
+
+    # ================ FINANCIAL PLANNER ================
+    elif step == "💰 Financial Planner":
+        st.header("💰 Smart Financial Planning")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("💸 Cost Breakdown")
+            tuition = st.number_input("Tuition Fee (INR Lakhs)", 1, 200, 40)
+            living = st.number_input("Living Expenses (INR Lakhs)", 1, 100, 25)
+            misc = st.number_input("Other Expenses (INR Lakhs)", 1, 50, 10)
+
+        with col2:
+            st.subheader("💡 Financial Aid")
+            scholarship = st.slider("Expected Scholarship (%)", 0, 100, 20)
+            family_support = st.number_input("Family Support (INR Lakhs)", 0, 150, 30)
+            income_source = st.number_input("Another source of income/part-time",0,100000,300)
+            #loan_needed = st.checkbox("Education Loan Required?")
+
+        # Calculate costs
+        part_time =income_source / 100
+        plan = cost_breakdown(tuition, living, misc, scholarship, family_support, part_time)
+        total_cost = plan["total_cost"]
+        scholarship_amount = plan["scholarship_amount"]
+        net_cost = plan["net_cost"]
+
+        with st.expander("🎲 Uncertainty Assumptions"):
+            col_a, col_b = st.columns(2)
+            with col_a:
+                tuition_spread = st.slider("Tuition Uncertainty (±%)", 0, 50, 10)
+                living_spread = st.slider("Living Cost Uncertainty (±%)", 0, 50, 15)
+                fx_volatility = st.slider("Exchange Rate Volatility (%)", 0, 30, 8,
+                                          help="Set to 0 when studying in India")
+            with col_b:
+                scholarship_spread = st.slider("Scholarship Uncertainty (± points)", 0, 30, 10)
+                part_time_spread = st.slider("Part-time Income Uncertainty (±%)", 0, 100, 50)
+                n_scenarios = st.select_slider("Scenarios Simulated", SCENARIO_COUNTS, DEFAULT_SCENARIOS)
+
+        assumptions = Assumptions(tuition_spread / 100, living_spread / 100, fx_volatility / 100,
+                                  scholarship_spread, part_time_spread / 100)
+        scenarios = scenario_summary(tuition, living, misc, scholarship, family_support,
+                                     part_time, n_scenarios, assumptions)
+
+        # Financial breakdown chart, with the spread of the running total after each step
+        # across the simulated scenarios
+        p5, p25, p50, p75, p95 = scenarios["running"]
+        with waterfall_template().filled([
+            {"y": plan["steps"]},
+            {"y": p50, "error_y.array": p95 - p50, "error_y.arrayminus": p50 - p5},
+            {"y": p50, "error_y.array": p75 - p50, "error_y.arrayminus": p50 - p25},
+        ]) as fig:
+            show_chart(fig, "waterfall")
+
+        # Results
+        col3, col4, col5 = st.columns(3)
+        with col3:
+            st.metric("💰 Total Cost", f"₹{total_cost:.1f}L")
+        with col4:
+            st.metric("🎁 Total Savings", f"₹{scholarship_amount + family_support:.1f}L")
+        with col5:
+            if net_cost > 0:
+                st.metric("📋 Loan Needed", f"₹{net_cost:.1f}L", delta=f"{net_cost / total_cost * 100:.1f}%")
+            else:
+                st.metric("✅ Surplus", f"₹{abs(net_cost):.1f}L", delta="No loan needed")
+
+        st.subheader("🎲 Scenario Analysis")
+        loan_p5, _, loan_p50, _, loan_p95 = scenarios["loan"]
+        col6, col7, col8 = st.columns(3)
+        with col6:
+            st.metric("📉 Shortfall Probability", f"{scenarios['shortfall_probability'] * 100:.1f}%")
+        with col7:
+            st.metric("📋 Median Loan", f"₹{loan_p50:.1f}L")
+        with col8:
+            st.metric("⚠ 95th Percentile Loan", f"₹{loan_p95:.1f}L")
+        st.caption(f"Across {scenarios['scenarios']:,} simulated scenarios, the loan needed ranges "
+                   f"from ₹{loan_p5:.1f}L to ₹{loan_p95:.1f}L (5th-95th percentile).")
+        loan_repayment(loan_p50, loan_p95)
+
+    # ================ PROGRESS TRACKER ================
+    elif step == "📊 Progress Tracker":
+        st.header("📊 Track Your Preparation Journey")
+        exam_progress()
+        application_checklist()
+
+
+# Profiled (with GRADGUIDE_PROFILE set) however the page ends, st.rerun and st.stop included
+with telemetry.profile(step) as rerun_profile:
+    main(step)
+telemetry.observe("rerun", time.perf_counter() - rerun_started, page=step)
+if os.environ.get("GRADGUIDE_METRICS_FILE"):
+    telemetry.registry.write_textfile(os.environ["GRADGUIDE_METRICS_FILE"])
+
+# Runtime stats for sizing caches; rendered last so they include this rerun
+if os.environ.get("GRADGUIDE_DEBUG") == "1":
+    with st.sidebar.expander("⚙ Prediction cache"):
+        st.json(predictor().cache.stats())
+    with st.sidebar.expander("⚙ University service"):
+        st.json(university_lookup().stats())
+    with st.sidebar.expander("⚙ Model load"):
+        st.json(predictor().load_report)
+    with st.sidebar.expander("⚙ Timings"):
+        if not telemetry.enabled():
+            st.caption("Set GRADGUIDE_METRICS=1 to record spans and counters.")
+        st.json(telemetry.registry.snapshot())
+        st.download_button("Prometheus metrics", telemetry.registry.to_prometheus(),
+                           file_name="gradguide.prom", mime="text/plain")
+        if rerun_profile.path is not None:
+            st.caption(f"Profile of this rerun: {rerun_profile.path}")
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,64 @@
+"""Encode cost per row: schema-compiled encoding against per-row DataFrames.
+
+"per-row frame" is the path the app used before ``gradguide.schema``: one
+dict and one single-row DataFrame per profile.  The schema encodes a
+profile, a list of records or a whole frame straight into the model-order
+float matrix, validating every value on the way.
+
+    python benchmarks/bench_encode.py --sizes 1 100 10000 100000
+"""
+import argparse
+
+import pandas as pd
+
+from common import best_of, synthetic_profiles
+
+from gradguide.features import FEATURE_COLUMNS, FORM_FIELDS, LABELS
+from gradguide.model import load_model
+from gradguide.schema import FeatureSchema
+
+# Above this the per-row baseline takes too long to be worth timing
+PER_ROW_LIMIT = 1000
+
+
+def per_row_frame(cgpa, gre, toefl, gate_score, sop, lor, univ_rating, chance, research,
+                  career_goal, budget, pref_country):
+    return pd.DataFrame([{
+        "CGPA": cgpa, "GRE Score": gre, "TOEFL Score": toefl, "SOP": sop, "LOR ": lor,
+        "University Rating": univ_rating, "Chance of Admit ": chance,
+        "Research": 1 if research == "Yes" else 0, "Budget (INR Lakhs)": budget,
+        "Career Goal": LABELS["Career Goal"].get(career_goal, 1), "GATE Score": gate_score,
+        "Preferred Country": LABELS["Preferred Country"].get(pref_country, 4),
+    }], columns=FEATURE_COLUMNS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000, 100_000])
+    args = parser.parse_args(argv)
+    schema = FeatureSchema.from_model(load_model())
+    fields = {col: field for field, col in FORM_FIELDS.items()}
+
+    print(f"{'rows':>8} {'method':>15} {'total (ms)':>11} {'per row (us)':>13}")
+    for size in args.sizes:
+        frame = synthetic_profiles(size)
+        records = [{fields[schema.resolve(name)]: value for name, value in row.items()}
+                   for row in frame.to_dict("records")]
+        number = max(1, 1000 // size)
+        timings = {}
+        if size <= PER_ROW_LIMIT:
+            timings["per-row frame"] = best_of(
+                lambda: [per_row_frame(**record) for record in records], 3, number)
+        if size == 1:
+            timings["schema profile"] = best_of(
+                lambda: schema.encode_profile(records[0], "fallback"), 5, 1000)
+        timings["schema records"] = best_of(
+            lambda: schema.encode_records(records, "fallback"), 3, number)
+        timings["schema frame"] = best_of(
+            lambda: schema.encode_frame(frame, "fallback"), 3, number)
+        for name, seconds in timings.items():
+            print(f"{size:>8} {name:>15} {seconds * 1e3:>11.3f} {seconds / size * 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
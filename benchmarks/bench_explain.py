@@ -0,0 +1,56 @@
+"""Explanation cost: per-feature contributions against plain scoring.
+
+Checks on every batch that the explainer's probabilities equal the
+Pipeline's ``predict_proba`` and that baseline + contributions add up to the
+MS probability.
+
+    python benchmarks/bench_explain.py --sizes 1 1000 100000
+"""
+import argparse
+
+import numpy as np
+
+from common import best_of, synthetic_profiles
+
+from gradguide.explain import Explainer
+from gradguide.fastpath import compile_pipeline
+from gradguide.model import load_model
+from gradguide.schema import FeatureSchema
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 100_000])
+    args = parser.parse_args(argv)
+
+    model = load_model()
+    engine = compile_pipeline(model)
+    schema = FeatureSchema.from_model(model)
+    build = best_of(lambda: Explainer(engine), repeat=3)
+    explainer = Explainer(engine)
+    print(f"Explainer built in {build * 1e3:.1f} ms")
+
+    print(f"{'rows':>8} {'method':>18} {'total (ms)':>11} {'rows/s':>12}")
+    for size in args.sizes:
+        matrix = schema.encode_frame(synthetic_profiles(size), unknown="fallback").matrix
+        frame = schema.model_input(model, matrix)
+        explanation = explainer.explain(matrix)
+        expected = model.predict_proba(frame)
+        if not np.array_equal(explanation.probabilities, expected):
+            raise SystemExit(f"explainer probabilities differ from sklearn at {size} rows")
+        total = explanation.baseline + explanation.contributions.sum(axis=1)
+        if not np.allclose(total, expected[:, explainer.positive], atol=1e-12):
+            raise SystemExit(f"contributions do not add up at {size} rows")
+
+        repeat, number = (3, 1) if size >= 10_000 else (5, max(1, 1000 // size))
+        timings = {
+            "sklearn proba": best_of(lambda: model.predict_proba(frame), repeat, number),
+            "fast proba": best_of(lambda: engine.predict_proba(matrix), repeat, number),
+            "explain": best_of(lambda: explainer.explain(matrix), repeat, number),
+        }
+        for name, seconds in timings.items():
+            print(f"{size:>8} {name:>18} {seconds * 1e3:>11.2f} {size / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
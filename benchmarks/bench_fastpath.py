@@ -0,0 +1,46 @@
+"""Latency/throughput of the compiled fast path against the sklearn Pipeline.
+
+    python benchmarks/bench_fastpath.py
+"""
+import argparse
+
+import numpy as np
+
+from common import best_of, synthetic_profiles
+
+from gradguide.fastpath import compile_pipeline
+from gradguide.model import load_model
+from gradguide.schema import FeatureSchema
+
+BATCH_SIZES = (1, 100, 100_000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(BATCH_SIZES))
+    args = parser.parse_args(argv)
+
+    model = load_model()
+    engine = compile_pipeline(model)
+    schema = FeatureSchema.from_model(model)
+
+    print(f"{'batch':>8} {'engine':>8} {'latency (ms)':>14} {'rows/s':>14}")
+    for size in args.sizes:
+        matrix = schema.encode_frame(synthetic_profiles(size), unknown="fallback").matrix
+        frame = schema.model_input(model, matrix)
+
+        if not np.array_equal(model.predict(frame), engine.predict(matrix)):
+            raise SystemExit(f"fast path disagrees with sklearn at batch size {size}")
+
+        number = max(1, 2000 // size)
+        repeat = 3 if size >= 10_000 else 5
+        timings = {
+            "sklearn": best_of(lambda: model.predict(frame), repeat, number),
+            "fast": best_of(lambda: engine.predict(matrix), repeat, number),
+        }
+        for name, seconds in timings.items():
+            print(f"{size:>8} {name:>8} {seconds * 1e3:>14.3f} {size / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Financial Planner scenario engine: simulate + summarize time per rerun.
+
+The planner reruns on every widget change, so the whole Monte Carlo pass has
+to stay well under a second on one core.
+
+    python benchmarks/bench_finance.py --sizes 100000 1000000
+"""
+import argparse
+
+from common import best_of
+
+from gradguide.finance import payment_grid, repayment_schedule, simulate, summarize
+
+# The planner's default inputs, in INR lakhs
+INPUTS = dict(tuition=40, living=25, misc=10, scholarship=20, family_support=30, part_time=3)
+BUDGET_SECONDS = 1.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 200_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    print(f"{'scenarios':>10} {'simulate (ms)':>14} {'summarize (ms)':>15} {'total (ms)':>11}")
+    slowest = 0.0
+    for size in args.sizes:
+        simulated = simulate(n=size, **INPUTS)
+        sim = best_of(lambda: simulate(n=size, **INPUTS), repeat=3)
+        summary = best_of(lambda: summarize(simulated), repeat=3)
+        slowest = max(slowest, sim + summary)
+        print(f"{size:>10} {sim * 1e3:>14.1f} {summary * 1e3:>15.1f} {(sim + summary) * 1e3:>11.1f}")
+
+    loan = summarize(simulate(n=args.sizes[0], **INPUTS))["loan"][2]
+    rates, tenures = list(range(6, 17)), [3, 5, 7, 10, 15, 20]
+    grid = best_of(lambda: payment_grid(loan, rates, tenures), number=100)
+    schedule = best_of(lambda: repayment_schedule(loan, 10, 20), number=100)
+    print(f"EMI grid ({len(rates)}x{len(tenures)}): {grid * 1e3:.2f} ms, "
+          f"240-month schedule: {schedule * 1e3:.2f} ms")
+    verdict = "within" if slowest < BUDGET_SECONDS else "OVER"
+    print(f"Slowest rerun {slowest * 1e3:.0f} ms, {verdict} the {BUDGET_SECONDS:.0f} s budget")
+    return 0 if slowest < BUDGET_SECONDS else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
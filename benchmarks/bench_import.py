@@ -0,0 +1,79 @@
+"""Cold start of a scoring process: headless gradguide.core against GradGuide.py.
+
+Each scenario runs in a fresh interpreter and reports the time to import,
+the time until the first prediction is returned, the resident memory at that
+point and which heavy libraries got loaded.  "script" executes GradGuide.py
+the way a Streamlit worker does (bare mode, default page) and predicts with
+the model it loaded.
+
+    python benchmarks/bench_import.py --repeat 3
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from common import REPO_ROOT
+
+HEAVY = ["streamlit", "plotly", "pandas", "sklearn", "joblib", "requests"]
+
+PROFILE = dict(cgpa=8.2, gre=315, toefl=105, gate_score=0, sop=4, lor=4, univ_rating=3,
+               chance=0.7, research="Yes", career_goal="Industry", budget=60,
+               pref_country="USA")
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+{body}
+ready = time.perf_counter() - start
+from gradguide.artifact import current_rss
+print(json.dumps({{"import": imported, "ready": ready, "rss": current_rss(),
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+SCENARIOS = {
+    "core (fast path)": """
+from gradguide.core import Predictor
+imported = time.perf_counter() - start
+Predictor(fast=True).recommend(**{profile!r})
+""",
+    "core (sklearn)": """
+from gradguide.core import Predictor
+imported = time.perf_counter() - start
+Predictor(fast=False).recommend(**{profile!r})
+""",
+    "script": """
+import logging, runpy
+logging.disable(logging.WARNING)
+namespace = runpy.run_path("GradGuide.py")
+imported = time.perf_counter() - start
+namespace["predictor"]().recommend(**{profile!r})
+""",
+}
+
+
+def run(body):
+    code = _CHILD.format(body=body.format(profile=PROFILE), heavy=HEAVY)
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True,
+                            capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    # Export the artifact outside the timed runs
+    run(SCENARIOS["core (fast path)"])
+
+    print(f"{'scenario':>18} {'import (ms)':>12} {'ready (ms)':>11} {'RSS (MB)':>9}  loaded")
+    for name, body in SCENARIOS.items():
+        runs = [run(body) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["ready"])
+        print(f"{name:>18} {best['import'] * 1e3:>12.0f} {best['ready'] * 1e3:>11.0f} "
+              f"{best['rss'] / 2**20:>9.1f}  {', '.join(best['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
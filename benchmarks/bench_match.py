@@ -0,0 +1,54 @@
+"""University matching: argpartition top-k against a full sort, and batch against a loop.
+
+    python benchmarks/bench_match.py --sizes 10000 100000 --students 1000
+"""
+import argparse
+
+import numpy as np
+
+from common import best_of, synthetic_profiles, synthetic_universities
+
+from gradguide.features import FORM_FIELDS
+from gradguide.match import UniversityMatcher, profile_strength, top_k
+from gradguide.rankings import ranking_table
+
+PROFILE = dict(cgpa=8.2, gre=315, toefl=105, gate_score=0, research="Yes", budget=60)
+FORM_NAMES = {column: name for name, column in FORM_FIELDS.items()}
+
+
+def full_sort(scores, k):
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    profiles = synthetic_profiles(args.students)
+    print(f"{'universities':>12} {'sort (ms)':>10} {'top-k (ms)':>11} {'match (ms)':>11} "
+          f"{'loop (ms)':>10} {'batch (ms)':>11} {'students/s':>11}")
+    for size in args.sizes:
+        records = synthetic_universities(size)
+        matcher = UniversityMatcher(ranking_table([r["name"] for r in records],
+                                                  [r["country"] for r in records]))
+        scores = matcher.scores(profile_strength(profiles.head(100)),
+                                profiles["Budget (INR Lakhs)"].head(100))
+        assert (np.take_along_axis(scores, top_k(scores, args.k), axis=1)
+                == np.take_along_axis(scores, full_sort(scores, args.k), axis=1)).all()
+        sort = best_of(lambda: full_sort(scores, args.k)) / len(scores)
+        partial = best_of(lambda: top_k(scores, args.k)) / len(scores)
+        single = best_of(lambda: matcher.match(args.k, **PROFILE))
+        sample = profiles.head(50)
+        loop = best_of(lambda: [matcher.match(args.k, **row) for row in
+                                sample.rename(columns=FORM_NAMES).to_dict("records")],
+                       repeat=2) / len(sample) * len(profiles)
+        batch = best_of(lambda: matcher.match_many(profiles, args.k), repeat=2)
+        print(f"{size:>12} {sort * 1e3:>10.2f} {partial * 1e3:>11.2f} {single * 1e3:>11.2f} "
+              f"{loop * 1e3:>10.0f} {batch * 1e3:>11.0f} {len(profiles) / batch:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""University name search: prebuilt NameIndex against the old linear scan.
+
+The scan mirrors the cached branch of search_university_by_name_with_fallback:
+a substring test over every list in an alias-keyed dict, re-lowercasing every
+name on every query.
+
+    python benchmarks/bench_name_search.py --sizes 10000 100000
+"""
+import argparse
+import time
+from collections import defaultdict
+
+from common import best_of, synthetic_universities
+
+from gradguide.search import NameIndex
+
+QUERIES = ["science", "univ of appl", "munchen", "polytecnic", "state college 12",
+           "institute of technology", "zur"]
+# Every country is reachable under three keys, like "USA"/"US"/"United States"
+ALIASES_PER_COUNTRY = 3
+
+
+def linear_scan(alias_data, query):
+    found = []
+    term = query.lower()
+    for country_unis in alias_data.values():
+        for uni in country_unis:
+            if term in uni.lower():
+                found.append(uni)
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    print(f"{'names':>8} {'query':>24} {'scan (ms)':>10} {'index (ms)':>11} {'hits':>6}")
+    for size in args.sizes:
+        records = synthetic_universities(size)
+        by_country = defaultdict(list)
+        for record in records:
+            by_country[record["country"]].append(record["name"])
+        alias_data = {f"{country} #{alias}": names
+                      for country, names in by_country.items()
+                      for alias in range(ALIASES_PER_COUNTRY)}
+
+        start = time.perf_counter()
+        index = NameIndex(records)
+        print(f"{size:>8} {'(build)':>24} {'':>10} {(time.perf_counter() - start) * 1e3:>11.1f}")
+
+        for query in QUERIES:
+            scan = best_of(lambda: linear_scan(alias_data, query), repeat=3)
+            indexed = best_of(lambda: index.search(query, k=20), repeat=5, number=20)
+            hits = len(index.search(query, k=20))
+            print(f"{size:>8} {query:>24} {scan * 1e3:>10.2f} {indexed * 1e3:>11.3f} {hits:>6}")
+
+
+if __name__ == "__main__":
+    main()
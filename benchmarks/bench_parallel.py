@@ -0,0 +1,81 @@
+"""Batch scoring throughput against the number of worker processes.
+
+Writes a synthetic profile file, scores it once in-process (sklearn and fast
+path) and then with ``score_file_parallel`` for each engine at each worker
+count, checking that every parallel run reproduces the in-process output of
+its engine.  Speedup and efficiency are relative to that engine's one-worker
+pool; scaling stops at the number of physical cores, so run it on the
+deployment hardware -- on a single-core host every pool shares one CPU.
+
+    python benchmarks/bench_parallel.py --rows 200000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from common import synthetic_profiles
+
+from gradguide.batch import DEFAULT_CHUNKSIZE, score_file, score_file_parallel
+from gradguide.fastpath import compile_pipeline
+from gradguide.model import load_model
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--engine", choices=["sklearn", "fast"], nargs="+",
+                        default=["sklearn", "fast"])
+    args = parser.parse_args(argv)
+    print(f"{os.cpu_count()} CPUs, {args.rows} rows, chunks of {args.chunksize}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = tmp / "profiles.parquet"
+        synthetic_profiles(args.rows).to_parquet(source, index=False)
+
+        pipeline = load_model()
+        # The synthetic profiles include labels the model has no code for
+        _, sk = timed(lambda: score_file(source, tmp / "sklearn.parquet", pipeline,
+                                         args.chunksize, unknown="fallback"))
+        _, fast = timed(lambda: score_file(source, tmp / "fast.parquet",
+                                           compile_pipeline(pipeline), args.chunksize,
+                                           unknown="fallback"))
+        print(f"in-process sklearn: {args.rows / sk:>10,.0f} rows/s")
+        print(f"in-process fast:    {args.rows / fast:>10,.0f} rows/s")
+
+        for engine in args.engine:
+            expected = pd.read_parquet(tmp / f"{engine}.parquet")
+            print(f"\n{engine} workers")
+            print(f"{'workers':>8} {'wall (s)':>9} {'rows/s':>10} {'speedup':>8} "
+                  f"{'efficiency':>11} {'per worker (rows/s)':>22}")
+            baseline = None
+            for workers in args.workers:
+                output = tmp / f"parallel-{engine}-{workers}.parquet"
+                (_, per_worker), wall = timed(lambda: score_file_parallel(
+                    source, output, workers, args.chunksize, unknown="fallback",
+                    engine=engine))
+                if not pd.read_parquet(output).equals(expected):
+                    raise SystemExit(f"{engine}, {workers} workers: output differs from "
+                                     f"in-process scoring")
+                baseline = baseline or wall
+                rates = sorted(stats["rows_per_second"] for stats in per_worker.values())
+                print(f"{workers:>8} {wall:>9.2f} {args.rows / wall:>10,.0f} "
+                      f"{baseline / wall:>7.2f}x {baseline / wall / workers:>10.0%} "
+                      f"{rates[0]:>10,.0f}-{rates[-1]:<,.0f}")
+
+
+if __name__ == "__main__":
+    main()
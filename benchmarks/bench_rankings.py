@@ -0,0 +1,49 @@
+"""Ranking table: vectorized gradguide.rankings against the old per-row loop.
+
+The loop mirrors the previous _ranking_table in GradGuide.py: five calls into
+the global NumPy RNG per university and a DataFrame built from row dicts.
+
+    python benchmarks/bench_rankings.py --sizes 15 10000 100000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from common import best_of, synthetic_universities
+
+from gradguide.rankings import format_rankings, query_rankings, ranking_table
+
+
+def row_loop(names, country):
+    universities = []
+    for univ in names:
+        universities.append({
+            'University': univ,
+            'QS Ranking': np.random.randint(1, 500),
+            'Acceptance Rate': f"{np.random.randint(15, 85)}%",
+            'Avg Fee (Lakhs)': np.random.randint(20, 100) if country != "India" else np.random.randint(5, 25),
+            'Program Strength': np.random.choice(['⭐⭐⭐⭐⭐', '⭐⭐⭐⭐', '⭐⭐⭐'])
+        })
+    return pd.DataFrame(universities)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[15, 10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>8} {'loop (ms)':>10} {'vector (ms)':>12} {'query (ms)':>11} {'speedup':>8}")
+    for size in args.sizes:
+        names = [record["name"] for record in synthetic_universities(size)]
+        repeat = 5 if size <= 10_000 else 2
+        loop = best_of(lambda: row_loop(names, "Germany"), repeat=repeat)
+        vector = best_of(lambda: format_rankings(ranking_table(names, "Germany")), repeat=repeat)
+        table = ranking_table(names, "Germany")
+        query = best_of(lambda: query_rankings(table, max_rank=100, max_fee=60, limit=20))
+        print(f"{size:>8} {loop * 1e3:>10.2f} {vector * 1e3:>12.2f} {query * 1e3:>11.2f} "
+              f"{loop / vector:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
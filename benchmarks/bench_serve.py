@@ -0,0 +1,123 @@
+"""HTTP prediction service: throughput with and without micro-batching.
+
+Starts ``python -m gradguide.serve`` once with batching off (``--max-batch 1``)
+and once with it on, then drives each with closed-loop clients (every client
+sends its next request as soon as the previous answer arrives) at several
+concurrency levels.  Clients run in separate processes over keep-alive
+connections so the load generator does not share the server's GIL.
+
+    python benchmarks/bench_serve.py --concurrency 1 8 32 64 --duration 3
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from common import REPO_ROOT, synthetic_profiles
+
+CLIENT_PROCESSES = 4
+FORM_FIELDS = {
+    "CGPA": "cgpa", "GRE Score": "gre", "TOEFL Score": "toefl", "GATE Score": "gate_score",
+    "SOP": "sop", "LOR": "lor", "University Rating": "univ_rating",
+    "Chance of Admit": "chance", "Research": "research", "Career Goal": "career_goal",
+    "Budget (INR Lakhs)": "budget", "Preferred Country": "pref_country",
+}
+
+
+def payloads(n=2000):
+    """Distinct request bodies in the form's value ranges."""
+    frame = synthetic_profiles(n).rename(columns=FORM_FIELDS)
+    return [json.dumps(row).encode() for row in frame.to_dict("records")]
+
+
+def _client_process(args):
+    port, threads, duration, bodies = args
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def loop(offset):
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        local = []
+        i = offset
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            conn.request("POST", "/predict", bodies[i % len(bodies)],
+                         {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            local.append(time.perf_counter() - start)
+            i += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=loop, args=(t * 97,)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return latencies
+
+
+def start_server(port, max_batch, max_wait_ms, engine):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gradguide.serve", "--port", str(port), "--max-batch",
+         str(max_batch), "--max-wait-ms", str(max_wait_ms), "--engine", engine,
+         "--unknown", "fallback"],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()  # "Serving predictions on ..."
+    return server
+
+
+def metrics(port):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("GET", "/metrics")
+    return json.loads(conn.getresponse().read())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per level")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--engine", choices=["sklearn", "fast"], default="sklearn")
+    parser.add_argument("--port", type=int, default=8797)
+    args = parser.parse_args(argv)
+    bodies = payloads()
+
+    print(f"{'mode':>9} {'clients':>8} {'req/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+          f"{'mean batch':>11}")
+    for mode, max_batch in (("single", 1), ("batched", args.max_batch)):
+        server = start_server(args.port, max_batch, args.max_wait_ms, args.engine)
+        try:
+            with multiprocessing.Pool(CLIENT_PROCESSES) as pool:
+                for clients in args.concurrency:
+                    before = metrics(args.port)
+                    procs = min(CLIENT_PROCESSES, clients)
+                    shares = [clients // procs + (i < clients % procs) for i in range(procs)]
+                    start = time.perf_counter()
+                    results = pool.map(_client_process, [
+                        (args.port, share, args.duration, bodies) for share in shares])
+                    elapsed = time.perf_counter() - start
+                    latencies = np.concatenate([np.array(r) for r in results]) * 1e3
+                    after = metrics(args.port)
+                    batches = after["batches"] - before["batches"]
+                    p50, p99 = np.percentile(latencies, [50, 99])
+                    print(f"{mode:>9} {clients:>8} {len(latencies) / elapsed:>8.0f} "
+                          f"{p50:>9.2f} {p99:>9.2f} "
+                          f"{len(latencies) / batches if batches else 0:>11.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
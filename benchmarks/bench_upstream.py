@@ -0,0 +1,84 @@
+"""UniversityClient against bare requests.get, using the local hipolabs stub.
+
+Measures (1) concurrent identical queries with coalescing and pooling, and
+(2) time-to-fallback while the upstream is failing, with and without the
+circuit breaker.
+
+    python benchmarks/bench_upstream.py
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from common import synthetic_universities
+from stub_hipolabs import StubHipolabs
+
+from gradguide.upstream import UniversityClient
+
+
+def bare_get(base_url, country, timeout=10):
+    try:
+        response = requests.get(f"{base_url}/search", params={"country": country},
+                                timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException:
+        return []
+
+
+def client_get(client, country):
+    try:
+        return client.search(country=country)
+    except requests.exceptions.RequestException:
+        return []
+
+
+def timed_concurrent(func, workers, calls):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(lambda _: func(), range(calls)))
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=64)
+    args = parser.parse_args(argv)
+    records = synthetic_universities(5_000, n_countries=20)
+
+    print(f"== {args.calls} identical queries from {args.workers} threads, "
+          f"{args.latency * 1e3:.0f} ms upstream latency")
+    with StubHipolabs(records, latency=args.latency) as stub:
+        elapsed = timed_concurrent(lambda: bare_get(stub.url, "Country 1"),
+                                   args.workers, args.calls)
+        print(f"bare requests.get : {elapsed:6.2f}s  upstream requests={stub.requests}")
+    with StubHipolabs(records, latency=args.latency) as stub:
+        client = UniversityClient(stub.url)
+        elapsed = timed_concurrent(lambda: client_get(client, "Country 1"),
+                                   args.workers, args.calls)
+        print(f"UniversityClient  : {elapsed:6.2f}s  upstream requests={stub.requests}  "
+              f"coalesced={client.coalesced}")
+
+    print(f"== 20 sequential queries while every upstream call fails after "
+          f"{args.latency * 1e3:.0f} ms")
+    with StubHipolabs(records, latency=args.latency, failure_rate=1.0) as stub:
+        start = time.perf_counter()
+        for i in range(20):
+            bare_get(stub.url, f"Country {i}")
+        print(f"bare requests.get : {time.perf_counter() - start:6.2f}s  "
+              f"upstream requests={stub.requests}")
+    with StubHipolabs(records, latency=args.latency, failure_rate=1.0) as stub:
+        client = UniversityClient(stub.url, failure_threshold=3, reset_timeout=30)
+        start = time.perf_counter()
+        for i in range(20):
+            client_get(client, f"Country {i}")
+        print(f"UniversityClient  : {time.perf_counter() - start:6.2f}s  "
+              f"upstream requests={stub.requests}  breaker={client.breaker.state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Helpers shared by the benchmark scripts."""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Let the scripts run straight from a checkout: python benchmarks/<script>.py
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def synthetic_profiles(n, seed=0):
+    """Random raw student profiles in the Career Prediction form's value ranges."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "CGPA": rng.uniform(5.0, 10.0, n).round(1),
+        "GRE Score": rng.integers(0, 341, n),
+        "TOEFL Score": rng.integers(0, 121, n),
+        "GATE Score": rng.integers(0, 1001, n),
+        "SOP": rng.integers(1, 6, n),
+        "LOR": rng.integers(1, 6, n),
+        "University Rating": rng.integers(1, 6, n),
+        "Chance of Admit": rng.uniform(0.0, 1.0, n).round(2),
+        "Research": rng.choice(["Yes", "No"], n),
+        "Budget (INR Lakhs)": rng.integers(1, 201, n),
+        "Career Goal": rng.choice(["Industry", "Academia", "Research", "Entrepreneurship"], n),
+        "Preferred Country": rng.choice(["India", "USA", "UK", "Germany", "Canada", "Other"], n),
+    })
+
+
+_NAME_WORDS = [
+    "Institute", "Technology", "State", "College", "Science", "Applied", "National",
+    "Royal", "Metropolitan", "Engineering", "Arts", "Medical", "Polytechnic", "Saint",
+    "North", "South", "East", "West", "Central", "Agricultural", "Open", "Federal",
+    "München", "Zürich", "São Paulo", "Kraków", "Management", "Business", "Design",
+]
+
+
+def synthetic_universities(n, n_countries=200, seed=0):
+    """Hipolabs-format records with plausible, mostly unique university names."""
+    rng = np.random.default_rng(seed)
+    prefixes = ["University of", "College of", "Institute of", ""]
+    records = []
+    for i in range(n):
+        words = rng.choice(_NAME_WORDS, size=2, replace=False)
+        name = f"{rng.choice(prefixes)} {words[0]} {words[1]} {i}".strip()
+        country = f"Country {rng.integers(n_countries)}"
+        records.append({
+            "name": name,
+            "country": country,
+            "alpha_two_code": None,
+            "state-province": None,
+            "web_pages": [f"https://u{i}.example.edu/"],
+            "domains": [f"u{i}.example.edu"],
+        })
+    return records
+
+
+def best_of(func, repeat=5, number=1):
+    """Best wall time per call, in seconds, over ``repeat`` rounds of ``number`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
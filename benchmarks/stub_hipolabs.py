@@ -0,0 +1,41 @@
+"""Local stand-in for universities.hipolabs.com with injectable latency and failures.
+
+Serves a hipolabs-format dump (or synthetic records) with the tests'
+``StubHipolabs`` so the explorer and the HTTP client run fully offline:
+
+    python benchmarks/stub_hipolabs.py --port 8765 --latency 0.2 --failure-rate 0.3
+    GRADGUIDE_UNIVERSITY_API=http://127.0.0.1:8765 streamlit run GradGuide.py
+"""
+import argparse
+import json
+
+from common import synthetic_universities
+
+from tests.support.hipolabs import StubHipolabs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dump", help="hipolabs-format JSON dump to serve")
+    parser.add_argument("--size", type=int, default=10_000, help="Synthetic records if no dump")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of 503 responses")
+    args = parser.parse_args(argv)
+
+    if args.dump:
+        with open(args.dump, encoding="utf-8") as handle:
+            records = json.load(handle)
+    else:
+        records = synthetic_universities(args.size)
+    stub = StubHipolabs(records, port=args.port, latency=args.latency,
+                        failure_rate=args.failure_rate)
+    print(f"Serving {len(records)} universities on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""Benchmark suite for the app's hot paths, with JSON results to compare across commits.
+
+Runs every case below fully offline: university lookups go to the local
+hipolabs stub (``stub_hipolabs.py``) serving a synthetic catalogue, and the
+caches and catalogue live in a temporary directory.  Each case is timed asv
+style -- calls per round are calibrated to take at least ``--min-time``, then
+the per-call time is recorded for ``--repeat`` rounds -- and the results are
+written to ``benchmarks/results/<commit>.json`` along with the machine and
+library versions.
+
+    python benchmarks/suite.py                       # everything
+    python benchmarks/suite.py -k predict --quick    # cases matching "predict"
+    python benchmarks/suite.py --compare benchmarks/results/<old commit>.json
+
+``--compare`` prints the median ratio for every case the two runs share and
+exits with status 1 if any got slower than ``--threshold`` (1.25x by default).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import REPO_ROOT, synthetic_profiles, synthetic_universities
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.05  # seconds per round
+DEFAULT_THRESHOLD = 1.25
+CATALOGUE_SIZES = [10_000, 100_000]
+BATCH_ROWS = 10_000
+SEARCH_QUERY = "univ of appl"
+
+# The planner's default inputs, in INR lakhs
+FINANCE_INPUTS = dict(tuition=40, living=25, misc=10, scholarship=20, family_support=30,
+                      part_time=3)
+
+CASES = []
+
+
+def case(name, **params):
+    """Registers ``setup(**params)``, which returns the callable to time."""
+    def register(setup):
+        CASES.append((name, params, setup))
+        return setup
+    return register
+
+
+def case_id(name, params):
+    if not params:
+        return name
+    return f"{name}[{','.join(f'{key}={value}' for key, value in params.items())}]"
+
+
+def measure(func, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME):
+    """Per-call timings of ``func``: ``number`` calls per round, ``repeat`` rounds."""
+    func()  # warm-up, also fills lazily built indexes
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "number": number,
+        "repeat": len(samples),
+    }
+
+
+# -- Model ---------------------------------------------------------------------
+
+@case("model_load", engine="sklearn")
+def bench_model_load_pickle(engine):
+    from gradguide.model import load_model
+
+    return load_model
+
+
+@case("model_load", engine="fast")
+def bench_model_load_artifact(engine):
+    from gradguide.artifact import ARTIFACT_DIR, export_artifact, is_current, load_artifact
+
+    if not is_current():
+        export_artifact()
+    return lambda: load_artifact(ARTIFACT_DIR, verify=False)
+
+
+def _engine(engine):
+    from gradguide.fastpath import compile_pipeline
+    from gradguide.model import load_model
+
+    model = load_model()
+    return compile_pipeline(model) if engine == "fast" else model
+
+
+@case("predict_single", engine="fast")
+@case("predict_single", engine="sklearn")
+def bench_predict_single(engine):
+    from gradguide.schema import FeatureSchema
+
+    model = _engine(engine)
+    schema = FeatureSchema.from_model(model)
+    row = schema.encode_frame(synthetic_profiles(1), unknown="fallback").matrix
+    return lambda: model.predict_proba(schema.model_input(model, row))
+
+
+@case("predict_single", engine="cached")
+def bench_predict_cached(engine):
+    from gradguide.core import Predictor
+
+    predictor = Predictor(unknown="fallback")
+    profile = dict(cgpa=8.2, gre=315, toefl=105, gate_score=0, sop=4, lor=4, univ_rating=3,
+                   chance=0.7, research="Yes", career_goal="Industry", budget=60,
+                   pref_country="USA")
+    return lambda: predictor.predict(**profile)
+
+
+@case("predict_batch", engine="fast", rows=BATCH_ROWS)
+@case("predict_batch", engine="sklearn", rows=BATCH_ROWS)
+def bench_predict_batch(engine, rows):
+    from gradguide.schema import FeatureSchema
+
+    model = _engine(engine)
+    schema = FeatureSchema.from_model(model)
+    frame = synthetic_profiles(rows)
+
+    def score():
+        matrix = schema.encode_frame(frame, unknown="fallback").matrix
+        return model.predict_proba(schema.model_input(model, matrix))
+    return score
+
+
+# -- University Explorer -------------------------------------------------------
+
+def _lookup(stub_url, size):
+    """Lookup over the seed catalogue, so every answer comes from the stub or the cache."""
+    from gradguide.cache import open_response_cache
+    from gradguide.catalogue import open_catalogue
+    from gradguide.core import UniversityLookup
+    from gradguide.universities import trim_records
+    from gradguide.upstream import UniversityClient
+
+    catalogue = open_catalogue(Path(os.environ["GRADGUIDE_CACHE_DIR"]) / "seed.sqlite")
+    cache = open_response_cache(f"universities-{size}")
+    return UniversityLookup(catalogue, UniversityClient(stub_url, trim=trim_records), cache)
+
+
+def _local_catalogue(size):
+    from gradguide.catalogue import UniversityCatalogue, build_catalogue
+
+    path = Path(os.environ["GRADGUIDE_CACHE_DIR"]) / f"catalogue-{size}.sqlite"
+    if not path.exists():
+        build_catalogue(synthetic_universities(size), path)
+    return UniversityCatalogue(path)
+
+
+# One running stub per catalogue size, stopped by main()
+_STUBS = {}
+
+
+def _stub(size):
+    from stub_hipolabs import StubHipolabs
+
+    stub = _STUBS.get(size)
+    if stub is None:
+        stub = _STUBS[size] = StubHipolabs(synthetic_universities(size)).start()
+    return stub
+
+
+def _catalogue_cases(name):
+    def register(setup):
+        for size in CATALOGUE_SIZES:
+            case(name, catalogue=size)(setup)
+        return setup
+    return register
+
+
+@_catalogue_cases("universities_api")
+def bench_universities_api(catalogue):
+    """Round trip to the stub, as on a cache miss (bypasses the client's response cache)."""
+    lookup = _lookup(_stub(catalogue).url, catalogue)
+    return lambda: lookup.client._call({"country": "Country 7"})
+
+
+@_catalogue_cases("universities_cached")
+def bench_universities_cached(catalogue):
+    """``UniversityLookup.by_country`` answered from the on-disk tier and promoted to memory.
+
+    The memory tier is emptied before each call; otherwise every call after
+    the warm-up is the same dictionary hit whatever the catalogue size.
+    """
+    lookup = _lookup(_stub(catalogue).url, catalogue)
+
+    def by_country():
+        lookup.cache.memory.clear()
+        return lookup.by_country("Country 7")
+    return by_country
+
+
+@_catalogue_cases("universities_local")
+def bench_universities_local(catalogue):
+    """Country query against a local catalogue of the given size."""
+    local = _local_catalogue(catalogue)
+    return lambda: local.by_country("Country 7")
+
+
+@_catalogue_cases("name_search")
+def bench_name_search(catalogue):
+    """Name index query over the local catalogue (index built during warm-up)."""
+    local = _local_catalogue(catalogue)
+    return lambda: local.search_name(SEARCH_QUERY)
+
+
+@_catalogue_cases("name_search_cached")
+def bench_name_search_cached(catalogue):
+    """``UniversityLookup.search_name`` answered from the on-disk tier, as above."""
+    lookup = _lookup(_stub(catalogue).url, catalogue)
+
+    def search_name():
+        lookup.cache.memory.clear()
+        return lookup.search_name(SEARCH_QUERY)
+    return search_name
+
+
+@case("ranking_table", rows=10_000)
+@case("ranking_table", rows=15)
+def bench_ranking_table(rows):
+    """``get_university_data``'s table for ``rows`` universities."""
+    from gradguide.rankings import default_metrics, format_rankings, ranking_table
+
+    names = [record["name"] for record in synthetic_universities(rows)]
+    return lambda: format_rankings(ranking_table(names, "Germany", metrics=default_metrics()))
+
+
+def _matcher(size):
+    from gradguide.match import UniversityMatcher
+    from gradguide.rankings import ranking_table
+
+    records = synthetic_universities(size)
+    return UniversityMatcher(ranking_table([record["name"] for record in records],
+                                           [record["country"] for record in records]))
+
+
+@case("university_match", universities=100_000)
+@case("university_match", universities=10_000)
+def bench_university_match(universities):
+    """Top 10 universities for one profile, as on the Career Prediction page."""
+    matcher = _matcher(universities)
+    return lambda: matcher.match(cgpa=8.2, gre=315, toefl=105, gate_score=0, research="Yes",
+                                 budget=60)
+
+
+@case("university_match_batch", universities=10_000, students=1000)
+def bench_university_match_batch(universities, students):
+    """Top 10 universities for each of ``students`` profiles in one call."""
+    matcher = _matcher(universities)
+    profiles = synthetic_profiles(students)
+    return lambda: matcher.match_many(profiles)
+
+
+# -- Financial Planner ---------------------------------------------------------
+
+@case("financial_plan", scenarios=200_000)
+def bench_financial_plan(scenarios):
+    """One planner rerun: breakdown, Monte Carlo summary, EMI grid and schedule."""
+    from gradguide.finance import (cost_breakdown, payment_grid, repayment_schedule,
+                                   simulate, summarize)
+
+    def plan():
+        cost_breakdown(**FINANCE_INPUTS)
+        summary = summarize(simulate(n=scenarios, **FINANCE_INPUTS))
+        loan = summary["loan"][2]
+        payment_grid(loan, list(range(6, 17)), [3, 5, 7, 10, 15, 20])
+        repayment_schedule(loan, 10, 20)
+    return plan
+
+
+# -- Running and comparing -----------------------------------------------------
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import numpy
+    import pandas
+    import sklearn
+
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def run(pattern=None, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME):
+    results = {}
+    for name, params, setup in CASES:
+        key = case_id(name, params)
+        if pattern and pattern not in key:
+            continue
+        stats = measure(setup(**params), repeat, min_time)
+        results[key] = {"name": name, "params": params, **stats}
+        print(f"{key:<48} {stats['median'] * 1e3:>11.3f} ms  "
+              f"(min {stats['min'] * 1e3:.3f}, {stats['repeat']}x{stats['number']})", flush=True)
+    return results
+
+
+def compare(base, head, threshold=DEFAULT_THRESHOLD):
+    """Prints median ratios head/base; returns the keys slower than ``threshold``."""
+    regressions = []
+    print(f"{'case':<48} {'base (ms)':>11} {'head (ms)':>11} {'ratio':>7}")
+    for key in sorted(set(base) & set(head)):
+        ratio = head[key]["median"] / base[key]["median"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(key)
+            flag = "  slower"
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"{key:<48} {base[key]['median'] * 1e3:>11.3f} {head[key]['median'] * 1e3:>11.3f} "
+              f"{ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose id contains this")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="Seconds each timed round lasts at least")
+    parser.add_argument("--quick", action="store_true", help="Two short rounds per case")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASE", help="Earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.repeat, args.min_time = 2, 0.01
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # Before gradguide is imported: caches and catalogues in scratch, no live API
+        os.environ["GRADGUIDE_CACHE_DIR"] = scratch
+        os.environ["GRADGUIDE_UNIVERSITY_API"] = "http://127.0.0.1:9"
+        env = environment()
+        try:
+            results = run(args.pattern, args.repeat, args.min_time)
+        finally:
+            for stub in _STUBS.values():
+                stub.stop()
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{env['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"environment": env, "results": results}, indent=2) + "\n")
+    print(f"Wrote {len(results)} results to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            base = json.load(handle)
+        print(f"\nAgainst {args.compare} ({base['environment'].get('commit')}):")
+        regressions = compare(base["results"], results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than {args.threshold:g}x: "
+                  f"{', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Reusable building blocks behind the GradGuide Streamlit app."""
@@ -0,0 +1,358 @@
+"""Memory-mapped model artifact shared by every worker process on a host.
+
+``joblib.load`` gives each Streamlit worker its own unpickled copy of the
+forest, and sklearn's ``Tree`` copies its node arrays out of any memory map
+while unpickling.  Instead, the compiled fast-path arrays
+(see ``gradguide.fastpath``) are exported once as raw ``.npy`` files next to
+a ``manifest.json`` and opened with ``mmap_mode='r'``: workers then share the
+same physical pages through the OS page cache, and cold start is a handful
+of ``mmap`` calls rather than a full deserialization.
+
+The manifest records the SHA-256 of the source pickle and of every array,
+plus the scikit-learn version recorded in the pickle, and is checked on load.
+
+Each export is a complete directory inside the artifact directory, and a
+``CURRENT`` file names the one in use -- the same pointer scheme as
+``gradguide.versions``::
+
+    career_path_model.mmap/
+      CURRENT              # e.g. "export-3f9c2a1b"
+      export-3f9c2a1b/     # manifest.json + one .npy per array
+      export-77d0e5c4/     # a replaced export, kept briefly for readers mid-load
+
+A new export is written under a staging name and ``CURRENT`` is switched
+with ``os.replace``, so readers always find a complete artifact.  Exporters
+serialise the switch with a file lock, and one that finds a current
+artifact already installed by another process simply uses it.
+
+Usage::
+
+    python -m gradguide.artifact export      # build/refresh the artifact
+    python -m gradguide.artifact info        # verify it and report load cost
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickletools
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+from gradguide import telemetry
+from gradguide.fastpath import CompiledForest, compile_pipeline
+from gradguide.model import MODEL_PATH, load_model
+
+ARTIFACT_DIR = MODEL_PATH.with_suffix(".mmap")
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "CURRENT"
+LOCK_NAME = ".lock"
+EXPORT_PREFIX = "export-"
+STAGING_PREFIX = ".staging-"
+FORMAT_VERSION = 3
+# How long a replaced export outlives the switch, for readers still loading it
+RETIRED_GRACE = 60  # seconds
+# Staging directories older than this were left by a crashed exporter
+STALE_STAGING = 3600  # seconds
+
+# CompiledForest attributes stored as one .npy file each
+ARRAY_FIELDS = ("num_index", "mean", "scale", "cat_index", "children", "is_leaf",
+                "feature", "threshold", "value", "roots", "classes_", "importances")
+
+
+class ArtifactError(RuntimeError):
+    """Raised when an exported artifact is missing, stale or corrupted."""
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def recorded_sklearn_version(path=MODEL_PATH):
+    """scikit-learn version(s) stored in the pickle's ``_sklearn_version`` fields.
+
+    Read straight from the pickle opcodes, so nothing has to be unpickled.
+    """
+    versions = set()
+    previous = None
+    with open(path, "rb") as handle:
+        try:
+            for _, arg, _ in pickletools.genops(handle):
+                if isinstance(arg, str):
+                    if previous == "_sklearn_version":
+                        versions.add(arg)
+                    previous = arg
+        except ValueError:
+            # joblib appends raw array buffers the opcode reader cannot parse;
+            # the estimator metadata we need comes before them.
+            pass
+    return sorted(versions)
+
+
+def installed_sklearn_version():
+    """Installed scikit-learn version, looked up without importing it."""
+    try:
+        return metadata.version("scikit-learn")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def current_rss():
+    """Resident set size of this process in bytes (Linux), else peak RSS."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def export_artifact(model_path=MODEL_PATH, artifact_dir=ARTIFACT_DIR):
+    """Exports the pickle at ``model_path`` as a memory-mappable artifact.
+
+    The export is written to a staging directory and published by switching
+    ``CURRENT``, so workers never observe a half-written artifact.  Returns
+    the manifest of the artifact in use afterwards.
+    """
+    model_path, artifact_dir = Path(model_path), Path(artifact_dir)
+    installed = installed_sklearn_version()
+    recorded = recorded_sklearn_version(model_path)
+    if recorded and recorded != [installed]:
+        raise ArtifactError(
+            f"Pickle was fitted with scikit-learn {', '.join(recorded)} but "
+            f"{installed} is installed; refusing to export.")
+
+    engine = compile_pipeline(load_model(model_path))
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=artifact_dir))
+    try:
+        arrays = {}
+        for field in ARRAY_FIELDS:
+            file_name = f"{field}.npy"
+            np.save(staging / file_name, np.ascontiguousarray(getattr(engine, field)),
+                    allow_pickle=False)
+            arrays[field] = {"file": file_name, "sha256": file_sha256(staging / file_name)}
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "source": model_path.name,
+            "source_sha256": file_sha256(model_path),
+            "sklearn_version": recorded[0] if recorded else installed,
+            "feature_names": engine.feature_names,
+            "categories": [c.tolist() for c in engine.categories],
+            "arrays": arrays,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        with open(staging / MANIFEST_NAME, "w") as handle:
+            json.dump(manifest, handle, indent=2)
+
+        with _export_lock(artifact_dir):
+            if is_current(artifact_dir, model_path):
+                # Another process exported the same pickle meanwhile; use theirs
+                shutil.rmtree(staging, ignore_errors=True)
+                return read_manifest(artifact_dir)
+            _publish(staging, artifact_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+@contextmanager
+def _export_lock(artifact_dir):
+    """Exclusive lock serialising exporters of ``artifact_dir`` (readers never wait)."""
+    import fcntl
+
+    with open(artifact_dir / LOCK_NAME, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _publish(staging, artifact_dir):
+    """Makes ``staging`` the current export and prunes old ones; call under the lock.
+
+    A replaced export is kept for ``RETIRED_GRACE`` seconds (its mtime marks
+    when it was replaced) so a reader that resolved ``CURRENT`` just before
+    the switch can finish loading; processes still mapping pruned files keep
+    their pages until they exit.
+    """
+    previous = _current_name(artifact_dir)
+    name = EXPORT_PREFIX + staging.name[len(STAGING_PREFIX):]
+    os.rename(staging, artifact_dir / name)
+    fd, pointer = tempfile.mkstemp(prefix=f".{CURRENT_NAME}.", dir=artifact_dir)
+    with os.fdopen(fd, "w") as handle:
+        handle.write(name + "\n")
+    os.replace(pointer, artifact_dir / CURRENT_NAME)
+    if previous is not None and (artifact_dir / previous).exists():
+        os.utime(artifact_dir / previous)
+
+    now = time.time()
+    for path in artifact_dir.iterdir():
+        if path.name.startswith(EXPORT_PREFIX):
+            expired = path.name != name and now - path.stat().st_mtime > RETIRED_GRACE
+        else:
+            expired = (path.name.startswith(STAGING_PREFIX)
+                       and now - path.stat().st_mtime > STALE_STAGING)
+        if expired:
+            shutil.rmtree(path, ignore_errors=True)
+    # Artifacts exported before the CURRENT pointer kept their files at the top level
+    for path in artifact_dir.glob("*.npy"):
+        path.unlink(missing_ok=True)
+    (artifact_dir / MANIFEST_NAME).unlink(missing_ok=True)
+
+
+def _current_name(artifact_dir):
+    try:
+        return (Path(artifact_dir) / CURRENT_NAME).read_text().strip() or None
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def current_export(artifact_dir=ARTIFACT_DIR):
+    """Directory of the export ``CURRENT`` points at."""
+    name = _current_name(artifact_dir)
+    if name is None:
+        raise ArtifactError(f"No model artifact at {artifact_dir}")
+    return Path(artifact_dir) / name
+
+
+def read_manifest(artifact_dir=ARTIFACT_DIR, export=None):
+    """Manifest of ``export`` (default: the current export) of ``artifact_dir``."""
+    export = export or current_export(artifact_dir)
+    try:
+        with open(export / MANIFEST_NAME) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        raise ArtifactError(f"No model artifact at {artifact_dir}") from None
+
+
+def is_current(artifact_dir=ARTIFACT_DIR, model_path=MODEL_PATH):
+    """True when the artifact exists and was exported from ``model_path`` as it is now."""
+    try:
+        manifest = read_manifest(artifact_dir)
+    except (ArtifactError, ValueError):
+        return False
+    return (manifest.get("format_version") == FORMAT_VERSION
+            and manifest.get("source_sha256") == file_sha256(model_path))
+
+
+def load_artifact(artifact_dir=ARTIFACT_DIR, mmap=True, verify=True):
+    """Opens an exported artifact as a ``CompiledForest`` backed by memory maps.
+
+    With ``verify`` every array file is hashed against the manifest and the
+    recorded scikit-learn version is checked against the installed one.
+    """
+    # Resolved once, so every file comes from the same export even if a new one is published
+    export = current_export(artifact_dir)
+    manifest = read_manifest(artifact_dir, export)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ArtifactError(f"Unsupported artifact format {manifest.get('format_version')}")
+
+    if verify:
+        installed = installed_sklearn_version()
+        # The arrays themselves need only NumPy, so a worker without sklearn is fine
+        if installed is not None and manifest["sklearn_version"] != installed:
+            raise ArtifactError(
+                f"Artifact was exported from scikit-learn {manifest['sklearn_version']}, "
+                f"but {installed} is installed")
+
+    arrays = {}
+    for field in ARRAY_FIELDS:
+        entry = manifest["arrays"][field]
+        path = export / entry["file"]
+        if verify and file_sha256(path) != entry["sha256"]:
+            raise ArtifactError(f"Checksum mismatch for {path}")
+        arrays[field] = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+
+    return CompiledForest(
+        manifest["feature_names"], arrays["num_index"], arrays["mean"], arrays["scale"],
+        arrays["cat_index"], [np.asarray(c) for c in manifest["categories"]],
+        arrays["children"], arrays["is_leaf"], arrays["feature"], arrays["threshold"],
+        arrays["value"], arrays["roots"], arrays["classes_"], arrays["importances"])
+
+
+def warm_start(engine):
+    """Faults every mapped page in and runs one prediction, so the first user is fast."""
+    for field in ARRAY_FIELDS:
+        np.asarray(getattr(engine, field)).sum()
+    engine.predict(np.zeros((1, len(engine.feature_names))))
+    return engine
+
+
+def open_engine(model_path=MODEL_PATH, artifact_dir=ARTIFACT_DIR, warm=True, verify=True):
+    """Loads the shared artifact, exporting it first if missing or stale.
+
+    Returns ``(engine, report)`` where ``report`` has the load time and the
+    resident memory before and after loading.
+    """
+    rss_before = current_rss()
+    start = time.perf_counter()
+    exported = False
+    if not is_current(artifact_dir, model_path):
+        export_artifact(model_path, artifact_dir)
+        exported = True
+    with telemetry.span("artifact_load"):
+        engine = load_artifact(artifact_dir, verify=verify)
+        if warm:
+            warm_start(engine)
+    report = {
+        "artifact": str(artifact_dir),
+        "exported": exported,
+        "load_seconds": time.perf_counter() - start,
+        "rss_before": rss_before,
+        "rss_after": current_rss(),
+        "mapped_bytes": sum(np.asarray(getattr(engine, f)).nbytes for f in ARRAY_FIELDS),
+    }
+    return engine, report
+
+
+def open_pipeline(model_path=MODEL_PATH):
+    """Unpickles the sklearn Pipeline, returning ``(model, report)`` like ``open_engine``."""
+    rss_before = current_rss()
+    start = time.perf_counter()
+    model = load_model(model_path)
+    report = {
+        "artifact": str(model_path),
+        "exported": False,
+        "load_seconds": time.perf_counter() - start,
+        "rss_before": rss_before,
+        "rss_after": current_rss(),
+    }
+    return model, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or inspect the mmap model artifact.")
+    parser.add_argument("command", choices=["export", "info"])
+    parser.add_argument("--model", default=str(MODEL_PATH), help="Source model pickle")
+    parser.add_argument("--artifact", default=str(ARTIFACT_DIR), help="Artifact directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        manifest = export_artifact(args.model, args.artifact)
+        print(f"Exported {args.model} (scikit-learn {manifest['sklearn_version']}) "
+              f"-> {args.artifact}")
+    else:
+        engine, report = open_engine(args.model, args.artifact)
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""Small thread-safe caches used to memoize hot paths across Streamlit sessions.
+
+``LRUCache`` is an in-process tier; ``DiskCache`` is a SQLite tier shared by
+every worker process on a host; ``TieredCache`` puts the first in front of
+the second.  All three share the same ``get``/``set``/``get_or_compute``/
+``stats`` surface and accept a per-entry ``ttl`` on ``set``.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with a per-entry time-to-live.
+
+    Streamlit serves every session from its own thread, so one instance held
+    in ``st.cache_resource`` is shared by all of them; access is guarded by a
+    lock.  Hit/miss/eviction counters are kept to help size ``maxsize``.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Returns the cached value for ``key``, or ``default`` on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Stores ``value``, evicting the least recently used entry when full.
+
+        ``ttl`` overrides the cache-wide time-to-live for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached value for ``key``, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Counters for sizing the cache; ``hit_rate`` is over all lookups so far."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class DiskCache:
+    """SQLite-backed cache shared by all processes on a host.
+
+    Values must be JSON-serializable; they come back as JSON types (tuples as
+    lists).  Expiry uses wall-clock time so it means the same thing in every
+    process.  Every 64 writes, expired rows are purged and the least recently
+    read ones beyond ``max_entries`` are evicted.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        expires_at REAL,
+        accessed_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+    """
+
+    def __init__(self, path, max_entries=50_000, ttl=None, clock=time.time):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(self._SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode_key(key):
+        return key if isinstance(key, str) else json.dumps(key, separators=(",", ":"))
+
+    def get(self, key, default=None):
+        return self.get_entry(key, (default, None))[0]
+
+    def get_entry(self, key, default=None):
+        """``(value, seconds until it expires)`` for ``key``, read in one query.
+
+        The lifetime is None for entries that never expire; ``default`` is
+        returned for missing or expired keys.
+        """
+        key = self._encode_key(key)
+        now = self._clock()
+        conn = self._connection()
+        row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?",
+                           (key,)).fetchone()
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return default
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            conn.execute("DELETE FROM entries WHERE key = ? AND expires_at <= ?", (key, now))
+            with self._lock:
+                self.expirations += 1
+                self.misses += 1
+            return default
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self.hits += 1
+        return json.loads(value), None if expires_at is None else expires_at - now
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        now = self._clock()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?)",
+            (self._encode_key(key), json.dumps(value, separators=(",", ":")),
+             None if ttl is None else now + ttl, now))
+        with self._lock:
+            self._writes += 1
+            check = self._writes % 64 == 0
+        if check:
+            self._evict(conn)
+
+    def _evict(self, conn):
+        conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                     (self._clock(),))
+        excess = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute("DELETE FROM entries WHERE key IN "
+                         "(SELECT key FROM entries ORDER BY accessed_at LIMIT ?)", (excess,))
+            with self._lock:
+                self.evictions += excess
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        self._connection().execute("DELETE FROM entries")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class TieredCache:
+    """In-process ``LRUCache`` in front of a host-wide ``DiskCache``.
+
+    Reads try memory, then disk (promoting hits into memory for the entry's
+    remaining lifetime); writes go to both tiers.
+    """
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        # Value and lifetime from the same row, so a concurrent rewrite or
+        # expiry can't leave the promoted copy without the disk entry's TTL
+        value, ttl = self.disk.get_entry(key, (_MISSING, None))
+        if value is _MISSING:
+            return default
+        self.memory.set(key, value, ttl=ttl)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.memory.set(key, value, ttl=ttl)
+        self.disk.set(key, value, ttl=ttl)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self):
+        return {"memory": self.memory.stats(), "disk": self.disk.stats()}
+
+
+class ResponseCache(TieredCache):
+    """``TieredCache`` for lookups returning ``(records, source)`` pairs.
+
+    Records pass through ``trim`` before being stored.  Empty results and
+    answers from a source listed in ``degraded_sources`` (fallbacks served
+    while the live service is down) are kept only for ``negative_ttl``, so
+    they are retried soon without hammering the service meanwhile.
+    """
+
+    def __init__(self, memory, disk, ttl=3600, negative_ttl=300, trim=None,
+                 degraded_sources=()):
+        super().__init__(memory, disk)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.trim = trim
+        self.degraded_sources = frozenset(degraded_sources)
+        self._lock = threading.Lock()
+        self.negative_hits = 0
+
+    def _is_negative(self, records, source):
+        return not records or source in self.degraded_sources
+
+    def lookup(self, key, compute):
+        """Cached ``(records, source)`` for ``key``, calling ``compute()`` on a miss."""
+        cached = self.get(key, _MISSING)
+        if cached is not _MISSING:
+            records, source = cached
+            if self._is_negative(records, source):
+                with self._lock:
+                    self.negative_hits += 1
+            return records, source
+
+        records, source = compute()
+        if self.trim is not None:
+            records = self.trim(records)
+        self.set(key, (records, source),
+                 ttl=self.negative_ttl if self._is_negative(records, source) else self.ttl)
+        return records, source
+
+    def stats(self):
+        memory, disk = self.memory.stats(), self.disk.stats()
+        with self._lock:
+            negative_hits = self.negative_hits
+        lookups = memory["hits"] + memory["misses"]
+        return {
+            "memory_hits": memory["hits"],
+            "disk_hits": disk["hits"],
+            "misses": disk["misses"],
+            "negative_hits": negative_hits,
+            "hit_rate": (memory["hits"] + disk["hits"]) / lookups if lookups else 0.0,
+            "memory": memory,
+            "disk": disk,
+        }
+
+
+def cache_dir():
+    """Directory for on-disk cache tiers, ``$GRADGUIDE_CACHE_DIR`` or ``<repo>/.cache``."""
+    return Path(os.environ.get(
+        "GRADGUIDE_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+
+
+def open_response_cache(name, memory_entries=1024, disk_entries=50_000, **kwargs):
+    """``ResponseCache`` whose disk tier is ``<cache_dir()>/<name>.sqlite``."""
+    return ResponseCache(
+        LRUCache(maxsize=memory_entries, clock=time.time),
+        DiskCache(cache_dir() / f"{name}.sqlite", max_entries=disk_entries),
+        **kwargs)
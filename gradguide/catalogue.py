@@ -0,0 +1,305 @@
+"""Local, indexed university catalogue backing the University Explorer.
+
+A hipolabs-format JSON dump (a list of ``{"name", "country", "alpha_two_code",
+"state-province", "web_pages", "domains"}`` records) is ingested into a
+compact SQLite file indexed on normalized country, so explorer lookups never
+wait on universities.hipolabs.com; name search runs on an in-memory
+``gradguide.search.NameIndex`` built from the same rows.  The file is rebuilt
+off to the side and renamed into place, which lets readers in other threads
+and worker processes keep querying while a refresh runs.
+
+Usage::
+
+    python -m gradguide.catalogue ingest world_universities_and_domains.json
+    python -m gradguide.catalogue refresh      # download the full dump
+    python -m gradguide.catalogue country "United States"
+    python -m gradguide.catalogue search "institute of technology"
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from gradguide.countries import resolve_country
+from gradguide.text import normalize
+from gradguide.universities import SEED_COUNTRIES, UNIVERSITY_DATA, placeholder_web_page
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_PATH = Path(os.environ.get(
+    "GRADGUIDE_CATALOGUE", Path(__file__).resolve().parent.parent / "universities.sqlite"))
+
+# Full hipolabs dataset; the search API is served from this same list
+DUMP_URL = ("https://raw.githubusercontent.com/Hipo/university-domains-list/"
+            "master/world_universities_and_domains.json")
+REFRESH_INTERVAL = 24 * 3600  # seconds
+
+_SCHEMA = """
+CREATE TABLE universities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    country TEXT NOT NULL,
+    country_norm TEXT NOT NULL,
+    alpha_two_code TEXT,
+    state_province TEXT,
+    web_pages TEXT NOT NULL,
+    domains TEXT NOT NULL
+);
+CREATE INDEX universities_country ON universities (country_norm);
+CREATE INDEX universities_alpha ON universities (alpha_two_code);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_COLUMNS = "name, country, alpha_two_code, state_province, web_pages, domains"
+
+
+def _to_record(row):
+    name, country, alpha_two_code, state_province, web_pages, domains = row
+    return {
+        "name": name,
+        "web_pages": json.loads(web_pages),
+        "country": country,
+        "state-province": state_province,
+        "alpha_two_code": alpha_two_code,
+        "domains": json.loads(domains),
+    }
+
+
+def seed_records():
+    """The hardcoded ``UNIVERSITY_DATA`` lists as hipolabs-format records."""
+    records = []
+    for key, names in UNIVERSITY_DATA.items():
+        country, alpha_two_code = SEED_COUNTRIES[key]
+        for name in names:
+            records.append({
+                "name": name,
+                "country": country,
+                "alpha_two_code": alpha_two_code,
+                "state-province": None,
+                "web_pages": [placeholder_web_page(name)],
+                "domains": [],
+            })
+    return records
+
+
+def build_catalogue(records, path=CATALOGUE_PATH, source="dump"):
+    """Writes ``records`` to a fresh SQLite catalogue and atomically swaps it in.
+
+    Returns the number of universities stored.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(staging)
+        try:
+            conn.executescript(_SCHEMA)
+            rows = (
+                (rec["name"], rec.get("country") or "",
+                 normalize(rec.get("country") or ""), rec.get("alpha_two_code"),
+                 rec.get("state-province"), json.dumps(rec.get("web_pages") or []),
+                 json.dumps(rec.get("domains") or []))
+                for rec in records if rec.get("name")
+            )
+            conn.executemany(
+                "INSERT INTO universities (name, country, country_norm, "
+                "alpha_two_code, state_province, web_pages, domains) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            count = conn.execute("SELECT COUNT(*) FROM universities").fetchone()[0]
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("refreshed_at", str(time.time())),
+                ("source", source),
+                ("count", str(count)),
+            ])
+            conn.commit()
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.chmod(staging, 0o644)
+        os.replace(staging, path)
+    except BaseException:
+        if os.path.exists(staging):
+            os.remove(staging)
+        raise
+    return count
+
+
+def load_dump(source):
+    """Reads a hipolabs-format JSON dump from a local path or an http(s) URL."""
+    if str(source).startswith(("http://", "https://")):
+        import requests
+
+        response = requests.get(source, timeout=60)
+        response.raise_for_status()
+        return response.json()
+    with open(source, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def ingest(source, path=CATALOGUE_PATH):
+    """Loads a dump file/URL into the catalogue at ``path``."""
+    return build_catalogue(load_dump(source), path, source=str(source))
+
+
+class UniversityCatalogue:
+    """Read-side of the SQLite catalogue, safe to share across threads.
+
+    Each thread keeps its own read-only connection and reopens it when the
+    file has been replaced by a refresh.
+    """
+
+    def __init__(self, path=CATALOGUE_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._index = None
+        self._index_inode = None
+        self._index_lock = threading.Lock()
+
+    def _connection(self):
+        inode = os.stat(self.path).st_ino
+        local = self._local
+        if getattr(local, "inode", None) != inode:
+            if getattr(local, "conn", None) is not None:
+                local.conn.close()
+            local.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                         check_same_thread=False)
+            local.inode = inode
+        return local.conn
+
+    def exists(self):
+        return self.path.exists()
+
+    def by_country(self, country, limit=None):
+        """Universities in ``country``, given as any name, alias or ISO code."""
+        resolved = resolve_country(country)
+        if resolved is not None:
+            sql = f"SELECT {_COLUMNS} FROM universities WHERE alpha_two_code = ? ORDER BY id"
+            params = [resolved.iso2]
+        else:
+            sql = f"SELECT {_COLUMNS} FROM universities WHERE country_norm = ? ORDER BY id"
+            params = [normalize(country)]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_to_record(row) for row in self._connection().execute(sql, params)]
+
+    def records(self):
+        """Every university in the catalogue, in dump order."""
+        sql = f"SELECT {_COLUMNS} FROM universities ORDER BY id"
+        return [_to_record(row) for row in self._connection().execute(sql)]
+
+    def search_index(self):
+        """In-memory ``NameIndex`` over the catalogue, rebuilt after each refresh."""
+        from gradguide.search import NameIndex
+
+        inode = os.stat(self.path).st_ino
+        with self._index_lock:
+            if self._index is None or self._index_inode != inode:
+                self._index = NameIndex(self.records())
+                self._index_inode = inode
+            return self._index
+
+    def search_name(self, name, limit=20):
+        """Best ``limit`` universities for a (possibly partial or misspelled) name."""
+        return self.search_index().search(name, k=limit)
+
+    def meta(self):
+        """Catalogue metadata: ``refreshed_at`` (epoch seconds), ``source`` and ``count``."""
+        rows = dict(self._connection().execute("SELECT key, value FROM meta"))
+        rows["refreshed_at"] = float(rows.get("refreshed_at", 0))
+        rows["count"] = int(rows.get("count", 0))
+        return rows
+
+    def is_seed(self):
+        """True while the catalogue only holds the built-in ``UNIVERSITY_DATA`` lists."""
+        return self.meta()["source"] == "seed"
+
+    def age(self):
+        """Seconds since the catalogue was last rebuilt."""
+        return time.time() - self.meta()["refreshed_at"]
+
+
+def open_catalogue(path=CATALOGUE_PATH):
+    """Opens the catalogue, seeding it from ``UNIVERSITY_DATA`` if none exists yet."""
+    catalogue = UniversityCatalogue(path)
+    if not catalogue.exists():
+        build_catalogue(seed_records(), path, source="seed")
+    return catalogue
+
+
+class BackgroundRefresher(threading.Thread):
+    """Daemon thread that re-ingests the dump whenever the catalogue gets stale."""
+
+    def __init__(self, catalogue, source=DUMP_URL, interval=REFRESH_INTERVAL):
+        super().__init__(name="catalogue-refresh", daemon=True)
+        self.catalogue = catalogue
+        self.source = source
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def refresh_if_stale(self):
+        if not self.catalogue.is_seed() and self.catalogue.age() < self.interval:
+            return False
+        try:
+            count = ingest(self.source, self.catalogue.path)
+        except Exception:
+            logger.warning("Catalogue refresh from %s failed", self.source, exc_info=True)
+            return False
+        logger.info("Catalogue refreshed with %d universities", count)
+        return True
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.refresh_if_stale()
+            self._stop_event.wait(min(self.interval, 3600))
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local university catalogue.")
+    parser.add_argument("--db", default=str(CATALOGUE_PATH), help="Catalogue SQLite file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest_cmd = commands.add_parser("ingest", help="Load a hipolabs JSON dump (path or URL)")
+    ingest_cmd.add_argument("source")
+    refresh_cmd = commands.add_parser("refresh", help="Download and load the full dump")
+    refresh_cmd.add_argument("--url", default=DUMP_URL)
+    commands.add_parser("seed", help="Rebuild from the built-in UNIVERSITY_DATA lists")
+    country_cmd = commands.add_parser("country", help="List universities in a country")
+    country_cmd.add_argument("country")
+    search_cmd = commands.add_parser("search", help="Search universities by name")
+    search_cmd.add_argument("name")
+    args = parser.parse_args(argv)
+
+    if args.command in ("ingest", "refresh"):
+        source = args.source if args.command == "ingest" else args.url
+        start = time.perf_counter()
+        count = ingest(source, args.db)
+        print(f"Ingested {count} universities into {args.db} "
+              f"in {time.perf_counter() - start:.2f}s")
+    elif args.command == "seed":
+        print(f"Seeded {build_catalogue(seed_records(), args.db, source='seed')} universities")
+    else:
+        catalogue = UniversityCatalogue(args.db)
+        start = time.perf_counter()
+        if args.command == "country":
+            results = catalogue.by_country(args.country)
+        else:
+            results = catalogue.search_name(args.name)
+        elapsed = time.perf_counter() - start
+        for record in results[:20]:
+            print(f"{record['name']} ({record['country']})")
+        print(f"{len(results)} result(s) in {elapsed * 1e3:.2f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,449 @@
+"""Headless entry points: everything the app computes, without Streamlit.
+
+Workers, batch jobs and tests use this module instead of GradGuide.py::
+
+    from gradguide.core import Predictor, UniversityLookup, cost_breakdown
+
+    predictor = Predictor()
+    predictor.recommend(cgpa=8.2, gre=315, toefl=105, gate_score=0, sop=4, lor=4,
+                        univ_rating=3, chance=0.7, research="Yes",
+                        career_goal="Industry", budget=60, pref_country="USA")
+
+Importing it loads NumPy and the standard library only.  scikit-learn and
+joblib load with a pickled Pipeline (not with the fast-path artifact),
+requests with the first live API call, and pandas with the helpers that
+return DataFrames.  Streamlit and plotly are never imported.
+"""
+import logging
+import os
+import threading
+import time
+
+from gradguide import telemetry
+from gradguide.artifact import open_engine, open_pipeline
+from gradguide.cache import LRUCache, open_response_cache
+from gradguide.catalogue import BackgroundRefresher, open_catalogue
+from gradguide.catalogue import seed_records as all_seed_records
+from gradguide.countries import canonical_country_name
+from gradguide.features import path_label
+from gradguide.finance import cost_breakdown, simulate, summarize
+from gradguide.predict import predict_profile
+from gradguide.schema import FeatureSchema
+from gradguide.text import normalize
+from gradguide.universities import placeholder_web_page, seed_universities, trim_records
+from gradguide.versions import ModelStore
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["LoadedModel", "Predictor", "UniversityLookup", "cost_breakdown", "simulate", "summarize"]
+
+# Prediction cache shared by every session; sized for distinct form submissions
+PREDICTION_CACHE_SIZE = 4096
+PREDICTION_CACHE_TTL = 3600  # seconds
+# How often a Predictor looks for a newly promoted model version
+MODEL_REFRESH_INTERVAL = 5  # seconds
+
+# Most results the name search returns
+SEARCH_RESULTS = 20
+# Rows in the ranking table
+TOP_UNIVERSITIES = 15
+
+# Lifetime of cached university lookups; empty or fallback answers are retried sooner
+UNIVERSITY_CACHE_TTL = 3600  # seconds
+UNIVERSITY_NEGATIVE_TTL = 300  # seconds
+# Countries whose scored university tables stay in memory for matching
+MATCHER_CACHE_SIZE = 16
+# Universities recommended per student
+UNIVERSITY_MATCHES = 10
+
+
+class LoadedModel:
+    """One model version with its feature schema, prediction cache and explainer.
+
+    Loaded once and never modified, so a caller holding it keeps a
+    consistent model for as long as it needs, across a hot swap.
+    """
+
+    def __init__(self, model, load_report, version=None, unknown="error",
+                 cache_size=PREDICTION_CACHE_SIZE, cache_ttl=PREDICTION_CACHE_TTL):
+        self.model = model
+        self.load_report = load_report
+        self.version = version
+        self.schema = FeatureSchema.from_model(model)
+        self.unknown = unknown
+        self.cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        self._explainer = None
+
+    @property
+    def explainer(self):
+        """``Explainer`` over the model's trees, built on first use."""
+        if self._explainer is None:
+            from gradguide.explain import Explainer
+
+            self._explainer = Explainer.from_model(self.model)
+        return self._explainer
+
+    def encode(self, **inputs):
+        """Validated ``Encoded`` row for the Career Prediction form inputs."""
+        with telemetry.span("encode"):
+            return self.schema.encode_profile(inputs, self.unknown)
+
+    def predict_encoded(self, encoded):
+        """Model class (1 = MS abroad) for a row from ``encode``."""
+        with telemetry.span("predict"):
+            return predict_profile(self.model, self.schema, encoded.matrix[0], cache=self.cache)
+
+    def predict(self, **inputs):
+        """Model class (1 = MS abroad) for the Career Prediction form inputs."""
+        return self.predict_encoded(self.encode(**inputs))
+
+    def explain_encoded(self, encoded):
+        """``Explanation`` (probabilities and per-feature contributions) for ``encode`` rows."""
+        with telemetry.span("explain"):
+            return self.explainer.explain(encoded.matrix)
+
+    def importances(self):
+        """Global importance of each model feature, summing to 1."""
+        return self.explainer.importances()
+
+    def recommend(self, **inputs):
+        """Recommended path label for the Career Prediction form inputs."""
+        return path_label(self.predict(**inputs))
+
+
+class Predictor:
+    """The current career-path model, hot-swapped when a new version is promoted.
+
+    ``fast`` selects the memory-mapped compiled engine (same predictions, no
+    scikit-learn import); by default it follows ``$GRADGUIDE_FAST_PATH``.
+    ``unknown`` is the schema policy for labels the model has no code for:
+    "error" raises ``SchemaError``, "fallback" scores them as the fallback
+    label and reports them in ``Encoded.remapped``.
+
+    The model is the ``gradguide.versions`` store's current version, or the
+    shipped pickle while none is promoted.  ``refresh`` loads a newly promoted
+    version next to the old one and then swaps a single reference; call
+    ``current()`` once and use the returned ``LoadedModel`` to keep encoding,
+    prediction and explanation on one version.
+    """
+
+    def __init__(self, fast=None, cache_size=PREDICTION_CACHE_SIZE,
+                 cache_ttl=PREDICTION_CACHE_TTL, unknown="error", store=None,
+                 refresh_interval=MODEL_REFRESH_INTERVAL):
+        if fast is None:
+            fast = os.environ.get("GRADGUIDE_FAST_PATH") == "1"
+        self.fast = fast
+        self.unknown = unknown
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.store = store if store is not None else ModelStore()
+        self.refresh_interval = refresh_interval
+        self._swap_lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        # Versions that failed to load; they are immutable, so never retried
+        self._failed_versions = set()
+        self._active = self._open(self.store.current())
+        telemetry.register_collector("prediction_cache", lambda: self._active.cache.stats())
+
+    def _open(self, version):
+        model_path, artifact_dir = self.store.paths(version)
+        model, report = (open_engine(model_path, artifact_dir) if self.fast
+                         else open_pipeline(model_path))
+        report["version"] = version or "shipped"
+        return LoadedModel(model, report, version, self.unknown, self.cache_size,
+                           self.cache_ttl)
+
+    def current(self):
+        """The ``LoadedModel`` serving right now."""
+        return self._active
+
+    def refresh(self, force=False):
+        """Swaps to the store's current version if it changed; True if it did.
+
+        The store is checked at most every ``refresh_interval`` seconds unless
+        ``force``.  A version that fails to load for any reason (missing
+        files, a truncated or incompatible pickle) is logged, counted and not
+        retried; the old model keeps serving.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return False
+        self._checked_at = now
+        if self._settled(self.store.current()):
+            return False
+        with self._swap_lock:
+            version = self.store.current()
+            if self._settled(version):
+                return False
+            try:
+                with telemetry.span("model_swap"):
+                    loaded = self._open(version)
+            except Exception as exc:
+                # Runs on every Streamlit rerun and in serve's watcher thread: never raise
+                logger.error("Cannot load model version %s; still serving %s",
+                             version or "shipped", self._active.version or "shipped",
+                             exc_info=True)
+                telemetry.increment("model_swap_errors", error=type(exc).__name__)
+                self._failed_versions.add(version)
+                return False
+            # Requests already holding the old LoadedModel finish on it
+            self._active = loaded
+        telemetry.increment("model_swaps", version=version or "shipped")
+        return True
+
+    def _settled(self, version):
+        return version == self._active.version or version in self._failed_versions
+
+    @property
+    def version(self):
+        return self._active.version
+
+    @property
+    def model(self):
+        return self._active.model
+
+    @property
+    def schema(self):
+        return self._active.schema
+
+    @property
+    def cache(self):
+        return self._active.cache
+
+    @property
+    def load_report(self):
+        return self._active.load_report
+
+    @property
+    def explainer(self):
+        return self._active.explainer
+
+    def encode(self, **inputs):
+        return self._active.encode(**inputs)
+
+    def predict_encoded(self, encoded):
+        return self._active.predict_encoded(encoded)
+
+    def predict(self, **inputs):
+        return self._active.predict(**inputs)
+
+    def explain_encoded(self, encoded):
+        return self._active.explain_encoded(encoded)
+
+    def importances(self):
+        return self._active.importances()
+
+    def recommend(self, **inputs):
+        return self._active.recommend(**inputs)
+
+
+class UniversityLookup:
+    """University Explorer lookups: local catalogue, then live API, then built-in lists.
+
+    Every lookup returns ``(records, source)`` where ``source`` is one of
+    "local", "api", "cached" (built-in lists), "none" or "error", and goes
+    through one shared memory + on-disk ``ResponseCache``.
+    """
+
+    def __init__(self, catalogue=None, client=None, cache=None, refresh=False):
+        self.catalogue = catalogue if catalogue is not None else open_catalogue()
+        if refresh:
+            BackgroundRefresher(self.catalogue).start()
+        self._client = client
+        self.cache = cache if cache is not None else open_response_cache(
+            "universities", ttl=UNIVERSITY_CACHE_TTL, negative_ttl=UNIVERSITY_NEGATIVE_TTL,
+            trim=trim_records, degraded_sources=("cached", "error"))
+        self._seed_index = None
+        self._matchers = LRUCache(maxsize=MATCHER_CACHE_SIZE, ttl=UNIVERSITY_CACHE_TTL)
+        telemetry.register_collector("university_cache", self.cache.stats)
+
+    @property
+    def client(self):
+        """Pooled hipolabs client, created (and requests imported) on first use."""
+        if self._client is None:
+            from gradguide.upstream import UniversityClient
+
+            self._client = UniversityClient(trim=trim_records)
+            telemetry.register_collector("upstream", self._client.stats)
+        return self._client
+
+    def local_catalogue(self):
+        """The catalogue once a full dump is loaded; None while it only has the seed lists."""
+        return None if self.catalogue.is_seed() else self.catalogue
+
+    def _key(self, kind, value):
+        """Cache key; answers from one catalogue build are never served for another."""
+        meta = self.catalogue.meta()
+        generation = "remote" if meta["source"] == "seed" else meta["refreshed_at"]
+        return kind, generation, value
+
+    @staticmethod
+    def country_key(country):
+        """Normalized key shared by every alias and spelling of a country."""
+        return normalize(canonical_country_name(country))
+
+    def _lookup(self, kind, value, compute):
+        """Cached ``compute()``, timed and counted by ``kind`` and answer source."""
+        with telemetry.span("university_lookup", kind=kind):
+            records, source = self.cache.lookup(self._key(kind, value), compute)
+        telemetry.increment("university_lookups", kind=kind, source=source)
+        return records, source
+
+    def _fallback(self, kind, exc):
+        """Records a live-API failure that is about to be answered from the built-in lists."""
+        telemetry.increment("upstream_fallbacks", kind=kind, error=type(exc).__name__)
+
+    def by_country(self, country):
+        """Universities in ``country``, given as any name, alias or ISO code."""
+        return self._lookup("country", self.country_key(country),
+                            lambda: self._by_country(canonical_country_name(country)))
+
+    def _by_country(self, country):
+        catalogue = self.local_catalogue()
+        if catalogue is not None:
+            # The local catalogue holds the same dataset the API serves
+            data = catalogue.by_country(country)
+            return data, "local" if data else "none"
+
+        from requests.exceptions import RequestException
+
+        try:
+            data = self.client.search(country=country)
+        except RequestException as exc:
+            self._fallback("country", exc)
+            cached_data = self.seed_records(country)
+            return cached_data, "cached" if cached_data else "error"
+        if data:
+            return data, "api"
+        cached_data = self.seed_records(country)
+        return cached_data, "cached" if cached_data else "none"
+
+    def top_universities(self, country):
+        """Up to ``TOP_UNIVERSITIES`` universities for the ranking table.
+
+        Here "cached", "none" and "error" mean the built-in list was used
+        because the local catalogue or the live search had no universities, or
+        the live search was unavailable.
+        """
+        return self._lookup("ranking", self.country_key(country),
+                            lambda: self._top_universities(canonical_country_name(country)))
+
+    def _top_universities(self, country):
+        catalogue = self.local_catalogue()
+        if catalogue is not None:
+            records = catalogue.by_country(country, limit=TOP_UNIVERSITIES)
+            if records:
+                return records, "local"
+            return self.seed_records(country), "cached"
+
+        from requests.exceptions import RequestException
+
+        try:
+            data = self.client.search(country=country)
+        except RequestException as exc:
+            self._fallback("ranking", exc)
+            return self.seed_records(country), "error"
+        if not data:
+            return self.seed_records(country), "none"
+        return data[:TOP_UNIVERSITIES], "api"
+
+    def search_name(self, name):
+        """Best matches for a (possibly partial or misspelled) university name."""
+        return self._lookup("name", normalize(name), lambda: self._search_name(name))
+
+    def _search_name(self, name):
+        catalogue = self.local_catalogue()
+        if catalogue is not None:
+            results = catalogue.search_name(name, limit=SEARCH_RESULTS)
+            return results, "local" if results else "none"
+
+        from requests.exceptions import RequestException
+
+        try:
+            data = self.client.search(name=name)
+        except RequestException as exc:
+            self._fallback("name", exc)
+            found = self.search_seed(name)
+            return found, "cached" if found else "error"
+        if data:
+            return data, "api"
+        found = self.search_seed(name)
+        return found, "cached" if found else "none"
+
+    def matcher(self, country):
+        """``(UniversityMatcher, source)`` over every university ``by_country`` finds.
+
+        The matcher is None when there are no universities.  It is rebuilt
+        when the catalogue changes and, like the lookups, sooner for
+        fallback answers.
+        """
+        key = self._key("matcher", self.country_key(country))
+        cached = self._matchers.get(key)
+        if cached is not None:
+            return cached
+        records, source = self.by_country(country)
+        matcher = None
+        if records:
+            from gradguide.match import UniversityMatcher
+            from gradguide.rankings import default_metrics, ranking_table
+
+            with telemetry.span("matcher_build"):
+                table = ranking_table([record["name"] for record in records],
+                                      canonical_country_name(country), default_metrics())
+                matcher = UniversityMatcher(table)
+        ttl = UNIVERSITY_NEGATIVE_TTL if source in ("cached", "none", "error") else None
+        self._matchers.set(key, (matcher, source), ttl=ttl)
+        return matcher, source
+
+    def match_universities(self, k=UNIVERSITY_MATCHES, **profile):
+        """Top ``k`` universities in ``pref_country`` for the Career Prediction form inputs.
+
+        Returns ``(rows, source)``; see ``UniversityMatcher.match`` for the rows.
+        """
+        matcher, source = self.matcher(profile["pref_country"])
+        if matcher is None:
+            return None, source
+        with telemetry.span("university_match"):
+            return matcher.match(k, **profile), source
+
+    def match_many(self, profiles, k=UNIVERSITY_MATCHES):
+        """``UniversityMatcher.match_many`` for a frame of profiles, each in its preferred country.
+
+        Profiles whose country has no universities get no rows.
+        """
+        import pandas as pd
+
+        from gradguide.features import FORM_FIELDS
+
+        profiles = pd.DataFrame(profiles).rename(columns=FORM_FIELDS)
+        frames = []
+        for country, group in profiles.groupby("Preferred Country", sort=False):
+            matcher, _ = self.matcher(country)
+            if matcher is not None:
+                frames.append(matcher.match_many(group, k))
+        if not frames:
+            return pd.DataFrame()
+        matches = pd.concat(frames, ignore_index=True)
+        return matches.sort_values(["Student", "Match Rank"], kind="stable",
+                                   ignore_index=True)
+
+    @staticmethod
+    def seed_records(country):
+        """Built-in universities for a country in API format."""
+        return [{"name": uni, "web_pages": [placeholder_web_page(uni)]}
+                for uni in seed_universities(country)]
+
+    def search_seed(self, name):
+        """Searches the built-in university lists by (partial or misspelled) name."""
+        if self._seed_index is None:
+            from gradguide.search import NameIndex
+
+            self._seed_index = NameIndex(all_seed_records())
+        return [{**uni, "state-province": "N/A"}
+                for uni in self._seed_index.search(name, k=SEARCH_RESULTS)]
+
+    def stats(self):
+        stats = {"cache": self.cache.stats()}
+        if self._client is not None:
+            stats["upstream"] = self._client.stats()
+        return stats
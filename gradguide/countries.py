@@ -0,0 +1,316 @@
+"""Country alias resolution for the University Explorer.
+
+Every spelling a student might type -- the country name, ISO 3166 alpha-2
+and alpha-3 codes, and common aliases such as "USA", "Britain" or "Bharat" --
+is normalized (casefolded, accents and punctuation stripped) into one dict
+built at import, so resolving a country is a single lookup.  Misspellings
+fall back to a ranked fuzzy match over the same keys.
+
+The canonical ``Country.name`` follows the naming of the hipolabs dataset so
+it can be passed straight to universities.hipolabs.com, and ``Country.iso2``
+matches the dataset's ``alpha_two_code``.
+"""
+import difflib
+import functools
+import re
+from collections import namedtuple
+
+from gradguide.text import normalize
+
+Country = namedtuple("Country", ["iso2", "iso3", "name"])
+
+# Fuzzy matches below this similarity are not resolved automatically
+FUZZY_CUTOFF = 0.8
+# Resolved spellings remembered per resolver, misspellings and misses included
+RESOLVE_CACHE_SIZE = 4096
+
+# (alpha-2, alpha-3, canonical name, *aliases)
+COUNTRIES = [
+    ("AF", "AFG", "Afghanistan"),
+    ("AL", "ALB", "Albania"),
+    ("DZ", "DZA", "Algeria"),
+    ("AD", "AND", "Andorra"),
+    ("AO", "AGO", "Angola"),
+    ("AG", "ATG", "Antigua and Barbuda"),
+    ("AR", "ARG", "Argentina"),
+    ("AM", "ARM", "Armenia"),
+    ("AU", "AUS", "Australia", "Oz"),
+    ("AT", "AUT", "Austria", "Österreich"),
+    ("AZ", "AZE", "Azerbaijan"),
+    ("BS", "BHS", "Bahamas", "The Bahamas"),
+    ("BH", "BHR", "Bahrain"),
+    ("BD", "BGD", "Bangladesh"),
+    ("BB", "BRB", "Barbados"),
+    ("BY", "BLR", "Belarus"),
+    ("BE", "BEL", "Belgium", "België", "Belgique"),
+    ("BZ", "BLZ", "Belize"),
+    ("BJ", "BEN", "Benin"),
+    ("BT", "BTN", "Bhutan"),
+    ("BO", "BOL", "Bolivia, Plurinational State of", "Bolivia"),
+    ("BA", "BIH", "Bosnia and Herzegovina", "Bosnia"),
+    ("BW", "BWA", "Botswana"),
+    ("BR", "BRA", "Brazil", "Brasil"),
+    ("BN", "BRN", "Brunei Darussalam", "Brunei"),
+    ("BG", "BGR", "Bulgaria"),
+    ("BF", "BFA", "Burkina Faso"),
+    ("BI", "BDI", "Burundi"),
+    ("CV", "CPV", "Cape Verde", "Cabo Verde"),
+    ("KH", "KHM", "Cambodia"),
+    ("CM", "CMR", "Cameroon"),
+    ("CA", "CAN", "Canada"),
+    ("CF", "CAF", "Central African Republic"),
+    ("TD", "TCD", "Chad"),
+    ("CL", "CHL", "Chile"),
+    ("CN", "CHN", "China", "People's Republic of China", "PRC"),
+    ("CO", "COL", "Colombia"),
+    ("KM", "COM", "Comoros"),
+    ("CG", "COG", "Congo", "Republic of the Congo"),
+    ("CD", "COD", "Congo, the Democratic Republic of the", "DR Congo", "DRC",
+     "Democratic Republic of the Congo"),
+    ("CR", "CRI", "Costa Rica"),
+    ("CI", "CIV", "Côte d'Ivoire", "Ivory Coast"),
+    ("HR", "HRV", "Croatia", "Hrvatska"),
+    ("CU", "CUB", "Cuba"),
+    ("CY", "CYP", "Cyprus"),
+    ("CZ", "CZE", "Czech Republic", "Czechia"),
+    ("DK", "DNK", "Denmark", "Danmark"),
+    ("DJ", "DJI", "Djibouti"),
+    ("DM", "DMA", "Dominica"),
+    ("DO", "DOM", "Dominican Republic"),
+    ("EC", "ECU", "Ecuador"),
+    ("EG", "EGY", "Egypt"),
+    ("SV", "SLV", "El Salvador"),
+    ("GQ", "GNQ", "Equatorial Guinea"),
+    ("ER", "ERI", "Eritrea"),
+    ("EE", "EST", "Estonia"),
+    ("SZ", "SWZ", "Swaziland", "Eswatini"),
+    ("ET", "ETH", "Ethiopia"),
+    ("FJ", "FJI", "Fiji"),
+    ("FI", "FIN", "Finland", "Suomi"),
+    ("FR", "FRA", "France"),
+    ("GA", "GAB", "Gabon"),
+    ("GM", "GMB", "Gambia", "The Gambia"),
+    ("GE", "GEO", "Georgia"),
+    ("DE", "DEU", "Germany", "Deutschland"),
+    ("GH", "GHA", "Ghana"),
+    ("GR", "GRC", "Greece", "Hellas"),
+    ("GD", "GRD", "Grenada"),
+    ("GT", "GTM", "Guatemala"),
+    ("GN", "GIN", "Guinea"),
+    ("GW", "GNB", "Guinea-Bissau"),
+    ("GY", "GUY", "Guyana"),
+    ("HT", "HTI", "Haiti"),
+    ("HN", "HND", "Honduras"),
+    ("HK", "HKG", "Hong Kong"),
+    ("HU", "HUN", "Hungary", "Magyarország"),
+    ("IS", "ISL", "Iceland"),
+    ("IN", "IND", "India", "Bharat", "Hindustan"),
+    ("ID", "IDN", "Indonesia"),
+    ("IR", "IRN", "Iran", "Iran, Islamic Republic of"),
+    ("IQ", "IRQ", "Iraq"),
+    ("IE", "IRL", "Ireland", "Eire", "Republic of Ireland"),
+    ("IL", "ISR", "Israel"),
+    ("IT", "ITA", "Italy", "Italia"),
+    ("JM", "JAM", "Jamaica"),
+    ("JP", "JPN", "Japan", "Nippon"),
+    ("JO", "JOR", "Jordan"),
+    ("KZ", "KAZ", "Kazakhstan"),
+    ("KE", "KEN", "Kenya"),
+    ("KI", "KIR", "Kiribati"),
+    ("KP", "PRK", "Korea, Democratic People's Republic of", "North Korea"),
+    ("KR", "KOR", "Korea, Republic of", "South Korea", "Korea"),
+    ("XK", "XKX", "Kosovo"),
+    ("KW", "KWT", "Kuwait"),
+    ("KG", "KGZ", "Kyrgyzstan"),
+    ("LA", "LAO", "Lao People's Democratic Republic", "Laos"),
+    ("LV", "LVA", "Latvia"),
+    ("LB", "LBN", "Lebanon"),
+    ("LS", "LSO", "Lesotho"),
+    ("LR", "LBR", "Liberia"),
+    ("LY", "LBY", "Libya", "Libyan Arab Jamahiriya"),
+    ("LI", "LIE", "Liechtenstein"),
+    ("LT", "LTU", "Lithuania"),
+    ("LU", "LUX", "Luxembourg"),
+    ("MO", "MAC", "Macao", "Macau"),
+    ("MK", "MKD", "Macedonia", "North Macedonia"),
+    ("MG", "MDG", "Madagascar"),
+    ("MW", "MWI", "Malawi"),
+    ("MY", "MYS", "Malaysia"),
+    ("MV", "MDV", "Maldives"),
+    ("ML", "MLI", "Mali"),
+    ("MT", "MLT", "Malta"),
+    ("MH", "MHL", "Marshall Islands"),
+    ("MR", "MRT", "Mauritania"),
+    ("MU", "MUS", "Mauritius"),
+    ("MX", "MEX", "Mexico", "México"),
+    ("FM", "FSM", "Micronesia, Federated States of", "Micronesia"),
+    ("MD", "MDA", "Moldova, Republic of", "Moldova"),
+    ("MC", "MCO", "Monaco"),
+    ("MN", "MNG", "Mongolia"),
+    ("ME", "MNE", "Montenegro"),
+    ("MA", "MAR", "Morocco"),
+    ("MZ", "MOZ", "Mozambique"),
+    ("MM", "MMR", "Myanmar", "Burma"),
+    ("NA", "NAM", "Namibia"),
+    ("NR", "NRU", "Nauru"),
+    ("NP", "NPL", "Nepal"),
+    ("NL", "NLD", "Netherlands", "Holland", "The Netherlands", "Nederland"),
+    ("NZ", "NZL", "New Zealand", "Aotearoa"),
+    ("NI", "NIC", "Nicaragua"),
+    ("NE", "NER", "Niger"),
+    ("NG", "NGA", "Nigeria"),
+    ("NO", "NOR", "Norway", "Norge"),
+    ("OM", "OMN", "Oman"),
+    ("PK", "PAK", "Pakistan"),
+    ("PW", "PLW", "Palau"),
+    ("PS", "PSE", "Palestine, State of", "Palestine"),
+    ("PA", "PAN", "Panama"),
+    ("PG", "PNG", "Papua New Guinea"),
+    ("PY", "PRY", "Paraguay"),
+    ("PE", "PER", "Peru"),
+    ("PH", "PHL", "Philippines"),
+    ("PL", "POL", "Poland", "Polska"),
+    ("PT", "PRT", "Portugal"),
+    ("PR", "PRI", "Puerto Rico"),
+    ("QA", "QAT", "Qatar"),
+    ("RO", "ROU", "Romania"),
+    ("RU", "RUS", "Russian Federation", "Russia"),
+    ("RW", "RWA", "Rwanda"),
+    ("KN", "KNA", "Saint Kitts and Nevis"),
+    ("LC", "LCA", "Saint Lucia"),
+    ("VC", "VCT", "Saint Vincent and the Grenadines"),
+    ("WS", "WSM", "Samoa"),
+    ("SM", "SMR", "San Marino"),
+    ("ST", "STP", "Sao Tome and Principe"),
+    ("SA", "SAU", "Saudi Arabia", "KSA"),
+    ("SN", "SEN", "Senegal"),
+    ("RS", "SRB", "Serbia"),
+    ("SC", "SYC", "Seychelles"),
+    ("SL", "SLE", "Sierra Leone"),
+    ("SG", "SGP", "Singapore"),
+    ("SK", "SVK", "Slovakia", "Slovak Republic"),
+    ("SI", "SVN", "Slovenia"),
+    ("SB", "SLB", "Solomon Islands"),
+    ("SO", "SOM", "Somalia"),
+    ("ZA", "ZAF", "South Africa", "RSA"),
+    ("SS", "SSD", "South Sudan"),
+    ("ES", "ESP", "Spain", "España"),
+    ("LK", "LKA", "Sri Lanka", "Ceylon"),
+    ("SD", "SDN", "Sudan"),
+    ("SR", "SUR", "Suriname"),
+    ("SE", "SWE", "Sweden", "Sverige"),
+    ("CH", "CHE", "Switzerland", "Schweiz", "Suisse", "Svizzera"),
+    ("SY", "SYR", "Syrian Arab Republic", "Syria"),
+    ("TW", "TWN", "Taiwan", "Republic of China"),
+    ("TJ", "TJK", "Tajikistan"),
+    ("TZ", "TZA", "Tanzania, United Republic of", "Tanzania"),
+    ("TH", "THA", "Thailand"),
+    ("TL", "TLS", "Timor-Leste", "East Timor"),
+    ("TG", "TGO", "Togo"),
+    ("TO", "TON", "Tonga"),
+    ("TT", "TTO", "Trinidad and Tobago"),
+    ("TN", "TUN", "Tunisia"),
+    ("TR", "TUR", "Turkey", "Türkiye"),
+    ("TM", "TKM", "Turkmenistan"),
+    ("TV", "TUV", "Tuvalu"),
+    ("UG", "UGA", "Uganda"),
+    ("UA", "UKR", "Ukraine"),
+    ("AE", "ARE", "United Arab Emirates", "UAE", "Emirates"),
+    ("GB", "GBR", "United Kingdom", "UK", "U.K.", "Britain", "Great Britain",
+     "England", "Scotland", "Wales", "Northern Ireland"),
+    ("US", "USA", "United States", "United States of America", "America",
+     "U.S.", "U.S.A."),
+    ("UY", "URY", "Uruguay"),
+    ("UZ", "UZB", "Uzbekistan"),
+    ("VU", "VUT", "Vanuatu"),
+    ("VA", "VAT", "Holy See (Vatican City State)", "Vatican", "Vatican City"),
+    ("VE", "VEN", "Venezuela, Bolivarian Republic of", "Venezuela"),
+    ("VN", "VNM", "Viet Nam", "Vietnam"),
+    ("YE", "YEM", "Yemen"),
+    ("ZM", "ZMB", "Zambia"),
+    ("ZW", "ZWE", "Zimbabwe"),
+]
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def alias_key(text):
+    """Lookup key: normalized text with punctuation dropped ("U.S.A." -> "usa")."""
+    return " ".join(_PUNCTUATION.sub("", normalize(text).replace("-", " ")).split())
+
+
+class CountryResolver:
+    """O(1) mapping from any known spelling of a country to its ``Country``."""
+
+    def __init__(self, countries=COUNTRIES):
+        self._index = {}
+        self.countries = []
+        for iso2, iso3, name, *aliases in countries:
+            country = Country(iso2, iso3, name)
+            self.countries.append(country)
+            for spelling in (name, iso3, iso2, *aliases):
+                # The first country to claim a key keeps it
+                self._index.setdefault(alias_key(spelling), country)
+        self._keys = list(self._index)
+        # Per instance, so the memo goes away with the resolver
+        self._resolve_key = functools.lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._match)
+
+    def __contains__(self, text):
+        return alias_key(text) in self._index
+
+    def add_alias(self, alias, country):
+        """Registers an extra spelling for an already-known country."""
+        key = alias_key(alias)
+        if key not in self._index:
+            self._index[key] = country
+            self._keys.append(key)
+            # Earlier misses and fuzzy matches may resolve differently now
+            self._resolve_key.cache_clear()
+
+    def lookup(self, text):
+        """Exact resolution of ``text``, or None."""
+        return self._index.get(alias_key(text))
+
+    def suggest(self, text, n=3, cutoff=0.6):
+        """Distinct countries whose spellings are closest to ``text``, best first."""
+        return self._suggest(alias_key(text), n, cutoff)
+
+    def _suggest(self, key, n, cutoff):
+        suggestions = []
+        for close in difflib.get_close_matches(key, self._keys, n=n * 3, cutoff=cutoff):
+            country = self._index[close]
+            if country not in suggestions:
+                suggestions.append(country)
+        return suggestions[:n]
+
+    def _match(self, key):
+        country = self._index.get(key)
+        if country is None:
+            matches = self._suggest(key, n=1, cutoff=FUZZY_CUTOFF)
+            country = matches[0] if matches else None
+        return country
+
+    def resolve(self, text):
+        """Exact lookup, else the best fuzzy match above ``FUZZY_CUTOFF``; None if neither.
+
+        Answers are memoised by ``alias_key``, so a repeated misspelling or
+        unknown country costs one dict lookup instead of a fuzzy scan.
+        """
+        if not text or not text.strip():
+            return None
+        return self._resolve_key(alias_key(text))
+
+
+# Built once at import; shared by every caller
+COUNTRY_RESOLVER = CountryResolver()
+
+
+def resolve_country(text):
+    """Resolves free-text country input to a ``Country``, or None."""
+    return COUNTRY_RESOLVER.resolve(text)
+
+
+def canonical_country_name(text):
+    """Canonical (hipolabs) country name for ``text``, or the stripped input if unknown."""
+    country = resolve_country(text)
+    return country.name if country else text.strip()
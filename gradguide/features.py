@@ -0,0 +1,54 @@
+"""Feature vocabulary shared by the Career Prediction page and offline scoring.
+
+The encoding itself lives in ``gradguide.schema``; this module only names
+the inputs and the label codes the model was trained with.
+"""
+# Encoding dictionaries
+career_goal_dict = {"Academia": 0, "Industry": 1, "Research": 2}
+country_dict = {"USA": 0, "UK": 1, "Germany": 2, "India": 3, "Other": 4}
+research_dict = {"No": 0, "Yes": 1}
+
+# Label columns and their codes
+LABELS = {
+    "Research": research_dict,
+    "Career Goal": career_goal_dict,
+    "Preferred Country": country_dict,
+}
+
+# What an unknown label is scored as when the caller opts into fallbacks
+# (the form offers "Entrepreneurship" and "Canada", which the model never saw)
+FALLBACK_LABELS = {"Research": "No", "Career Goal": "Industry", "Preferred Country": "Other"}
+
+# Column names exactly as the model was fitted with -- note the trailing
+# spaces on "LOR " and "Chance of Admit ", which came from the training CSV.
+FEATURE_COLUMNS = [
+    "CGPA", "GRE Score", "TOEFL Score", "SOP", "LOR ", "University Rating",
+    "Chance of Admit ", "Research", "Budget (INR Lakhs)", "Career Goal",
+    "GATE Score", "Preferred Country"
+]
+
+# Career Prediction form argument for each model column
+FORM_FIELDS = {
+    "cgpa": "CGPA", "gre": "GRE Score", "toefl": "TOEFL Score", "gate_score": "GATE Score",
+    "sop": "SOP", "lor": "LOR ", "univ_rating": "University Rating",
+    "chance": "Chance of Admit ", "research": "Research", "career_goal": "Career Goal",
+    "budget": "Budget (INR Lakhs)", "pref_country": "Preferred Country",
+}
+
+# Accepted (min, max) of each numeric feature -- the form widgets' ranges;
+# None leaves that side open
+FEATURE_BOUNDS = {
+    "CGPA": (0, 10), "GRE Score": (0, 340), "TOEFL Score": (0, 120), "GATE Score": (0, 1000),
+    "SOP": (1, 5), "LOR ": (1, 5), "University Rating": (1, 5), "Chance of Admit ": (0, 1),
+    "Budget (INR Lakhs)": (0, None),
+}
+
+# Decimal places each float feature is rounded to when building cache keys
+KEY_DECIMALS = {"CGPA": 1, "Chance of Admit ": 2}
+
+PATH_LABELS = {1: "MS (Abroad)", 0: "MTech (India)"}
+
+
+def path_label(prediction):
+    """Maps a model prediction to the path shown to the student."""
+    return PATH_LABELS[1] if prediction == 1 else PATH_LABELS[0]
@@ -0,0 +1,149 @@
+"""Monte Carlo cost scenarios and loan repayment for the Financial Planner.
+
+``simulate`` draws every uncertain input for all scenarios at once, as NumPy
+arrays of shape ``(n,)``, so 1M scenarios are a handful of vector operations:
+
+* tuition and living cost: log-normal around the entered figure (mean kept);
+* FX rate: log-normal multiplier on tuition and living, mean 1;
+* scholarship: normal around the entered percentage, clipped to 0-100, paid
+  against the simulated tuition;
+* part-time income: log-normal around the entered figure.
+
+Family support and other expenses are taken as certain.  Amounts are in INR
+lakhs throughout.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Waterfall steps, in order; costs are positive and funding negative
+COMPONENTS = ("Tuition", "Living", "Others", "Scholarship (Saved)", "Family Support", "part-time")
+PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_SCENARIOS = 200_000
+# Scenarios used for the chart's bands; the draws are i.i.d., so a prefix is a fair sample
+BAND_SAMPLE = 100_000
+
+Assumptions = namedtuple("Assumptions", [
+    "tuition_spread",      # log-normal sigma of tuition
+    "living_spread",       # log-normal sigma of living cost
+    "fx_volatility",       # log-normal sigma of the INR exchange-rate multiplier
+    "scholarship_spread",  # standard deviation of the scholarship, in percentage points
+    "part_time_spread",    # log-normal sigma of part-time income
+])
+DEFAULT_ASSUMPTIONS = Assumptions(0.10, 0.15, 0.08, 10.0, 0.5)
+
+Scenarios = namedtuple("Scenarios", ["components", "net_cost"])
+
+
+def cost_breakdown(tuition, living, misc, scholarship, family_support, part_time):
+    """Deterministic plan: signed waterfall steps in ``COMPONENTS`` order plus totals."""
+    scholarship_amount = tuition * scholarship / 100
+    steps = [tuition, living, misc, -scholarship_amount, -family_support, -part_time]
+    total_cost = tuition + living + misc
+    return {
+        "steps": steps,
+        "total_cost": total_cost,
+        "scholarship_amount": scholarship_amount,
+        "net_cost": sum(steps),
+    }
+
+
+def _lognormal(rng, mean, sigma, n):
+    """``n`` log-normal draws with the given mean (not median)."""
+    if sigma <= 0 or mean == 0:
+        return np.full(n, mean, dtype=np.float32)
+    z = rng.standard_normal(n, dtype=np.float32)
+    return mean * np.exp(sigma * z - np.float32(0.5 * sigma * sigma))
+
+
+def simulate(tuition, living, misc, scholarship, family_support, part_time,
+             n=DEFAULT_SCENARIOS, assumptions=DEFAULT_ASSUMPTIONS, seed=0):
+    """Simulates ``n`` cost scenarios.
+
+    Returns ``Scenarios(components, net_cost)``: ``components`` is an
+    ``(n, len(COMPONENTS))`` float32 array of signed waterfall steps and
+    ``net_cost`` their row sums (the loan needed when positive).
+    """
+    rng = np.random.default_rng(seed)
+    fx = _lognormal(rng, 1.0, assumptions.fx_volatility, n)
+
+    steps = np.empty((n, len(COMPONENTS)), dtype=np.float32)
+    steps[:, 0] = _lognormal(rng, tuition, assumptions.tuition_spread, n) * fx
+    steps[:, 1] = _lognormal(rng, living, assumptions.living_spread, n) * fx
+    steps[:, 2] = misc
+    pct = scholarship + assumptions.scholarship_spread * rng.standard_normal(n, dtype=np.float32)
+    steps[:, 3] = -steps[:, 0] * np.clip(pct, 0, 100) / 100
+    steps[:, 4] = -family_support
+    steps[:, 5] = -_lognormal(rng, part_time, assumptions.part_time_spread, n)
+    return Scenarios(steps, steps.sum(axis=1))
+
+
+def summarize(scenarios, percentiles=PERCENTILES):
+    """Loan and shortfall statistics for ``simulate`` output.
+
+    ``running`` holds percentiles of the running total after each waterfall
+    step (rows follow ``percentiles``), estimated from the first
+    ``BAND_SAMPLE`` scenarios; that is what the chart's bands show.
+    """
+    q = np.asarray(percentiles)
+    loan = np.maximum(scenarios.net_cost, 0)
+    running = np.cumsum(scenarios.components[:BAND_SAMPLE], axis=1)
+    return {
+        "scenarios": len(loan),
+        "percentiles": q,
+        "loan": np.percentile(loan, q),
+        "net_cost": np.percentile(scenarios.net_cost, q),
+        "shortfall_probability": float(np.mean(scenarios.net_cost > 0)),
+        "expected_loan": float(loan.mean()),
+        "mean_components": scenarios.components.mean(axis=0),
+        "running": np.percentile(running, q, axis=0),
+    }
+
+
+def monthly_payment(principal, annual_rates, tenures_years):
+    """EMI for every (rate, tenure) pair as a ``(len(rates), len(tenures))`` array.
+
+    Rates are annual percentages, compounded monthly.
+    """
+    r = np.asarray(annual_rates, dtype=np.float64)[:, None] / 1200
+    months = np.asarray(tenures_years, dtype=np.float64)[None, :] * 12
+    growth = (1 + r) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = np.where(r > 0, principal * r * growth / (growth - 1), principal / months)
+    return emi
+
+
+def payment_grid(principal, annual_rates, tenures_years):
+    """EMI and total interest across rates and tenures, as DataFrames."""
+    import pandas as pd
+
+    emi = monthly_payment(principal, annual_rates, tenures_years)
+    months = np.asarray(tenures_years)[None, :] * 12
+    index = pd.Index([f"{rate:g}%" for rate in annual_rates], name="Interest Rate")
+    columns = [f"{years:g} yr" for years in tenures_years]
+    return (pd.DataFrame(emi, index=index, columns=columns),
+            pd.DataFrame(emi * months - principal, index=index, columns=columns))
+
+
+def repayment_schedule(principal, annual_rate, tenure_years):
+    """Month-by-month amortization schedule for one loan, computed in closed form."""
+    import pandas as pd
+
+    n = int(round(tenure_years * 12))
+    r = annual_rate / 1200
+    emi = monthly_payment(principal, [annual_rate], [tenure_years])[0, 0]
+    k = np.arange(n + 1)
+    if r > 0:
+        growth = (1 + r) ** k
+        balance = principal * growth - emi * (growth - 1) / r
+    else:
+        balance = principal - emi * k
+    balance = np.maximum(balance, 0)
+    interest = balance[:-1] * r
+    return pd.DataFrame({
+        "Month": k[1:],
+        "EMI": np.full(n, emi),
+        "Interest": interest,
+        "Principal": emi - interest,
+        "Balance": balance[1:],
+    })
@@ -0,0 +1,188 @@
+"""University recommendations: which universities fit a student's profile and budget.
+
+Every university in a ``ranking_table`` gets a match score for a student::
+
+    admit chance = sigmoid(ADMIT_SLOPE * (profile strength - selectivity))
+    match score  = admit chance * quality
+
+where profile strength averages the student's CGPA, GRE, TOEFL and GATE
+(scores of 0 mean "not taken" and are left out) plus a research bonus,
+selectivity comes from QS ranking and acceptance rate, and quality from QS
+ranking and program strength, all scaled to [0, 1].  Universities whose
+``Avg Fee (Lakhs)`` is over the student's budget are never recommended.
+
+``UniversityMatcher`` derives the per-university arrays once, so matching
+students is one array expression over the catalogue and an ``argpartition``
+for each student's best ``k``, with no sort of the whole catalogue.  One
+student against 10k universities takes a few milliseconds, most of it
+building the result rows; ``match_many`` scores blocks of students at once
+(``python benchmarks/bench_match.py``).
+"""
+import numpy as np
+import pandas as pd
+
+from gradguide.features import FORM_FIELDS
+from gradguide.rankings import QS_RANKING_RANGE, STRENGTH_LEVELS
+
+# Recommendations shown for one student
+DEFAULT_MATCHES = 10
+# Students x universities scored per block in ``match_many`` (32 MB of float64)
+MAX_BLOCK_CELLS = 1 << 22
+
+# (floor, ceiling) each exam score is scaled over; scores of 0 mean "not taken"
+SCORE_SCALES = {"GRE Score": (260, 340), "TOEFL Score": (60, 120), "GATE Score": (0, 1000)}
+CGPA_SCALE = 10.0
+RESEARCH_BONUS = 0.05
+# How quickly the admit chance falls as selectivity passes profile strength
+ADMIT_SLOPE = 8.0
+# Weight of QS ranking against acceptance rate in selectivity
+RANK_WEIGHT = 0.6
+# Program Strength level -> quality; unknown levels count as the middle one
+STRENGTH_QUALITY = dict(zip(STRENGTH_LEVELS, (1.0, 0.8, 0.6)))
+DEFAULT_STRENGTH_QUALITY = 0.8
+# Admit chance bands labelled in the "Fit" column
+FIT_BANDS = ((0.35, "Reach"), (0.7, "Target"), (np.inf, "Safety"))
+
+PROFILE_COLUMNS = ["CGPA", "GRE Score", "TOEFL Score", "GATE Score", "Research",
+                   "Budget (INR Lakhs)"]
+
+
+def _scaled(values, low, high):
+    return np.clip((np.asarray(values, dtype=np.float64) - low) / (high - low), 0.0, 1.0)
+
+
+def profile_strength(profiles):
+    """Academic strength in [0, 1] for each row of a ``PROFILE_COLUMNS`` frame."""
+    parts = [_scaled(profiles["CGPA"], 0.0, CGPA_SCALE)]
+    taken = [np.ones(len(profiles), dtype=bool)]
+    for column, (low, high) in SCORE_SCALES.items():
+        raw = np.asarray(profiles[column], dtype=np.float64)
+        parts.append(_scaled(raw, low, high))
+        taken.append(raw > 0)
+    parts, taken = np.array(parts), np.array(taken)
+    strength = (parts * taken).sum(axis=0) / taken.sum(axis=0)
+    research = profiles["Research"]
+    if pd.api.types.is_numeric_dtype(research):
+        research = research.to_numpy() > 0
+    else:
+        research = research.to_numpy(dtype=object) == "Yes"
+    return np.minimum(strength + RESEARCH_BONUS * research, 1.0)
+
+
+def _profile_frame(profiles):
+    """``profiles`` with form argument names (``cgpa``, ``gre``...) renamed to model columns."""
+    profiles = pd.DataFrame(profiles).rename(columns=FORM_FIELDS)
+    missing = [column for column in PROFILE_COLUMNS if column not in profiles.columns]
+    if missing:
+        raise ValueError(f"Profiles are missing {', '.join(missing)}")
+    return profiles
+
+
+def top_k(scores, k):
+    """Column indices of the ``k`` highest scores in each row, best first.
+
+    ``argpartition`` finds them in linear time; only those ``k`` are sorted.
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((len(scores), 0), dtype=np.intp)
+    if k < scores.shape[1]:
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        best = np.broadcast_to(np.arange(k), scores.shape).copy()
+    order = np.argsort(-np.take_along_axis(scores, best, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(best, order, axis=1)
+
+
+class UniversityMatcher:
+    """Scores students against one ``ranking_table`` (numeric, as returned before formatting)."""
+
+    def __init__(self, table):
+        self.table = table.reset_index(drop=True)
+        rank = _scaled(self.table["QS Ranking"], *QS_RANKING_RANGE)
+        prestige = 1.0 - rank
+        exclusivity = 1.0 - _scaled(self.table["Acceptance Rate"], 0.0, 100.0)
+        self.selectivity = RANK_WEIGHT * prestige + (1.0 - RANK_WEIGHT) * exclusivity
+        strength = self.table["Program Strength"].map(STRENGTH_QUALITY)
+        strength = strength.fillna(DEFAULT_STRENGTH_QUALITY).to_numpy(dtype=np.float64)
+        self.quality = (prestige + strength) / 2.0
+        self.fees = self.table["Avg Fee (Lakhs)"].to_numpy(dtype=np.float64)
+
+    def __len__(self):
+        return len(self.table)
+
+    def admit_chance(self, strength):
+        """``(students, universities)`` admit chances for an array of profile strengths."""
+        gap = np.asarray(strength, dtype=np.float64)[:, None] - self.selectivity
+        return 1.0 / (1.0 + np.exp(-ADMIT_SLOPE * gap))
+
+    def scores(self, strength, budget):
+        """``(students, universities)`` match scores; -inf where the fee is over budget."""
+        score = self.admit_chance(strength) * self.quality
+        over = self.fees > np.asarray(budget, dtype=np.float64)[:, None]
+        score[over] = -np.inf
+        return score
+
+    def best(self, profiles, k=DEFAULT_MATCHES):
+        """``(indices, scores)`` of each student's top ``k`` affordable universities.
+
+        Rows are padded with index -1 and score -inf when fewer than ``k``
+        universities are within budget.
+        """
+        profiles = _profile_frame(profiles)
+        return self._best(profile_strength(profiles), profiles["Budget (INR Lakhs)"], k)
+
+    def _best(self, strength, budget, k):
+        budget = np.asarray(budget, dtype=np.float64)
+        k = min(k, len(self))
+        indices = np.empty((len(strength), k), dtype=np.intp)
+        scores = np.empty((len(strength), k))
+        block = max(1, MAX_BLOCK_CELLS // max(len(self), 1))
+        for start in range(0, len(strength), block):
+            rows = slice(start, start + block)
+            score = self.scores(strength[rows], budget[rows])
+            indices[rows] = top_k(score, k)
+            scores[rows] = np.take_along_axis(score, indices[rows], axis=1)
+        indices[np.isneginf(scores)] = -1
+        return indices, scores
+
+    def _rows(self, indices, strength):
+        """Table rows for ``indices`` with their admit chance and fit band."""
+        rows = self.table.take(indices).reset_index(drop=True)
+        gap = strength - self.selectivity[indices]
+        chance = 1.0 / (1.0 + np.exp(-ADMIT_SLOPE * gap))
+        rows["Admit Chance"] = np.round(chance * 100.0, 1)
+        limits, labels = zip(*FIT_BANDS)
+        rows["Fit"] = np.array(labels)[np.searchsorted(limits, chance, side="right")]
+        return rows
+
+    def match(self, k=DEFAULT_MATCHES, **profile):
+        """Top ``k`` universities for one student's form inputs (``cgpa``, ``gre``, ...).
+
+        Returns the table rows, best first, with ``Match Score`` (0-100),
+        ``Admit Chance`` (percent) and ``Fit`` ("Reach", "Target", "Safety").
+        """
+        profile = _profile_frame([profile])
+        strength = profile_strength(profile)
+        indices, scores = self._best(strength, profile["Budget (INR Lakhs)"], k)
+        found = indices[0] >= 0
+        rows = self._rows(indices[0][found], strength[0])
+        rows.insert(1, "Match Score", np.round(scores[0][found] * 100.0, 1))
+        return rows
+
+    def match_many(self, profiles, k=DEFAULT_MATCHES):
+        """Top ``k`` universities for every row of ``profiles`` as one long frame.
+
+        ``profiles`` uses model column names or form argument names; the
+        result has a ``Student`` column (the profile's index label) and a
+        1-based ``Match Rank``, then the same columns as ``match``.
+        """
+        profiles = _profile_frame(profiles)
+        strength = profile_strength(profiles)
+        indices, scores = self._best(strength, profiles["Budget (INR Lakhs)"], k)
+        student, rank = np.nonzero(indices >= 0)
+        rows = self._rows(indices[student, rank], strength[student])
+        rows.insert(0, "Student", profiles.index.to_numpy()[student])
+        rows.insert(1, "Match Rank", rank + 1)
+        rows.insert(3, "Match Score", np.round(scores[student, rank] * 100.0, 1))
+        return rows
@@ -0,0 +1,16 @@
+"""Locating and loading the career-path model artifact."""
+from pathlib import Path
+
+from gradguide import telemetry
+
+# The pickle ships at the repository root, next to GradGuide.py
+MODEL_PATH = Path(__file__).resolve().parent.parent / "career_path_model.pkl"
+
+
+def load_model(path=MODEL_PATH):
+    """Loads the fitted career-path Pipeline from disk."""
+    with telemetry.span("model_load"):
+        # joblib pulls in scikit-learn; only pay for it when the pickle is needed
+        import joblib
+
+        return joblib.load(path)
@@ -0,0 +1,20 @@
+"""Single-profile prediction with memoization on the encoded feature row."""
+import numpy as np
+
+
+def predict_profile(model, schema, row, cache=None):
+    """Predicts the path for one row encoded by ``schema``.
+
+    When an ``LRUCache`` is given, results are memoized on ``schema.key(row)``
+    so repeated or near-identical submissions skip the model entirely.
+    """
+    key = schema.key(row)
+
+    def compute():
+        # Score the canonical key itself so every row sharing it gets one answer
+        matrix = np.array([key], dtype=np.float64)
+        return int(model.predict(schema.model_input(model, matrix))[0])
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(key, compute)
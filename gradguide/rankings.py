@@ -0,0 +1,150 @@
+"""Ranking table shown next to university lists.
+
+Real metrics can be supplied as a CSV (``$GRADGUIDE_RANKINGS_CSV``) with a
+``University`` column and any of ``RANKING_COLUMNS``; rows are joined on the
+normalized name and their non-empty values win.  Every other value is an
+illustrative placeholder derived from a hash of the university's name, so a
+given institution always shows the same figures, across reruns and processes.
+
+Everything is computed column-wise with no per-row Python, so a table of
+10k universities builds in tens of milliseconds and filters/sorts in about one.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RANKINGS_CSV = os.environ.get("GRADGUIDE_RANKINGS_CSV")
+
+RANKING_COLUMNS = ("QS Ranking", "Acceptance Rate", "Avg Fee (Lakhs)", "Program Strength")
+STRENGTH_LEVELS = np.array(["⭐⭐⭐⭐⭐", "⭐⭐⭐⭐", "⭐⭐⭐"])
+
+# Half-open ranges the placeholder values are drawn from
+QS_RANKING_RANGE = (1, 500)
+ACCEPTANCE_RANGE = (15, 85)
+FEE_RANGE = (20, 100)
+DOMESTIC_FEE_RANGE = (5, 25)  # for universities in India
+DOMESTIC_COUNTRY = "India"
+
+# 16-byte key for pandas' SipHash; changing it reshuffles every placeholder
+_HASH_KEY = "gradguide-rank01"
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def name_key(names):
+    """Join key for university names: case-folded with whitespace collapsed."""
+    names = pd.Series(names, dtype=object).astype(str)
+    return names.str.casefold().str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def name_seeds(names):
+    """Stable 64-bit seed per university name."""
+    return pd.util.hash_array(name_key(names).to_numpy(dtype=object), hash_key=_HASH_KEY)
+
+
+def _splitmix64(state):
+    """SplitMix64 finalizer applied elementwise to a ``uint64`` array."""
+    with np.errstate(over="ignore"):
+        z = state + _GOLDEN
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _draw(seeds, stream, low, high):
+    """Integers in ``[low, high)`` from stream ``stream`` of each seed's sequence."""
+    with np.errstate(over="ignore"):
+        bits = _splitmix64(seeds + np.uint64(stream) * _GOLDEN)
+    return (low + bits % np.uint64(high - low)).astype(np.int64)
+
+
+def placeholder_metrics(names, countries):
+    """Per-name placeholder metrics as a DataFrame with numeric columns."""
+    seeds = name_seeds(names)
+    domestic = np.asarray(countries, dtype=object) == DOMESTIC_COUNTRY
+    return pd.DataFrame({
+        "QS Ranking": _draw(seeds, 1, *QS_RANKING_RANGE),
+        "Acceptance Rate": _draw(seeds, 2, *ACCEPTANCE_RANGE),
+        "Avg Fee (Lakhs)": np.where(domestic, _draw(seeds, 3, *DOMESTIC_FEE_RANGE),
+                                    _draw(seeds, 4, *FEE_RANGE)),
+        "Program Strength": STRENGTH_LEVELS[_draw(seeds, 5, 0, len(STRENGTH_LEVELS))],
+    })
+
+
+def load_metrics(path):
+    """Reads a metrics CSV into a frame indexed by ``name_key`` of its ``University`` column."""
+    metrics = pd.read_csv(path)
+    if "University" not in metrics.columns:
+        raise ValueError(f"{path} has no 'University' column")
+    metrics = metrics[["University"] + [c for c in RANKING_COLUMNS if c in metrics.columns]]
+    for column in ("QS Ranking", "Acceptance Rate", "Avg Fee (Lakhs)"):
+        if column in metrics:
+            # Blank or non-numeric cells (e.g. "N/A") fall back to the placeholder
+            metrics[column] = pd.to_numeric(
+                metrics[column].astype(str).str.rstrip("%"), errors="coerce")
+    metrics.index = name_key(metrics.pop("University")).to_numpy()
+    return metrics[~metrics.index.duplicated(keep="last")]
+
+
+_metrics_cache = {}
+
+
+def default_metrics():
+    """Metrics from ``$GRADGUIDE_RANKINGS_CSV``, reloaded when the file changes; else None."""
+    if not RANKINGS_CSV:
+        return None
+    path = Path(RANKINGS_CSV)
+    stamp = path.stat().st_mtime_ns
+    cached = _metrics_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _metrics_cache[path] = (stamp, load_metrics(path))
+    return cached[1]
+
+
+def ranking_table(names, countries, metrics=None):
+    """Ranking rows for ``names``; ``countries`` is one country or one per name.
+
+    Numeric columns stay numeric (``Acceptance Rate`` in percent) so the
+    table can be filtered and sorted; see ``format_rankings`` for display.
+    """
+    names = pd.Series(names, dtype=object).reset_index(drop=True)
+    if isinstance(countries, str):
+        countries = np.full(len(names), countries, dtype=object)
+    table = placeholder_metrics(names, countries)
+    if metrics is not None and len(metrics):
+        real = metrics.reindex(name_key(names).to_numpy()).reset_index(drop=True)
+        for column in real.columns:
+            table[column] = real[column].fillna(table[column])
+            if column != "Program Strength" and (table[column] % 1 == 0).all():
+                # Back to integers when the CSV only holds whole numbers
+                table[column] = table[column].astype(np.int64)
+    table.insert(0, "University", names)
+    return table
+
+
+def query_rankings(table, max_rank=None, min_acceptance=None, max_fee=None,
+                   strengths=None, sort_by="QS Ranking", ascending=True, limit=None):
+    """Filters and sorts a ``ranking_table`` result."""
+    mask = np.ones(len(table), dtype=bool)
+    if max_rank is not None:
+        mask &= table["QS Ranking"].to_numpy() <= max_rank
+    if min_acceptance is not None:
+        mask &= table["Acceptance Rate"].to_numpy() >= min_acceptance
+    if max_fee is not None:
+        mask &= table["Avg Fee (Lakhs)"].to_numpy() <= max_fee
+    if strengths is not None:
+        mask &= table["Program Strength"].isin(strengths).to_numpy()
+    result = table[mask]
+    if sort_by is not None:
+        result = result.sort_values(sort_by, ascending=ascending, kind="stable")
+    if limit is not None:
+        result = result.head(limit)
+    return result.reset_index(drop=True)
+
+
+def format_rankings(table):
+    """Copy of ``table`` with ``Acceptance Rate`` rendered as e.g. ``"42%"``."""
+    table = table.copy()
+    table["Acceptance Rate"] = table["Acceptance Rate"].map("{:g}%".format)
+    return table
@@ -0,0 +1,332 @@
+"""Profile validation and encoding into the model's feature matrix.
+
+``FeatureSchema`` takes the column order from the fitted model itself (the
+ColumnTransformer's ``feature_names_in_``, or the compiled engine's copy of
+it) rather than from a hand-typed list, and the label codes from
+``gradguide.features`` plus any one-hot encoder categories.  Inputs are
+validated and written column by column into one preallocated float64 array
+in that order, which both engines score directly; the sklearn Pipeline gets
+a DataFrame wrapped around it without copying.  Single profiles, record
+lists and frames all go through ``encode_columns``.
+
+Each profile field is one scalar (no lists, mappings or booleans), numbers
+must be finite and within ``FEATURE_BOUNDS``, and labels outside a
+vocabulary ("Canada", "Entrepreneurship") are reported, never silently
+remapped: ``unknown="error"`` raises ``SchemaError`` and
+``unknown="fallback"`` scores them as ``FALLBACK_LABELS`` and lists them in
+``Encoded.remapped``.
+
+Usage::
+
+    schema = FeatureSchema.from_model(model)
+    encoded = schema.encode_profile({"cgpa": 8.2, "gre": 315, ...})
+    model.predict_proba(schema.model_input(model, encoded.matrix))
+"""
+import numbers
+from collections import namedtuple
+
+import numpy as np
+
+from gradguide.features import (FALLBACK_LABELS, FEATURE_BOUNDS, FORM_FIELDS, KEY_DECIMALS,
+                                LABELS)
+
+UNKNOWN_POLICIES = ("error", "fallback")
+
+# Offending rows quoted in a problem before "and N more"
+_SHOWN_ROWS = 5
+
+# ``matrix`` is (rows, features) in schema order; ``remapped`` maps a column
+# to the unknown labels that were scored as its fallback
+Encoded = namedtuple("Encoded", ["matrix", "remapped"])
+
+
+class SchemaError(ValueError):
+    """Inputs that cannot be encoded; ``problems`` lists every issue found."""
+
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__("; ".join(self.problems))
+
+    def __reduce__(self):
+        # Rebuilt from the list, not the joined message, when sent back by a batch worker
+        return type(self), (self.problems,)
+
+
+def _rows_text(rows, first_row):
+    """" in rows 3, 17, ..." for a problem message; empty for a single profile."""
+    if first_row is None:
+        return ""
+    shown = ", ".join(str(first_row + int(i)) for i in rows[:_SHOWN_ROWS])
+    more = f" and {len(rows) - _SHOWN_ROWS} more" if len(rows) > _SHOWN_ROWS else ""
+    return f" in row{'s' if len(rows) > 1 else ''} {shown}{more}"
+
+
+def _is_number(value):
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _scalar_problem(value):
+    """Why ``value`` cannot be one profile field, or None if it can."""
+    if isinstance(value, (bool, np.bool_)):
+        return "expected a number or label, got a boolean"
+    if value is None or isinstance(value, (str, numbers.Number, np.generic)):
+        return None
+    return f"expected a single value, got {type(value).__name__}"
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _factorize(values):
+    """``(uniques, inverse)`` of a label column; pandas columns are hashed, not sorted."""
+    if hasattr(values, "to_numpy"):
+        import pandas as pd
+
+        inverse, uniques = pd.factorize(values, use_na_sentinel=False)
+        return np.asarray(uniques, dtype=object), inverse
+    if values.size == 1:
+        return values.ravel(), np.zeros(1, dtype=np.intp)
+    try:
+        return np.unique(values, return_inverse=True)
+    except TypeError:  # mixed labels and numbers
+        return np.unique(values.astype(str), return_inverse=True)
+
+
+class FeatureSchema:
+    """Column order, label codes, value bounds and cache-key rounding for one fitted model."""
+
+    def __init__(self, feature_names, labels=None, fallbacks=None, bounds=None):
+        self.feature_names = list(feature_names)
+        self.bounds = {col: bound for col, bound in (bounds or {}).items()
+                       if col in self.feature_names}
+        self.labels = {col: dict(codes) for col, codes in (labels or {}).items()
+                       if col in self.feature_names}
+        self.fallbacks = {col: self.labels[col][label]
+                          for col, label in (fallbacks or {}).items() if col in self.labels}
+        self._codes = {col: np.array(sorted(set(codes.values())), dtype=np.float64)
+                       for col, codes in self.labels.items()}
+        self._aliases = {}
+        for field, col in FORM_FIELDS.items():
+            self._aliases[field] = col
+        for col in self.feature_names:
+            self._aliases[col] = col
+            self._aliases[col.strip().lower()] = col
+        self._key_decimals = [KEY_DECIMALS.get(col) for col in self.feature_names]
+
+    @classmethod
+    def from_model(cls, model):
+        """Schema of a fitted Pipeline or a ``CompiledForest``."""
+        if hasattr(model, "as_matrix"):
+            names = model.feature_names
+            onehot = {names[i]: cats for i, cats in zip(model.cat_index, model.categories)}
+        else:
+            preprocessor = model.steps[0][1]
+            names = list(preprocessor.feature_names_in_)
+            onehot = {}
+            for _, transformer, columns in preprocessor.transformers_:
+                if hasattr(transformer, "categories_"):
+                    onehot.update(zip(columns, transformer.categories_))
+
+        labels = dict(LABELS)
+        for col, cats in onehot.items():
+            if col not in labels:
+                labels[col] = {str(cat): float(cat) for cat in cats}
+        return cls(names, labels, FALLBACK_LABELS, FEATURE_BOUNDS)
+
+    def resolve(self, name):
+        """Model column for a column or form-field name; None if it is not a feature."""
+        name = str(name)
+        return self._aliases.get(name) or self._aliases.get(name.strip().lower())
+
+    def encode_columns(self, columns, n_rows, unknown="error", first_row=0):
+        """Validates and encodes ``{model column: values}`` into an ``Encoded``.
+
+        Every problem in the input is collected before ``SchemaError`` is
+        raised, with rows numbered from ``first_row`` (None leaves them out).
+        """
+        if unknown not in UNKNOWN_POLICIES:
+            raise ValueError(f"unknown must be one of {UNKNOWN_POLICIES}, not {unknown!r}")
+        matrix = np.empty((n_rows, len(self.feature_names)), dtype=np.float64)
+        problems, remapped = [], {}
+
+        missing = [col.strip() for col in self.feature_names if col not in columns]
+        if missing:
+            problems.append(f"Missing fields: {', '.join(missing)}")
+        for j, col in enumerate(self.feature_names):
+            if col not in columns:
+                continue
+            if col in self.labels:
+                self._encode_labels(matrix[:, j], col, columns[col], unknown, first_row,
+                                    problems, remapped)
+            else:
+                self._encode_numbers(matrix[:, j], col, columns[col], first_row, problems)
+
+        if problems:
+            raise SchemaError(problems)
+        return Encoded(matrix, remapped)
+
+    def _encode_numbers(self, out, col, values, first_row, problems):
+        try:
+            numbers = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            values = np.asarray(values, dtype=object)
+            bad = np.flatnonzero([not _is_number(v) for v in values])
+            examples = ", ".join(repr(v) for v in dict.fromkeys(values[bad][:_SHOWN_ROWS]))
+            problems.append(f"{col.strip()}: not a number ({examples})"
+                            f"{_rows_text(bad, first_row)}")
+            return
+        missing = np.flatnonzero(np.isnan(numbers))
+        if missing.size:
+            problems.append(f"{col.strip()}: missing value{_rows_text(missing, first_row)}")
+            return
+        infinite = np.flatnonzero(np.isinf(numbers))
+        if infinite.size:
+            problems.append(f"{col.strip()}: not a finite number"
+                            f"{_rows_text(infinite, first_row)}")
+            return
+        if col in self.bounds:
+            low, high = self.bounds[col]
+            outside = np.zeros(numbers.shape, dtype=bool)
+            if low is not None:
+                outside |= numbers < low
+            if high is not None:
+                outside |= numbers > high
+            bad = np.flatnonzero(outside)
+            if bad.size:
+                if high is None:
+                    expected = f"at least {low:g}"
+                elif low is None:
+                    expected = f"at most {high:g}"
+                else:
+                    expected = f"between {low:g} and {high:g}"
+                examples = ", ".join(f"{v:g}" for v in dict.fromkeys(numbers[bad][:_SHOWN_ROWS]))
+                problems.append(f"{col.strip()}: expected {expected}, got {examples}"
+                                f"{_rows_text(bad, first_row)}")
+                return
+        out[:] = numbers
+
+    def _label_code(self, col, value):
+        """Code for one label (or an already-encoded code); None if it is unknown."""
+        codes = self.labels[col]
+        if isinstance(value, str):
+            code = codes.get(value.strip())
+            if code is not None or not _is_number(value):
+                return code
+        elif not _is_number(value):
+            return None
+        number = float(value)
+        return number if number in self._codes[col] else None
+
+    def _encode_labels(self, out, col, values, unknown, first_row, problems, remapped):
+        if not hasattr(values, "dtype"):
+            values = np.asarray(values)
+        if values.dtype.kind in "biuf":
+            values = np.asarray(values)
+            out[:] = values
+            known = np.isin(out, self._codes[col])
+            if known.all():
+                return
+            bad_rows = np.flatnonzero(~known)
+            uniques, inverse = np.unique(values[bad_rows], return_inverse=True)
+            is_known = np.zeros(len(uniques), dtype=bool)
+        else:
+            # Each distinct label is looked up once, then broadcast to its rows
+            uniques, inverse = _factorize(values)
+            codes = [self._label_code(col, value) for value in uniques]
+            is_known = np.array([code is not None for code in codes])
+            lookup = np.array([code if code is not None else np.nan for code in codes])
+            out[:] = lookup[inverse]
+            if is_known.all():
+                return
+            bad_rows = np.flatnonzero(~is_known[inverse])
+            inverse = inverse[bad_rows]
+
+        is_missing = np.array([_is_missing(value) for value in uniques])
+        missing_rows = bad_rows[is_missing[inverse]]
+        if missing_rows.size:
+            problems.append(f"{col.strip()}: missing value{_rows_text(missing_rows, first_row)}")
+        unknown_rows = bad_rows[~is_missing[inverse]]
+        if not unknown_rows.size:
+            return
+        labels = [f"{value:g}" if isinstance(value, float) else str(value)
+                  for value in uniques[~(is_known | is_missing)]]
+        if unknown == "fallback" and col in self.fallbacks:
+            out[unknown_rows] = self.fallbacks[col]
+            remapped[col] = labels
+            return
+        problems.append(f"{col.strip()}: unknown {', '.join(map(repr, labels))}"
+                        f"{_rows_text(unknown_rows, first_row)}; expected one of "
+                        f"{', '.join(self.labels[col])}")
+
+    def encode_profile(self, profile, unknown="error"):
+        """One profile (form-field or column names) as a one-row ``Encoded``."""
+        columns, unexpected, problems = {}, [], []
+        for name, value in profile.items():
+            col = self.resolve(name)
+            if col is None:
+                unexpected.append(str(name))
+                continue
+            problem = _scalar_problem(value)
+            if problem is None:
+                columns[col] = (value,)
+            else:
+                problems.append(f"{col.strip()}: {problem}")
+                # A valid stand-in, so the remaining fields are still checked
+                columns[col] = (self._placeholder(col),)
+        try:
+            encoded = self.encode_columns(columns, 1, unknown, first_row=None)
+        except SchemaError as exc:
+            problems = exc.problems + problems
+        if unexpected:
+            problems.append(f"Unexpected fields: {', '.join(unexpected)}")
+        if problems:
+            raise SchemaError(problems)
+        return encoded
+
+    def _placeholder(self, col):
+        """Some value ``col`` accepts."""
+        if col in self._codes:
+            return self._codes[col][0]
+        low, high = self.bounds.get(col, (None, None))
+        if low is not None:
+            return low
+        return high if high is not None else 0.0
+
+    def encode_records(self, records, unknown="error", first_row=0):
+        """A list of profile mappings as an ``Encoded``; unrecognized keys are ignored."""
+        names = {name: self.resolve(name) for record in records for name in record}
+        columns = {col: [record.get(name) for record in records]
+                   for name, col in names.items() if col is not None}
+        return self.encode_columns(columns, len(records), unknown, first_row)
+
+    def encode_frame(self, frame, unknown="error", first_row=0):
+        """A DataFrame of profiles as an ``Encoded``; other columns are ignored."""
+        columns = {}
+        for name in frame.columns:
+            col = self.resolve(name)
+            if col is not None:
+                columns[col] = frame[name]
+        return self.encode_columns(columns, len(frame), unknown, first_row)
+
+    def key(self, row):
+        """Canonical, hashable cache key for one encoded row.
+
+        Floats are rounded to the step of their form widget (CGPA 0.1, admission
+        chance 0.01) so near-identical submissions share one key; everything else
+        is rounded to the nearest integer.
+        """
+        return tuple(round(float(value)) if decimals is None else round(float(value), decimals)
+                     for value, decimals in zip(row, self._key_decimals))
+
+    def model_input(self, model, matrix):
+        """``matrix`` as ``model`` takes it: as is for the compiled engine, else a DataFrame."""
+        if hasattr(model, "as_matrix"):
+            return matrix
+        import pandas as pd
+
+        return pd.DataFrame(matrix, columns=self.feature_names, copy=False)
@@ -0,0 +1,146 @@
+"""Prebuilt, deduplicated university name search.
+
+``NameIndex`` is built once from hipolabs-format records and answers
+type-ahead queries without scanning every name:
+
+* an inverted index maps each name token to the (deduplicated) institutions
+  containing it, weighted by inverse document frequency;
+* every query token also matches vocabulary tokens it is a prefix of, so
+  "mass inst tech" finds "Massachusetts Institute of Technology";
+* tokens with no exact/prefix hit fall back to trigram similarity over the
+  vocabulary, which absorbs typos such as "stanfrod".
+
+Institutions matching every query token rank above partial matches; ties are
+broken by whole-name prefix matches and then by shorter names.
+"""
+import heapq
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+from gradguide.text import normalize
+
+# Weight of a token reached by prefix expansion relative to an exact token match
+PREFIX_WEIGHT = 0.75
+# Weight of a fuzzy (trigram) token match, multiplied by its similarity
+FUZZY_WEIGHT = 0.5
+FUZZY_MIN_SIMILARITY = 0.3
+FUZZY_CANDIDATES = 5
+# Upper bound on vocabulary tokens one short prefix may expand to
+MAX_PREFIX_EXPANSIONS = 64
+# Bonus for names that start with the whole query
+NAME_PREFIX_BONUS = 0.5
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Tokens of an already-normalized string."""
+    return _TOKEN.findall(text)
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Inverted token + trigram index over university names."""
+
+    def __init__(self, records):
+        seen = set()
+        self.records = []
+        self.names = []
+        for record in records:
+            name = normalize(record.get("name") or "")
+            key = (name, normalize(record.get("country") or ""))
+            if not name or key in seen:
+                continue
+            seen.add(key)
+            self.records.append(record)
+            self.names.append(name)
+
+        postings = defaultdict(list)
+        for doc_id, name in enumerate(self.names):
+            for token in set(tokenize(name)):
+                postings[token].append(doc_id)
+
+        self.vocab = sorted(postings)
+        self.postings = [np.array(postings[token], dtype=np.int32) for token in self.vocab]
+        frequency = np.array([len(p) for p in self.postings], dtype=np.float64)
+        self.idf = np.log1p(len(self.records) / frequency) if len(frequency) else frequency
+
+        self._trigrams = defaultdict(list)
+        self._trigram_counts = np.empty(len(self.vocab), dtype=np.int32)
+        for token_id, token in enumerate(self.vocab):
+            grams = trigrams(token)
+            self._trigram_counts[token_id] = len(grams)
+            for gram in grams:
+                self._trigrams[gram].append(token_id)
+
+        # Slightly favour shorter names among otherwise equal matches
+        self._length_penalty = np.array([len(name) for name in self.names]) * 1e-4
+
+    def __len__(self):
+        return len(self.records)
+
+    def _expand(self, token):
+        """Vocabulary ``(token_id, weight)`` pairs a query token should match."""
+        matches = []
+        start = bisect_left(self.vocab, token)
+        for token_id in range(start, min(start + MAX_PREFIX_EXPANSIONS, len(self.vocab))):
+            candidate = self.vocab[token_id]
+            if not candidate.startswith(token):
+                break
+            matches.append((token_id, 1.0 if candidate == token else PREFIX_WEIGHT))
+        if matches or len(token) < 3:
+            return matches
+
+        grams = trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for token_id in self._trigrams.get(gram, ()):
+                shared[token_id] += 1
+        scored = []
+        for token_id, common in shared.items():
+            similarity = common / (len(grams) + self._trigram_counts[token_id] - common)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                scored.append((similarity, token_id))
+        return [(token_id, FUZZY_WEIGHT * similarity)
+                for similarity, token_id in heapq.nlargest(FUZZY_CANDIDATES, scored)]
+
+    def search(self, query, k=20):
+        """Top ``k`` records for ``query``, best match first."""
+        query = normalize(query)
+        tokens = tokenize(query)
+        if not tokens or not self.records:
+            return []
+
+        total = np.zeros(len(self.records))
+        matched = np.zeros(len(self.records), dtype=np.int32)
+        for token in tokens:
+            best = np.zeros(len(self.records))
+            for token_id, weight in self._expand(token):
+                docs = self.postings[token_id]
+                best[docs] = np.maximum(best[docs], weight * self.idf[token_id])
+            total += best
+            matched += best > 0
+
+        candidates = np.flatnonzero(matched == len(tokens))
+        if not candidates.size:
+            candidates = np.flatnonzero(matched)
+            if not candidates.size:
+                return []
+        scores = total[candidates] + matched[candidates] - self._length_penalty[candidates]
+
+        # Partial sort, then apply the whole-name prefix bonus to a small pool
+        pool = min(len(candidates), k * 4)
+        top = np.argpartition(-scores, pool - 1)[:pool] if pool < len(candidates) \
+            else np.arange(len(candidates))
+        ranked = sorted(
+            ((scores[i] + (NAME_PREFIX_BONUS if self.names[candidates[i]].startswith(query)
+                           else 0.0), candidates[i]) for i in top),
+            key=lambda pair: (-pair[0], pair[1]))
+        return [self.records[doc_id] for _, doc_id in ranked[:k]]
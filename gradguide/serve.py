@@ -0,0 +1,334 @@
+"""JSON HTTP prediction service with micro-batching.
+
+Serves the Career Prediction page's model and encoding over plain HTTP
+(stdlib ``ThreadingHTTPServer``, one thread per connection):
+
+* ``POST /predict`` with the form fields as JSON, e.g. ``{"cgpa": 8.2,
+  "gre": 315, "toefl": 105, "gate_score": 0, "sop": 4, "lor": 4,
+  "univ_rating": 3, "chance": 0.7, "research": "Yes", "career_goal":
+  "Industry", "budget": 60, "pref_country": "USA"}``; invalid profiles get
+  a 400 listing every ``problems`` entry from ``gradguide.schema`` (including
+  non-finite and out-of-range numbers), and any other failure a JSON 500;
+* ``GET /metrics`` for latency percentiles and the batch-size histogram;
+* ``GET /metrics/prometheus`` for the same plus every ``gradguide.telemetry``
+  span, counter and cache statistic in Prometheus text format;
+* ``GET /health``, which also names the model version being served.
+
+A background thread calls ``Predictor.refresh`` so a version promoted with
+``python -m gradguide.train promote`` is picked up without a restart;
+requests already queued are scored by the model they were encoded for.
+
+Concurrent requests are queued and collected for up to ``max_wait`` seconds
+or ``max_batch`` requests, whichever comes first, then scored with a single
+``predict_proba`` call on a small worker pool.  While all workers are busy
+the pending batch keeps absorbing new arrivals, so batches grow with load.
+``--max-batch 1`` turns batching off.
+
+Usage::
+
+    python -m gradguide.serve --port 8000 --max-batch 64 --max-wait-ms 2
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from gradguide import telemetry
+from gradguide.core import Predictor
+from gradguide.features import path_label
+from gradguide.schema import SchemaError
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT = 0.002  # seconds
+DEFAULT_WORKERS = 2
+# Latency samples kept for the percentiles
+LATENCY_WINDOW = 10_000
+
+
+class MicroBatcher:
+    """Collects single-profile requests into batched ``predict_proba`` calls.
+
+    Each request names the model (a ``LoadedModel``) its row was encoded for,
+    so requests queued across a hot swap are still scored by their own model.
+    """
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT,
+                 workers=DEFAULT_WORKERS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="score")
+        self._idle_workers = threading.Semaphore(workers)
+        self._lock = threading.Lock()
+        self.batch_sizes = Counter()
+        self._collector = threading.Thread(target=self._collect, name="batcher", daemon=True)
+        self._collector.start()
+
+    def submit(self, loaded, row):
+        """Queues a row encoded by ``loaded``; resolves to ``(prediction, MS probability)``."""
+        future = Future()
+        self._queue.put((loaded, row, future))
+        return future
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # While every worker is busy, keep topping the batch up with new arrivals
+            self._idle_workers.acquire()
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._pool.submit(self._score, batch)
+
+    def _score(self, batch):
+        with self._lock:
+            self.batch_sizes[len(batch)] += 1
+        # Only a batch straddling a model swap holds more than one group
+        groups = {}
+        for loaded, row, future in batch:
+            groups.setdefault(loaded, []).append((row, future))
+        try:
+            for loaded, requests in groups.items():
+                self._score_group(loaded, requests)
+        finally:
+            self._idle_workers.release()
+
+    @staticmethod
+    def _score_group(loaded, requests):
+        model = loaded.model
+        try:
+            matrix = np.array([row for row, _ in requests], dtype=np.float64)
+            with telemetry.span("serve_batch"):
+                proba = model.predict_proba(loaded.schema.model_input(model, matrix))
+        except Exception as exc:
+            for _, future in requests:
+                future.set_exception(exc)
+            return
+        predictions = model.classes_.take(np.argmax(proba, axis=1))
+        positive = list(model.classes_).index(1)
+        for (_, future), prediction, p in zip(requests, predictions, proba[:, positive]):
+            future.set_result((int(prediction), float(p)))
+
+    def histogram(self):
+        """Copy of the ``{batch size: batches scored}`` counts."""
+        with self._lock:
+            return Counter(self.batch_sizes)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+class ServiceMetrics:
+    """Request counts and a sliding window of successful request latencies."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self.requests += 1
+            if error:
+                self.errors += 1
+            else:
+                self._latencies.append(seconds)
+
+    def snapshot(self, batch_sizes):
+        with self._lock:
+            latencies = np.array(self._latencies)
+            requests, errors = self.requests, self.errors
+        batches = sum(batch_sizes.values())
+        p50, p90, p99 = (np.percentile(latencies, [50, 90, 99]) * 1e3
+                         if latencies.size else (0.0, 0.0, 0.0))
+        return {
+            "requests": requests,
+            "errors": errors,
+            "latency_ms": {"p50": p50, "p90": p90, "p99": p99},
+            "batches": batches,
+            "mean_batch_size": (sum(size * count for size, count in batch_sizes.items())
+                                / batches if batches else 0.0),
+            "batch_sizes": {str(size): count for size, count in sorted(batch_sizes.items())},
+        }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 resets connections under a burst of new clients
+    request_queue_size = 128
+
+
+class PredictionService:
+    """Predictor + micro-batcher + metrics behind a ``ThreadingHTTPServer``."""
+
+    def __init__(self, predictor=None, host="127.0.0.1", port=8000, max_batch=DEFAULT_MAX_BATCH,
+                 max_wait=DEFAULT_MAX_WAIT, workers=DEFAULT_WORKERS):
+        self.predictor = predictor if predictor is not None else Predictor()
+        self.batcher = MicroBatcher(max_batch, max_wait, workers)
+        self.metrics = ServiceMetrics()
+        self.server = _Server((host, port), self._handler())
+        self._thread = None
+        telemetry.register_collector(
+            "serve", lambda: self.metrics.snapshot(self.batcher.histogram()))
+        self._stopping = threading.Event()
+        threading.Thread(target=self._watch_model, name="model-refresh", daemon=True).start()
+
+    def _watch_model(self):
+        """Picks up newly promoted model versions between requests."""
+        while not self._stopping.wait(self.predictor.refresh_interval):
+            self.predictor.refresh(force=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def predict(self, payload):
+        """Response body for one ``/predict`` payload.
+
+        Raises ``ValueError`` for anything but a JSON object and ``SchemaError``
+        for missing fields, bad values and unknown labels.
+        """
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object of form fields")
+        loaded = self.predictor.current()
+        # Rejects missing, non-numeric, non-finite and out-of-range values
+        encoded = loaded.encode(**payload)
+        prediction, probability = self.batcher.submit(loaded, encoded.matrix[0]).result()
+        body = {"prediction": prediction, "path": path_label(prediction),
+                "probability": probability, "model_version": loaded.version or "shipped"}
+        if encoded.remapped:
+            body["remapped"] = encoded.remapped
+        return body
+
+    def _handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; don't let Nagle hold the body
+            disable_nagle_algorithm = True
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._reply(200, {"status": "ok",
+                                      "model_version": service.predictor.version or "shipped"})
+                elif self.path == "/metrics":
+                    self._reply(200, service.metrics.snapshot(service.batcher.histogram()))
+                elif self.path == "/metrics/prometheus":
+                    data = telemetry.registry.to_prometheus().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                else:
+                    self._reply(404, {"error": f"Unknown path {self.path}"})
+
+            def do_POST(self):
+                start = time.perf_counter()
+                if self.path != "/predict":
+                    self._reply(404, {"error": f"Unknown path {self.path}"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    body = service.predict(json.loads(self.rfile.read(length) or b"null"))
+                except SchemaError as exc:
+                    service.metrics.record(time.perf_counter() - start, error=True)
+                    self._reply(400, {"error": "Invalid profile", "problems": exc.problems})
+                    return
+                except ValueError as exc:  # includes malformed JSON
+                    service.metrics.record(time.perf_counter() - start, error=True)
+                    self._reply(400, {"error": str(exc)})
+                    return
+                except Exception as exc:
+                    service.metrics.record(time.perf_counter() - start, error=True)
+                    telemetry.increment("serve_errors", error=type(exc).__name__)
+                    self._reply(500, {"error": f"Internal error: {type(exc).__name__}"})
+                    return
+                service.metrics.record(time.perf_counter() - start)
+                self._reply(200, body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Serves from a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve career-path predictions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Largest batch scored at once; 1 disables batching")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1e3,
+                        help="How long the first request in a batch waits for company")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--engine", choices=["sklearn", "fast"], default="sklearn")
+    parser.add_argument("--unknown", choices=["error", "fallback"], default="error",
+                        help="Reject unknown labels, or score them as the fallback label "
+                             "and list them under \"remapped\"")
+    args = parser.parse_args(argv)
+
+    # The service exposes /metrics/prometheus, so always record
+    telemetry.enable()
+    predictor = Predictor(fast=args.engine == "fast", unknown=args.unknown)
+    service = PredictionService(predictor, args.host, args.port,
+                                args.max_batch, args.max_wait_ms / 1e3, args.workers)
+    print(f"Serving predictions on {service.url} (max batch {args.max_batch}, "
+          f"max wait {args.max_wait_ms:g} ms)", flush=True)
+    try:
+        service.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
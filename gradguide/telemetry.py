@@ -0,0 +1,423 @@
+"""Process-wide timing spans, counters and profiling hooks.
+
+Everything records into one ``Registry`` that exports as JSON
+(``snapshot``) or Prometheus text exposition format (``to_prometheus``)::
+
+    from gradguide import telemetry
+
+    with telemetry.span("model_load"):
+        model = joblib.load(path)
+    telemetry.increment("upstream_errors", error="ReadTimeout")
+
+    @telemetry.timed("chart_build", chart="timeline")
+    def timeline_figure(prediction): ...
+
+Spans land in one latency histogram per name and label set; exceptions
+escaping a span are counted as ``span_errors``.  Components with their own
+counters (caches, the upstream client) register a *collector*, a callable
+returning their ``stats()`` dict, whose numbers are exported as gauges.
+
+Recording is off unless ``$GRADGUIDE_METRICS=1`` or ``enable()`` is called;
+while off, ``span`` hands back a shared no-op context manager and the other
+calls return immediately, so instrumented code pays one global lookup.
+
+``$GRADGUIDE_PROFILE=cprofile`` (or ``pyinstrument``, if installed) turns on
+``profile``, which GradGuide.py wraps around every rerun's page, and
+``profiled``, which profiles fragments rerun on their own; profiles are
+written under ``$GRADGUIDE_PROFILE_DIR`` (default ``.cache/profiles``).
+One profile runs at a time per process.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from gradguide.cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the span histogram buckets, as in Prometheus clients
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+PREFIX = "gradguide"
+PROFILERS = ("cprofile", "pyinstrument")
+
+_enabled = os.environ.get("GRADGUIDE_METRICS") == "1"
+_NULL_SPAN = contextlib.nullcontext()
+# Held while a profile is running; at most one per process
+_profile_lock = threading.Lock()
+_active_profile = None
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with a running sum and maximum."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding quantile ``q``; the max for the +Inf bucket."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _label_text(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _flatten(stats, prefix=""):
+    """Numeric leaves of a nested ``stats()`` dict as ``{"a_b": value}``."""
+    flat = {}
+    for key, value in stats.items():
+        name = f"{prefix}_{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+class Registry:
+    """Counters, span histograms and collectors for one process."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._spans = {}
+        self._collectors = {}
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._spans.get(key)
+            if histogram is None:
+                histogram = self._spans[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def register_collector(self, name, collect):
+        """Exports the numbers in ``collect()`` (a ``stats()``-style dict) as gauges.
+
+        Registering the same name again replaces the previous collector.
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def _collected(self):
+        with self._lock:
+            collectors = list(self._collectors.items())
+        return {name: _flatten(collect()) for name, collect in collectors}
+
+    def snapshot(self):
+        """Everything recorded so far as a JSON-serializable dict."""
+        with self._lock:
+            counters = list(self._counters.items())
+            spans = [(key, histogram.summary()) for key, histogram in self._spans.items()]
+        return {
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in sorted(counters)],
+            "spans": [{"name": name, "labels": dict(labels), **summary}
+                      for (name, labels), summary in sorted(spans, key=lambda s: s[0])],
+            "collected": self._collected(),
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            spans = sorted(((key, histogram.buckets, list(histogram.counts), histogram.count,
+                             histogram.sum) for key, histogram in self._spans.items()),
+                           key=lambda s: s[0])
+
+        by_name = {}
+        for (name, labels), value in counters:
+            by_name.setdefault(name, []).append((labels, value))
+        for name, samples in by_name.items():
+            metric = f"{PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f"{metric}{_label_text(labels)} {value}" for labels, value in samples)
+
+        if spans:
+            metric = f"{PREFIX}_span_seconds"
+            lines.append(f"# HELP {metric} Time spent in instrumented spans.")
+            lines.append(f"# TYPE {metric} histogram")
+        for (name, labels), buckets, counts, count, total in spans:
+            key = (("span", name),) + labels
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{metric}_bucket{_label_text(key, [('le', le)])} {cumulative}")
+            lines.append(f"{metric}_sum{_label_text(key)} {total}")
+            lines.append(f"{metric}_count{_label_text(key)} {count}")
+
+        for collector, values in sorted(self._collected().items()):
+            for key, value in sorted(values.items()):
+                metric = f"{PREFIX}_{collector}_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically writes ``to_prometheus()`` for node_exporter's textfile collector."""
+        path = Path(path)
+        staging = path.with_name(f".{path.name}.{os.getpid()}")
+        staging.write_text(self.to_prometheus())
+        os.replace(staging, path)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._spans.clear()
+
+
+registry = Registry()
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True):
+    """Switches recording on (or off) for the whole process."""
+    global _enabled
+    _enabled = on
+
+
+class _Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            registry.increment("span_errors", span=self.name, error=exc_type.__name__)
+        return False
+
+
+def span(name, **labels):
+    """Context manager timing its block into the ``name`` histogram."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, labels)
+
+
+def timed(name, **labels):
+    """Decorator form of ``span``."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def increment(name, amount=1, **labels):
+    if _enabled:
+        registry.increment(name, amount, **labels)
+
+
+def observe(name, seconds, **labels):
+    if _enabled:
+        registry.observe(name, seconds, **labels)
+
+
+def register_collector(name, collect):
+    registry.register_collector(name, collect)
+
+
+def profile_mode():
+    """The profiler selected by ``$GRADGUIDE_PROFILE``, or None.
+
+    An unknown name or a missing pyinstrument logs a warning (once) and
+    leaves profiling off rather than failing every rerun.
+    """
+    return _profile_mode(os.environ.get("GRADGUIDE_PROFILE", "").lower())
+
+
+@functools.lru_cache(maxsize=None)
+def _profile_mode(mode):
+    if not mode:
+        return None
+    if mode not in PROFILERS:
+        logger.warning("Ignoring GRADGUIDE_PROFILE=%r; expected one of %s", mode, PROFILERS)
+        return None
+    if mode == "pyinstrument":
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            logger.warning("GRADGUIDE_PROFILE=pyinstrument needs `pip install pyinstrument`; "
+                           "GRADGUIDE_PROFILE=cprofile works without it")
+            return None
+    return mode
+
+
+def profile_dir():
+    return Path(os.environ.get("GRADGUIDE_PROFILE_DIR", cache_dir() / "profiles"))
+
+
+def start_profile():
+    """Starts the ``$GRADGUIDE_PROFILE`` profiler; returns None when profiling is off.
+
+    Also None while another profile is running anywhere in the process:
+    Streamlit runs every session on its own thread, and on Python 3.12+ a
+    second cProfile cannot be enabled alongside the first.  Code nested in a
+    running profile is covered by it.
+    """
+    global _active_profile
+    mode = profile_mode()
+    if mode is None or not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        if mode == "pyinstrument":
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+        else:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+    except BaseException:
+        _profile_lock.release()
+        raise
+    _active_profile = profiler
+    return profiler
+
+
+def stop_profile(profiler, label="rerun"):
+    """Stops a ``start_profile`` profiler and writes it out; returns the file path.
+
+    cProfile runs are saved as ``.prof`` (open with ``pstats`` or snakeviz),
+    pyinstrument runs as HTML.
+    """
+    global _active_profile
+    if profiler is None:
+        return None
+    try:
+        if hasattr(profiler, "output_html"):
+            profiler.stop()
+        else:
+            profiler.disable()
+    finally:
+        if profiler is _active_profile:
+            _active_profile = None
+            _profile_lock.release()
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    label = re.sub(r"[^A-Za-z0-9_-]+", "-", label).strip("-") or "rerun"
+    # Millisecond stamp: a click usually triggers two reruns within one second
+    now = time.time()
+    stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now % 1 * 1000):03d}"
+    stem = f"{stamp}-{os.getpid()}-{label}"
+    if hasattr(profiler, "output_html"):
+        path = directory / f"{stem}.html"
+        path.write_text(profiler.output_html())
+    else:
+        path = directory / f"{stem}.prof"
+        profiler.dump_stats(path)
+    return path
+
+
+class _Profile:
+    __slots__ = ("label", "path", "_profiler")
+
+    def __init__(self, label):
+        self.label = label
+        self.path = None
+
+    def __enter__(self):
+        self._profiler = start_profile()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Streamlit ends a rerun early by raising RerunException or StopException
+        label = self.label if exc_type is None else f"{self.label}-interrupted"
+        self.path = stop_profile(self._profiler, label)
+        return False
+
+
+def profile(label="rerun"):
+    """Context manager profiling its block, stopped however the block exits.
+
+    Its ``path`` is the profile written on exit (None when profiling is
+    off); a block left by an exception is labelled ``<label>-interrupted``.
+    """
+    return _Profile(label)
+
+
+def profiled(label):
+    """Decorator form of ``profile``, for fragments.
+
+    A fragment rerun runs only the fragment function, not the script around
+    it, so it is profiled on its own.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Profile(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,9 @@
+"""Text normalization shared by the university catalogue and search index."""
+import unicodedata
+
+
+def normalize(text):
+    """Casefolded, accent-stripped, whitespace-collapsed form used for lookups."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
@@ -0,0 +1,298 @@
+"""Retraining the career-path model and rolling versions out.
+
+Rebuilds the same Pipeline as the shipped pickle (StandardScaler over the
+label-encoded columns, an empty one-hot branch, a 100-tree
+RandomForestClassifier) from a CSV or Parquet file of raw profiles -- the
+batch scoring input format -- plus a ``Recommended Path`` column holding a
+path label or its class (1 = MS abroad, 0 = MTech India).  Trees are fitted
+in parallel (``--n-jobs``, all cores by default).
+
+Every fit is published to the ``gradguide.versions`` store with its
+artifact and a ``metrics.json`` recording the data, hold-out quality, fit
+time and inference latency of both engines.  ``promote`` compares a version
+with the one being served and refuses a slower or less accurate model unless
+``--force`` is given; running apps and services switch to the new ``CURRENT``
+between requests.
+
+Usage::
+
+    python -m gradguide.train fit outcomes.csv --promote
+    python -m gradguide.train list
+    python -m gradguide.train promote v0002
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gradguide.artifact import (export_artifact, file_sha256, installed_sklearn_version,
+                                load_artifact, warm_start)
+from gradguide.features import (FALLBACK_LABELS, FEATURE_BOUNDS, FEATURE_COLUMNS, LABELS,
+                                PATH_LABELS)
+from gradguide.schema import FeatureSchema, SchemaError
+from gradguide.versions import (ARTIFACT_NAME, METRICS_NAME, MODEL_NAME, ModelStore,
+                                VersionError)
+
+TARGET_COLUMN = "Recommended Path"
+# Hyperparameters of the shipped career_path_model.pkl
+DEFAULT_PARAMS = {"n_estimators": 100, "min_samples_split": 5, "random_state": 42}
+TEST_SIZE = 0.2
+
+# Rollout gates for ``promote``
+MAX_SLOWDOWN = 1.25  # single-profile p50 latency, candidate / current
+MAX_ACCURACY_DROP = 0.01
+
+# Single-profile predictions timed per engine, and the batch size for throughput
+LATENCY_CALLS = 200
+LATENCY_BATCH = 10_000
+
+
+def build_pipeline(columns, n_jobs=-1, **params):
+    """Unfitted Pipeline with the shipped model's structure over ``columns``."""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    preprocessor = ColumnTransformer([
+        ("num", StandardScaler(), list(columns)),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), []),
+    ])
+    classifier = RandomForestClassifier(n_jobs=n_jobs, **{**DEFAULT_PARAMS, **params})
+    return Pipeline([("preprocessor", preprocessor), ("clf", classifier)])
+
+
+def training_schema():
+    return FeatureSchema(FEATURE_COLUMNS, LABELS, FALLBACK_LABELS, FEATURE_BOUNDS)
+
+
+def _encode_target(values, column):
+    classes = {label: cls for cls, label in PATH_LABELS.items()}
+    classes.update({str(cls): cls for cls in PATH_LABELS})
+    codes = pd.Series(values).astype(str).str.strip().map(classes)
+    bad = np.flatnonzero(codes.isna().to_numpy())
+    if bad.size:
+        examples = ", ".join(map(repr, dict.fromkeys(pd.Series(values).iloc[bad[:5]])))
+        raise SchemaError([f"{column}: expected one of {', '.join(classes)}, got {examples} "
+                           f"in {bad.size} row(s), first row {bad[0] + 1}"])
+    return codes.to_numpy(dtype=np.int64)
+
+
+def load_training_data(path, target=TARGET_COLUMN, unknown="error"):
+    """``(X, y)`` from a CSV/Parquet file: encoded features as a DataFrame, classes as ints."""
+    if Path(path).suffix.lower() in (".parquet", ".pq"):
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path)
+    if target not in frame.columns:
+        raise SchemaError([f"Missing target column {target!r}"])
+    schema = training_schema()
+    encoded = schema.encode_frame(frame, unknown, first_row=1)
+    X = pd.DataFrame(encoded.matrix, columns=schema.feature_names)
+    return X, _encode_target(frame[target], target)
+
+
+def measure_latency(pipeline, engine, X, calls=LATENCY_CALLS, batch=LATENCY_BATCH):
+    """Single-profile p50/p99 and batch throughput of the Pipeline and the fast engine."""
+    rows = X.to_numpy()
+    batch_rows = np.resize(rows, (batch, rows.shape[1]))
+    latency = {}
+    for name, model in (("sklearn", pipeline), ("fast", engine)):
+        schema = FeatureSchema.from_model(model)
+        singles = [schema.model_input(model, rows[i % len(rows)][None, :]) for i in range(calls)]
+        model.predict_proba(singles[0])
+        times = []
+        for single in singles:
+            start = time.perf_counter()
+            model.predict_proba(single)
+            times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        model.predict_proba(schema.model_input(model, batch_rows))
+        batch_seconds = time.perf_counter() - start
+        p50, p99 = np.percentile(times, [50, 99]) * 1e3
+        latency[name] = {"single_p50_ms": p50, "single_p99_ms": p99,
+                         "batch_rows_per_second": batch / batch_seconds}
+    return latency
+
+
+def fit(data_path, store=None, target=TARGET_COLUMN, n_jobs=-1, test_size=TEST_SIZE,
+        unknown="error", **params):
+    """Fits, evaluates and publishes a new version; returns ``(version, metrics)``."""
+    import joblib
+    from sklearn.metrics import accuracy_score, log_loss, roc_auc_score
+    from sklearn.model_selection import train_test_split
+
+    store = store if store is not None else ModelStore()
+    X, y = load_training_data(data_path, target, unknown)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, stratify=y, random_state=DEFAULT_PARAMS["random_state"])
+
+    pipeline = build_pipeline(X.columns, n_jobs=n_jobs, **params)
+    start = time.perf_counter()
+    pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    # Scoring is single-profile; don't spin up a thread pool per request
+    pipeline.set_params(clf__n_jobs=None)
+
+    predictions = pipeline.predict(X_test)
+    proba = pipeline.predict_proba(X_test)[:, list(pipeline.classes_).index(1)]
+    staging = store.staging()
+    try:
+        joblib.dump(pipeline, staging / MODEL_NAME)
+        export_artifact(staging / MODEL_NAME, staging / ARTIFACT_NAME)
+        engine = warm_start(load_artifact(staging / ARTIFACT_NAME, verify=False))
+        forest = pipeline.named_steps["clf"]
+        metrics = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "data": {
+                "path": str(data_path),
+                "sha256": file_sha256(data_path),
+                "rows": len(X),
+                "train_rows": len(X_train),
+                "test_rows": len(X_test),
+                "target": target,
+                "positive_rate": float(y.mean()),
+            },
+            "params": forest.get_params(),
+            "n_jobs": n_jobs,
+            "fit_seconds": fit_seconds,
+            "nodes": int(sum(tree.tree_.node_count for tree in forest.estimators_)),
+            "quality": {
+                "accuracy": accuracy_score(y_test, predictions),
+                "roc_auc": roc_auc_score(y_test, proba) if len(set(y_test)) > 1 else None,
+                "log_loss": log_loss(y_test, proba, labels=[0, 1]),
+            },
+            "latency": measure_latency(pipeline, engine, X_test),
+            "host": {
+                "python": platform.python_version(),
+                "sklearn": installed_sklearn_version(),
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "node": platform.node(),
+            },
+        }
+        with open(staging / METRICS_NAME, "w") as handle:
+            json.dump(metrics, handle, indent=2)
+        version = store.publish(staging)
+    except BaseException:
+        store.discard(staging)
+        raise
+    return version, metrics
+
+
+def rollout_problems(candidate, current, max_slowdown=MAX_SLOWDOWN,
+                     max_accuracy_drop=MAX_ACCURACY_DROP):
+    """Reasons not to replace the ``current`` version's metrics with ``candidate``'s."""
+    problems = []
+    for engine in ("sklearn", "fast"):
+        old = current["latency"][engine]["single_p50_ms"]
+        new = candidate["latency"][engine]["single_p50_ms"]
+        if new > old * max_slowdown:
+            problems.append(f"{engine} single-profile p50 {new:.2f} ms vs {old:.2f} ms "
+                            f"({new / old:.2f}x, limit {max_slowdown:g}x)")
+    old, new = current["quality"]["accuracy"], candidate["quality"]["accuracy"]
+    if new < old - max_accuracy_drop:
+        problems.append(f"hold-out accuracy {new:.3f} vs {old:.3f} "
+                        f"(limit -{max_accuracy_drop:g})")
+    return problems
+
+
+def promote(version, store=None, force=False):
+    """Makes ``version`` current unless it regresses on the current one; returns problems.
+
+    With ``force`` the problems are returned but the version is promoted anyway.
+    """
+    store = store if store is not None else ModelStore()
+    candidate = store.metrics(version)
+    current = store.current()
+    problems = []
+    if current is not None and current != version:
+        problems = rollout_problems(candidate, store.metrics(current))
+    if not problems or force:
+        store.promote(version)
+    return problems
+
+
+def _describe(version, metrics, current):
+    marker = "*" if version == current else " "
+    quality, latency = metrics["quality"], metrics["latency"]
+    return (f"{marker} {version}  {metrics['created_at']}  rows={metrics['data']['rows']:<7} "
+            f"fit={metrics['fit_seconds']:6.2f}s  acc={quality['accuracy']:.3f}  "
+            f"p50 sklearn={latency['sklearn']['single_p50_ms']:.2f}ms "
+            f"fast={latency['fast']['single_p50_ms']:.3f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the career-path model and roll it out.")
+    parser.add_argument("--store", help="Model store directory (default $GRADGUIDE_MODEL_STORE "
+                                        "or models/)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fit_parser = commands.add_parser("fit", help="Train a new version from a CSV/Parquet file")
+    fit_parser.add_argument("data", help="Profiles plus a target column")
+    fit_parser.add_argument("--target", default=TARGET_COLUMN)
+    fit_parser.add_argument("--n-jobs", type=int, default=-1,
+                            help="Trees fitted in parallel; -1 uses every core")
+    fit_parser.add_argument("--n-estimators", type=int, default=DEFAULT_PARAMS["n_estimators"])
+    fit_parser.add_argument("--test-size", type=float, default=TEST_SIZE)
+    fit_parser.add_argument("--unknown", choices=["error", "fallback"], default="error",
+                            help="Stop on unknown labels, or train on them as the fallback label")
+    fit_parser.add_argument("--promote", action="store_true",
+                            help="Promote the new version if it passes the rollout checks")
+    fit_parser.add_argument("--force", action="store_true", help="Promote despite regressions")
+
+    commands.add_parser("list", help="Show every version and its metrics")
+
+    promote_parser = commands.add_parser("promote", help="Make a version current")
+    promote_parser.add_argument("version")
+    promote_parser.add_argument("--force", action="store_true", help="Promote despite regressions")
+    args = parser.parse_args(argv)
+    store = ModelStore(args.store) if args.store else ModelStore()
+
+    if args.command == "list":
+        current = store.current()
+        for version in store.versions():
+            print(_describe(version, store.metrics(version), current))
+        if current is None:
+            print("No version promoted; serving the shipped career_path_model.pkl")
+        return 0
+
+    try:
+        if args.command == "fit":
+            version, metrics = fit(args.data, store, args.target, args.n_jobs, args.test_size,
+                                   args.unknown, n_estimators=args.n_estimators)
+            print(_describe(version, metrics, None))
+            if not args.promote:
+                return 0
+        else:
+            version = args.version
+        problems = promote(version, store, args.force)
+    except SchemaError as exc:
+        print(f"Cannot train on {args.data}:", file=sys.stderr)
+        for problem in exc.problems:
+            print(f"  {problem}", file=sys.stderr)
+        return 1
+    except VersionError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    current = store.current()
+    if problems and current != version:
+        print(f"{version} regresses on {current}:", file=sys.stderr)
+    for problem in problems:
+        print(f"  {problem}", file=sys.stderr)
+    if current != version:
+        print(f"Not promoting {version}; pass --force to promote it anyway", file=sys.stderr)
+        return 1
+    print(f"{version} is now current")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Static university lists used when no live or local catalogue data is available."""
+from gradguide.countries import resolve_country
+
+UNIVERSITY_DATA = {
+    "USA": [
+        "Massachusetts Institute of Technology", "Stanford University", "Harvard University",
+        "California Institute of Technology", "University of California Berkeley",
+        "Carnegie Mellon University", "Georgia Institute of Technology", "University of Illinois",
+        "University of Michigan", "University of Washington", "Cornell University",
+        "University of Texas at Austin", "Princeton University", "UCLA", "Columbia University"
+    ],
+    "UK": [
+        "University of Cambridge", "University of Oxford", "Imperial College London",
+        "University College London", "King's College London", "University of Edinburgh",
+        "University of Manchester", "London School of Economics", "University of Warwick",
+        "University of Bristol", "University of Glasgow", "Durham University",
+        "University of Sheffield", "University of Nottingham", "University of Southampton"
+    ],
+    "Germany": [
+        "Technical University of Munich", "ETH Zurich", "University of Heidelberg",
+        "Ludwig Maximilian University", "Humboldt University Berlin", "RWTH Aachen University",
+        "University of Freiburg", "University of Göttingen", "Technical University of Berlin",
+        "University of Hamburg", "University of Stuttgart", "Karlsruhe Institute of Technology",
+        "University of Cologne", "University of Münster", "University of Würzburg"
+    ],
+    "India": [
+        "Indian Institute of Technology Delhi", "Indian Institute of Technology Bombay",
+        "Indian Institute of Technology Madras", "Indian Institute of Technology Kanpur",
+        "Indian Institute of Technology Kharagpur", "Indian Institute of Science Bangalore",
+        "National Institute of Technology Trichy", "Delhi Technological University",
+        "Birla Institute of Technology", "Vellore Institute of Technology",
+        "Indian Institute of Technology Roorkee", "BITS Pilani", "Anna University",
+        "Jadavpur University", "Indian Institute of Technology Guwahati"
+    ],
+    "Canada": [
+        "University of Toronto", "University of British Columbia", "McGill University",
+        "University of Alberta", "University of Waterloo", "McMaster University",
+        "University of Montreal", "University of Calgary", "Queen's University",
+        "Simon Fraser University", "University of Ottawa", "Western University",
+        "University of Victoria", "Concordia University", "Carleton University"
+    ],
+    "Australia": [
+        "Australian National University", "University of Melbourne", "University of Sydney",
+        "University of Queensland", "University of New South Wales", "Monash University",
+        "University of Western Australia", "University of Adelaide", "Macquarie University",
+        "Queensland University of Technology", "University of Technology Sydney",
+        "Griffith University", "Deakin University", "Curtin University", "RMIT University"
+    ]
+}
+
+# Country name and ISO code the hipolabs dataset uses for each UNIVERSITY_DATA key
+SEED_COUNTRIES = {
+    "USA": ("United States", "US"),
+    "UK": ("United Kingdom", "GB"),
+    "Germany": ("Germany", "DE"),
+    "India": ("India", "IN"),
+    "Canada": ("Canada", "CA"),
+    "Australia": ("Australia", "AU")
+}
+
+SEED_BY_ISO2 = {iso2: UNIVERSITY_DATA[key] for key, (_, iso2) in SEED_COUNTRIES.items()}
+
+
+def placeholder_web_page(name):
+    """Best-guess homepage used for universities that come without one."""
+    return f"https://{name.lower().replace(' ', '')}.edu"
+
+
+def seed_universities(country_input):
+    """Built-in list for any spelling of a country ("USA", "us", "United States", ...)."""
+    country = resolve_country(country_input)
+    return SEED_BY_ISO2.get(country.iso2, []) if country else []
+
+
+# Record fields the University Explorer displays; everything else is dropped before caching
+UI_FIELDS = ("name", "web_pages", "country", "state-province")
+
+
+def trim_records(records):
+    """Copies of hipolabs-format ``records`` reduced to ``UI_FIELDS`` and one web page."""
+    trimmed = []
+    for record in records:
+        slim = {field: record[field] for field in UI_FIELDS if field in record}
+        if slim.get("web_pages"):
+            slim["web_pages"] = slim["web_pages"][:1]
+        trimmed.append(slim)
+    return trimmed
@@ -0,0 +1,206 @@
+"""Shared HTTP client for the hipolabs university search service.
+
+One ``UniversityClient`` per process replaces the bare ``requests.get`` calls:
+
+* a pooled ``requests.Session`` keeps TCP connections (and DNS results) alive
+  between calls;
+* concurrent identical queries are coalesced onto one in-flight request;
+* responses are kept for ``stale_ttl`` seconds and served stale-while-
+  revalidate once older than ``fresh_ttl``;
+* a circuit breaker stops calling the service after repeated failures, so
+  callers fall back to cached data immediately instead of waiting out the
+  timeout on every request;
+* with ``trim`` set, response bodies are reduced (e.g. to the fields the UI
+  shows) before they are kept.
+
+All failures surface as ``requests.RequestException`` subclasses, so existing
+``except requests.exceptions.RequestException`` fallbacks keep working.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from gradguide import telemetry
+from gradguide.cache import LRUCache
+
+HIPOLABS_URL = os.environ.get("GRADGUIDE_UNIVERSITY_API", "http://universities.hipolabs.com")
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling the service while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open every call is refused until ``reset_timeout`` has passed; then
+    a single trial call is let through (half-open) and its outcome either
+    closes the breaker or opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self):
+        """True if a call may go through right now."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class UniversityClient:
+    """Pooled, coalescing, circuit-broken client for ``/search`` on hipolabs."""
+
+    def __init__(self, base_url=HIPOLABS_URL, timeout=DEFAULT_TIMEOUT, pool_size=16,
+                 failure_threshold=3, reset_timeout=30.0, fresh_ttl=3600, stale_ttl=86400,
+                 max_entries=2048, trim=None, clock=time.monotonic):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.trim = trim
+        self.fresh_ttl = fresh_ttl
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock)
+        self._clock = clock
+        self._responses = LRUCache(maxsize=max_entries, ttl=stale_ttl, clock=clock)
+        self._in_flight = {}
+        # Guards _in_flight and the counters below, which every caller thread updates
+        self._lock = threading.Lock()
+        self._revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="revalidate")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.stale_served = 0
+        self.short_circuited = 0
+
+    def search(self, **params):
+        """JSON list from ``/search`` for e.g. ``country=...`` or ``name=...``."""
+        key = tuple(sorted(params.items()))
+        cached = self._responses.get(key)
+        if cached is not None:
+            data, fetched_at = cached
+            if self._clock() - fetched_at < self.fresh_ttl:
+                return data
+            # Stale: answer now, refresh behind the caller's back
+            with self._lock:
+                self.stale_served += 1
+            if key not in self._in_flight and self.breaker.state != CircuitBreaker.OPEN:
+                self._revalidator.submit(self._fetch_quietly, key)
+            return data
+        return self._fetch(key)
+
+    def _fetch_quietly(self, key):
+        try:
+            self._fetch(key)
+        except requests.exceptions.RequestException:
+            pass
+
+    def _fetch(self, key):
+        """Fetches ``key``, joining an identical request already in flight."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            data = self._call(dict(key))
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _call(self, params):
+        if not self.breaker.allow():
+            with self._lock:
+                self.short_circuited += 1
+            raise CircuitOpenError(f"{self.base_url} is failing; circuit open")
+        with self._lock:
+            self.upstream_calls += 1
+        try:
+            with telemetry.span("upstream_request"):
+                response = self.session.get(f"{self.base_url}/search", params=params,
+                                            timeout=self.timeout)
+                response.raise_for_status()
+                data = response.json()
+        except requests.exceptions.RequestException as exc:
+            self.breaker.record_failure()
+            telemetry.increment("upstream_errors", error=type(exc).__name__)
+            raise
+        self.breaker.record_success()
+        if self.trim is not None:
+            data = self.trim(data)
+        self._responses.set(tuple(sorted(params.items())), (data, self._clock()))
+        return data
+
+    def stats(self):
+        with self._lock:
+            counters = {
+                "upstream_calls": self.upstream_calls,
+                "coalesced": self.coalesced,
+                "stale_served": self.stale_served,
+                "short_circuited": self.short_circuited,
+            }
+        return {"breaker": self.breaker.state, **counters, "responses": self._responses.stats()}
+
+    def close(self):
+        self._revalidator.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,134 @@
+"""Versioned model store with an atomically switched current version.
+
+``gradguide.train`` publishes every fitted model as a numbered version::
+
+    models/
+      CURRENT              # name of the version being served, e.g. "v0003"
+      v0003/
+        model.pkl          # the sklearn Pipeline
+        model.mmap/        # its fast-path artifact (gradguide.artifact)
+        metrics.json       # data, quality, fit time and inference latency
+
+A version directory is written under a temporary name and renamed into
+place, and ``CURRENT`` is replaced with ``os.replace``, so readers only ever
+see complete versions and one pointer value.  Running processes notice a new
+``CURRENT`` through ``Predictor.refresh`` and swap models between requests.
+
+Until a version is promoted the store is empty and the app keeps serving
+the ``career_path_model.pkl`` shipped with the repository.
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from gradguide.artifact import ARTIFACT_DIR
+from gradguide.model import MODEL_PATH
+
+MODEL_STORE = Path(os.environ.get("GRADGUIDE_MODEL_STORE", MODEL_PATH.parent / "models"))
+CURRENT_NAME = "CURRENT"
+MODEL_NAME = "model.pkl"
+ARTIFACT_NAME = "model.mmap"
+METRICS_NAME = "metrics.json"
+LOCK_NAME = ".lock"
+
+_VERSION = re.compile(r"^v(\d{4,})$")
+
+
+class VersionError(RuntimeError):
+    """Raised for an unknown or incomplete model version."""
+
+
+class ModelStore:
+    """Numbered model versions under ``root`` and the pointer to the current one."""
+
+    def __init__(self, root=MODEL_STORE):
+        self.root = Path(root)
+
+    def versions(self):
+        """Complete versions, oldest first."""
+        if not self.root.is_dir():
+            return []
+        found = [(int(match.group(1)), path.name) for path in self.root.iterdir()
+                 if (match := _VERSION.match(path.name)) and (path / METRICS_NAME).exists()]
+        return [name for _, name in sorted(found)]
+
+    def current(self):
+        """Name of the version being served, or None while none is promoted."""
+        try:
+            return (self.root / CURRENT_NAME).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def path(self, version):
+        path = self.root / version
+        if not _VERSION.match(version) or not (path / METRICS_NAME).exists():
+            raise VersionError(f"No model version {version!r} in {self.root}")
+        return path
+
+    def model_path(self, version):
+        return self.path(version) / MODEL_NAME
+
+    def artifact_dir(self, version):
+        return self.path(version) / ARTIFACT_NAME
+
+    def paths(self, version=None):
+        """``(model pickle, artifact dir)`` of ``version``, by default the current one.
+
+        While no version is promoted these are the shipped pickle and its artifact.
+        """
+        version = version or self.current()
+        if version is None:
+            return MODEL_PATH, ARTIFACT_DIR
+        return self.model_path(version), self.artifact_dir(version)
+
+    def metrics(self, version):
+        with open(self.path(version) / METRICS_NAME) as handle:
+            return json.load(handle)
+
+    def staging(self):
+        """Empty directory to build a version in before ``publish``."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(prefix=".staging-", dir=self.root))
+
+    @contextmanager
+    def _lock(self):
+        """Held while a publisher picks and takes a version number."""
+        import fcntl
+
+        with open(self.root / LOCK_NAME, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def publish(self, staging):
+        """Renames a complete staging directory to the next free version; returns its name.
+
+        The number is one past every version-named entry, complete or not:
+        ``os.rename`` silently replaces an empty directory, such as one left
+        behind by a crashed run, and must never land on an existing version.
+        """
+        if not (Path(staging) / METRICS_NAME).exists():
+            raise VersionError(f"{staging} has no {METRICS_NAME}; refusing to publish")
+        with self._lock():
+            taken = [int(match.group(1)) for path in self.root.iterdir()
+                     if (match := _VERSION.match(path.name))]
+            version = f"v{max(taken, default=0) + 1:04d}"
+            os.rename(staging, self.root / version)
+        return version
+
+    def promote(self, version):
+        """Atomically points ``CURRENT`` at ``version``."""
+        self.path(version)
+        fd, staging = tempfile.mkstemp(prefix=f".{CURRENT_NAME}.", dir=self.root)
+        with os.fdopen(fd, "w") as handle:
+            handle.write(version + "\n")
+        os.replace(staging, self.root / CURRENT_NAME)
+
+    def discard(self, staging):
+        shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1 @@
+"""Helpers shared by the tests and the benchmarks that reuse them."""
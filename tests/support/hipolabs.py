@@ -0,0 +1,80 @@
+"""Local stand-in for universities.hipolabs.com with injectable latency and failures.
+
+Serves ``GET /search?country=...&name=...`` from a list of hipolabs-format
+records, so the HTTP client is tested (and benchmarked, see
+``benchmarks/stub_hipolabs.py`` for a command-line server) fully offline.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubHipolabs:
+    """Threaded stub server; use as a context manager to run it in the background."""
+
+    def __init__(self, records, host="127.0.0.1", port=0, latency=0.0, failure_rate=0.0,
+                 seed=0):
+        self.records = records
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    fail = stub._random.random() < stub.failure_rate
+                if stub.latency:
+                    time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                if parsed.path != "/search" or fail:
+                    self.send_error(404 if not fail else 503)
+                    return
+                query = {k: v[0].lower() for k, v in parse_qs(parsed.query).items()}
+                results = [
+                    rec for rec in stub.records
+                    if ("country" not in query or rec["country"].lower() == query["country"])
+                    and ("name" not in query or query["name"] in rec["name"].lower())
+                ]
+                body = json.dumps(results).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
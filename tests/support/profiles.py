@@ -0,0 +1,27 @@
+"""Student profiles for the model tests, scored against the shipped pickle."""
+import numpy as np
+import pandas as pd
+
+# One valid Career Prediction form submission
+PROFILE = {"cgpa": 8.2, "gre": 315, "toefl": 105, "gate_score": 0, "sop": 4, "lor": 4,
+           "univ_rating": 3, "chance": 0.7, "research": "Yes", "career_goal": "Industry",
+           "budget": 60, "pref_country": "USA"}
+
+
+def synthetic_profiles(n, seed=0):
+    """Random profiles in the form's value ranges, using only labels the model knows."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "CGPA": rng.uniform(5.0, 10.0, n).round(1),
+        "GRE Score": rng.integers(0, 341, n),
+        "TOEFL Score": rng.integers(0, 121, n),
+        "GATE Score": rng.integers(0, 1001, n),
+        "SOP": rng.integers(1, 6, n),
+        "LOR": rng.integers(1, 6, n),
+        "University Rating": rng.integers(1, 6, n),
+        "Chance of Admit": rng.uniform(0.0, 1.0, n).round(2),
+        "Research": rng.choice(["Yes", "No"], n),
+        "Budget (INR Lakhs)": rng.integers(1, 201, n),
+        "Career Goal": rng.choice(["Industry", "Academia", "Research"], n),
+        "Preferred Country": rng.choice(["India", "USA", "UK", "Germany", "Other"], n),
+    })
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from gradguide.artifact import (ARRAY_FIELDS, CURRENT_NAME, ArtifactError, current_export,
+                                export_artifact, is_current, load_artifact, open_engine)
+from gradguide.fastpath import compile_pipeline
+from gradguide.model import MODEL_PATH, load_model
+from gradguide.schema import FeatureSchema
+from tests.support.profiles import synthetic_profiles
+
+
+@pytest.fixture
+def artifact_dir(tmp_path):
+    return tmp_path / "career_path_model.mmap"
+
+
+def test_mapped_engine_scores_like_the_compiled_pipeline(artifact_dir):
+    export_artifact(MODEL_PATH, artifact_dir)
+    engine = load_artifact(artifact_dir)
+    assert isinstance(engine.threshold, np.memmap)
+
+    model = load_model()
+    matrix = FeatureSchema.from_model(model).encode_frame(synthetic_profiles(500)).matrix
+    np.testing.assert_array_equal(engine.predict_proba(matrix),
+                                  compile_pipeline(model).predict_proba(matrix))
+
+
+def test_current_points_at_a_complete_export(artifact_dir):
+    assert not is_current(artifact_dir, MODEL_PATH)
+    manifest = export_artifact(MODEL_PATH, artifact_dir)
+    export = current_export(artifact_dir)
+    assert (artifact_dir / CURRENT_NAME).read_text().strip() == export.name
+    assert sorted(path.stem for path in export.glob("*.npy")) == sorted(ARRAY_FIELDS)
+    assert is_current(artifact_dir, MODEL_PATH)
+    assert manifest["source"] == MODEL_PATH.name
+
+
+def test_reexport_switches_current_and_keeps_the_old_export(artifact_dir):
+    export_artifact(MODEL_PATH, artifact_dir)
+    first = current_export(artifact_dir)
+    (artifact_dir / CURRENT_NAME).unlink()
+    export_artifact(MODEL_PATH, artifact_dir)
+    # Still within the grace period for readers that resolved the old pointer
+    assert current_export(artifact_dir) != first and first.exists()
+
+
+def test_corrupted_array_fails_the_checksum(artifact_dir):
+    export_artifact(MODEL_PATH, artifact_dir)
+    path = current_export(artifact_dir) / "threshold.npy"
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ArtifactError, match="Checksum mismatch"):
+        load_artifact(artifact_dir)
+    # Batch workers load unverified, once the parent has checked the export
+    load_artifact(artifact_dir, verify=False)
+
+
+def test_missing_artifact_is_an_artifact_error(artifact_dir):
+    with pytest.raises(ArtifactError, match="No model artifact"):
+        load_artifact(artifact_dir)
+
+
+def test_open_engine_exports_only_once(artifact_dir):
+    _, report = open_engine(MODEL_PATH, artifact_dir, warm=False)
+    assert report["exported"]
+    _, report = open_engine(MODEL_PATH, artifact_dir, warm=False)
+    assert not report["exported"]
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from gradguide.batch import PROBABILITY_COLUMN, score_file, score_file_parallel
+from gradguide.schema import SchemaError
+from tests.support.profiles import synthetic_profiles
+
+
+@pytest.fixture
+def students(tmp_path):
+    path = tmp_path / "students.csv"
+    profiles = synthetic_profiles(2500)
+    profiles.insert(0, "Student ID", range(len(profiles)))
+    profiles.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("engine", ["fast", "sklearn"])
+def test_parallel_output_matches_serial_in_order(tmp_path, students, engine):
+    score_file(students, tmp_path / "serial.csv", chunksize=300)
+    rows, per_worker = score_file_parallel(
+        students, tmp_path / "parallel.csv", workers=2, chunksize=300,
+        artifact_dir=tmp_path / "model.mmap", engine=engine)
+
+    assert rows == 2500 and sum(stats["rows"] for stats in per_worker.values()) == 2500
+    serial = pd.read_csv(tmp_path / "serial.csv")
+    parallel = pd.read_csv(tmp_path / "parallel.csv")
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert parallel["Student ID"].tolist() == list(range(2500))
+    assert parallel[PROBABILITY_COLUMN].between(0, 1).all()
+
+
+def test_parallel_problems_name_input_rows(tmp_path, students):
+    frame = pd.read_csv(students)
+    frame.loc[1234, "Preferred Country"] = "Mars"
+    frame.to_csv(students, index=False)
+    with pytest.raises(SchemaError, match="'Mars' in row 1235;"):
+        score_file_parallel(students, tmp_path / "parallel.csv", workers=2, chunksize=300,
+                            artifact_dir=tmp_path / "model.mmap")
@@ -0,0 +1,39 @@
+from gradguide.cache import DiskCache, LRUCache, TieredCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def tiered(tmp_path, clock):
+    return TieredCache(LRUCache(clock=clock), DiskCache(tmp_path / "cache.sqlite", clock=clock))
+
+
+def test_disk_hit_is_promoted_for_its_remaining_lifetime(tmp_path):
+    clock = FakeClock()
+    writer, reader = tiered(tmp_path, clock), tiered(tmp_path, clock)
+    writer.set("key", [1, 2], ttl=60)
+
+    clock.now += 45
+    assert reader.get("key") == [1, 2]
+    assert reader.memory.get("key") == [1, 2]
+    clock.now += 15
+    assert reader.memory.get("key") is None
+
+
+def test_disk_entry_and_lifetime_are_read_together(tmp_path):
+    clock = FakeClock()
+    disk = DiskCache(tmp_path / "cache.sqlite", clock=clock)
+    disk.set("short", "value", ttl=30)
+    disk.set("forever", "value")
+
+    assert disk.get_entry("short") == ("value", 30)
+    assert disk.get_entry("forever") == ("value", None)
+    assert disk.get_entry("missing", ("default", None)) == ("default", None)
+    clock.now += 30
+    assert disk.get_entry("short") is None
+    assert disk.stats()["expirations"] == 1
@@ -0,0 +1,160 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from gradguide import catalogue as catalogue_module
+from gradguide.catalogue import (BackgroundRefresher, UniversityCatalogue, build_catalogue,
+                                 ingest, open_catalogue)
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "universities.json"
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "universities.sqlite"
+
+
+@pytest.fixture
+def catalogue(db):
+    ingest(FIXTURE, db)
+    return UniversityCatalogue(db)
+
+
+def names(records):
+    return [record["name"] for record in records]
+
+
+def test_ingest_stores_every_record(catalogue):
+    meta = catalogue.meta()
+    assert meta["count"] == 8
+    assert meta["source"] == str(FIXTURE)
+    assert not catalogue.is_seed()
+    assert len(catalogue.records()) == 8
+
+
+@pytest.mark.parametrize("country", ["United States", "USA", "us", " united states "])
+def test_by_country_resolves_names_aliases_and_codes(catalogue, country):
+    assert names(catalogue.by_country(country)) == [
+        "Massachusetts Institute of Technology", "Stanford University",
+        "University of Texas at Austin"]
+
+
+def test_by_country_returns_api_format_records(catalogue):
+    (record,) = catalogue.by_country("Canada")
+    assert record == {
+        "name": "University of Toronto",
+        "web_pages": ["https://www.utoronto.ca/"],
+        "country": "Canada",
+        "state-province": "Ontario",
+        "alpha_two_code": "CA",
+        "domains": ["utoronto.ca"],
+    }
+
+
+def test_by_country_limit_and_unknown_country(catalogue):
+    assert len(catalogue.by_country("Germany", limit=1)) == 1
+    assert catalogue.by_country("Atlantis") == []
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("stanford", "Stanford University"),
+    ("stanfrod", "Stanford University"),
+    ("munchen", "Technische Universität München"),
+    ("indian institute of science", "Indian Institute of Science"),
+])
+def test_search_name_finds_partial_and_misspelled_names(catalogue, query, expected):
+    assert names(catalogue.search_name(query))[0] == expected
+
+
+def test_search_name_respects_limit(catalogue):
+    assert len(catalogue.search_name("university", limit=2)) == 2
+
+
+def test_rebuild_swaps_in_new_rows_for_open_readers(catalogue, db):
+    assert catalogue.meta()["count"] == 8
+    catalogue.search_name("stanford")  # builds the in-memory index
+
+    records = json.loads(FIXTURE.read_text())[:2]
+    build_catalogue(records, db, source="smaller")
+
+    # The reader reopens its connection and rebuilds its index for the new file
+    assert catalogue.meta()["source"] == "smaller"
+    assert names(catalogue.by_country("United States")) == [
+        "Massachusetts Institute of Technology", "Stanford University"]
+    assert names(catalogue.search_name("toronto")) == []
+    assert [path.name for path in db.parent.iterdir()] == [db.name]
+
+
+def test_failed_rebuild_leaves_live_catalogue_untouched(catalogue, db):
+    def broken_records():
+        yield {"name": "Half Written University", "country": "India"}
+        raise RuntimeError("dump ended early")
+
+    with pytest.raises(RuntimeError):
+        build_catalogue(broken_records(), db, source="broken")
+    assert catalogue.meta()["source"] == str(FIXTURE)
+    assert catalogue.meta()["count"] == 8
+    assert [path.name for path in db.parent.iterdir()] == [db.name]
+
+
+def test_readers_see_a_complete_file_during_rebuild(catalogue, db):
+    # A connection opened on the old file keeps reading it after the swap
+    old = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+    build_catalogue([], db, source="empty")
+    assert old.execute("SELECT COUNT(*) FROM universities").fetchone()[0] == 8
+    old.close()
+    assert catalogue.meta()["count"] == 0
+
+
+def test_open_catalogue_seeds_a_missing_file(db):
+    seeded = open_catalogue(db)
+    assert seeded.is_seed()
+    assert seeded.meta()["count"] > 0
+
+
+def test_refresher_keeps_retrying_while_only_the_seed_is_loaded(db, monkeypatch):
+    seeded = open_catalogue(db)
+    refresher = BackgroundRefresher(seeded, source=str(db.parent / "missing.json"),
+                                    interval=3600)
+
+    # A failed download keeps the seed and is retried on the next check
+    assert refresher.refresh_if_stale() is False
+    assert refresher.refresh_if_stale() is False
+    assert seeded.is_seed()
+
+    refresher.source = str(FIXTURE)
+    assert refresher.refresh_if_stale() is True
+    assert not seeded.is_seed()
+    assert seeded.meta()["count"] == 8
+
+    # Once a dump is loaded, nothing is fetched until it is older than the interval
+    calls = []
+    monkeypatch.setattr(catalogue_module, "ingest", lambda *args: calls.append(args))
+    assert refresher.refresh_if_stale() is False
+    assert calls == []
+
+
+def test_lookup_labels_built_in_rankings_for_countries_missing_from_the_catalogue(
+        catalogue, tmp_path, monkeypatch):
+    monkeypatch.setenv("GRADGUIDE_CACHE_DIR", str(tmp_path / "cache"))
+    from gradguide.core import UniversityLookup
+
+    lookup = UniversityLookup(catalogue)
+    records, source = lookup.top_universities("Canada")
+    assert (names(records), source) == (["University of Toronto"], "local")
+
+    # The fixture has no Australian universities; the built-in list is not "local"
+    records, source = lookup.top_universities("Australia")
+    assert records and source == "cached"
+    assert records == lookup.seed_records("Australia")
+
+
+def test_lookup_searches_the_built_in_lists_by_name(db, tmp_path, monkeypatch):
+    monkeypatch.setenv("GRADGUIDE_CACHE_DIR", str(tmp_path / "cache"))
+    from gradguide.core import UniversityLookup
+
+    lookup = UniversityLookup(open_catalogue(db))
+    assert names(lookup.search_seed("stanfrod"))[0] == "Stanford University"
+    assert lookup.seed_records("India")
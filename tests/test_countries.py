@@ -0,0 +1,28 @@
+import pytest
+
+from gradguide.countries import CountryResolver
+
+
+@pytest.fixture
+def resolver():
+    return CountryResolver()
+
+
+@pytest.mark.parametrize("text", ["India", "IND", "in", "Bharat", " india. "])
+def test_resolve_exact_spellings(resolver, text):
+    assert resolver.resolve(text).name == "India"
+
+
+def test_resolve_memoises_misspellings_and_misses(resolver):
+    assert resolver.resolve("Untied States").name == "United States"
+    assert resolver.resolve("Atlantis") is None
+    assert resolver.resolve("untied  states") is resolver.resolve("Untied States")
+    assert resolver.resolve("ATLANTIS") is None
+    info = resolver._resolve_key.cache_info()
+    assert (info.hits, info.misses) == (3, 2)
+
+
+def test_add_alias_drops_memoised_misses(resolver):
+    assert resolver.resolve("Narnia") is None
+    resolver.add_alias("Narnia", resolver.lookup("India"))
+    assert resolver.resolve("Narnia").name == "India"
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from gradguide.explain import Explainer, top_reasons
+from gradguide.model import load_model
+from gradguide.schema import FeatureSchema
+from tests.support.profiles import synthetic_profiles
+
+
+@pytest.fixture(scope="module")
+def model():
+    return load_model()
+
+
+@pytest.fixture(scope="module")
+def explainer(model):
+    return Explainer.from_model(model)
+
+
+def test_contributions_add_up_to_the_probability(model, explainer):
+    schema = FeatureSchema.from_model(model)
+    matrix = schema.encode_frame(synthetic_profiles(2000)).matrix
+    explanation = explainer.explain(matrix)
+
+    positive = list(model.classes_).index(1)
+    expected = model.predict_proba(schema.model_input(model, matrix))[:, positive]
+    np.testing.assert_array_equal(explanation.probabilities[:, positive], expected)
+    np.testing.assert_allclose(explanation.baseline + explanation.contributions.sum(axis=1),
+                               expected, rtol=0, atol=1e-12)
+
+
+def test_importances_cover_every_feature_and_sum_to_one(explainer):
+    importances = explainer.importances()
+    assert list(importances) == explainer.feature_names
+    assert sum(importances.values()) == pytest.approx(1.0)
+
+
+def test_top_reasons_put_the_largest_effect_first(explainer):
+    explanation = explainer.explain(np.zeros((1, len(explainer.feature_names))))
+    reasons = top_reasons(explanation, explainer.feature_names, limit=3)
+    effects = [abs(contribution) for _, contribution in reasons]
+    assert len(reasons) == 3 and effects == sorted(effects, reverse=True)
+    assert effects[0] == np.abs(explanation.contributions[0]).max()
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from gradguide.fastpath import compile_pipeline
+from gradguide.model import load_model
+from gradguide.schema import FeatureSchema
+from tests.support.profiles import synthetic_profiles
+
+
+@pytest.fixture(scope="module")
+def model():
+    return load_model()
+
+
+@pytest.fixture(scope="module")
+def matrix(model):
+    # More rows than one traversal block, so block boundaries are covered too
+    return FeatureSchema.from_model(model).encode_frame(synthetic_profiles(3000)).matrix
+
+
+def test_compiled_probabilities_are_bit_identical(model, matrix):
+    schema = FeatureSchema.from_model(model)
+    expected = model.predict_proba(schema.model_input(model, matrix))
+    engine = compile_pipeline(model)
+    np.testing.assert_array_equal(engine.predict_proba(matrix), expected)
+    np.testing.assert_array_equal(engine.predict(matrix),
+                                  model.predict(schema.model_input(model, matrix)))
+
+
+def test_empty_input_gives_no_rows(model):
+    proba = compile_pipeline(model).predict_proba(np.empty((0, 12)))
+    assert proba.shape == (0, len(model.classes_))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from gradguide.finance import (COMPONENTS, Assumptions, cost_breakdown, monthly_payment,
+                               repayment_schedule, simulate, summarize)
+
+PLAN = dict(tuition=40.0, living=15.0, misc=5.0, scholarship=20.0, family_support=10.0,
+            part_time=4.0)
+CERTAIN = Assumptions(0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def test_same_seed_same_scenarios():
+    first, second = simulate(**PLAN, n=10_000, seed=7), simulate(**PLAN, n=10_000, seed=7)
+    np.testing.assert_array_equal(first.components, second.components)
+    assert not np.array_equal(first.net_cost, simulate(**PLAN, n=10_000, seed=8).net_cost)
+
+
+def test_without_uncertainty_every_scenario_is_the_plan():
+    scenarios = simulate(**PLAN, n=1000, assumptions=CERTAIN)
+    plan = cost_breakdown(**PLAN)
+    np.testing.assert_allclose(scenarios.components, np.tile(plan["steps"], (1000, 1)),
+                               rtol=1e-6)
+    np.testing.assert_allclose(scenarios.net_cost, plan["net_cost"], rtol=1e-6)
+
+
+def test_draws_keep_the_entered_means():
+    scenarios = simulate(**PLAN, n=200_000, seed=1)
+    means = dict(zip(COMPONENTS, scenarios.components.mean(axis=0)))
+    # Log-normal draws are centred on the mean, not the median; FX has mean 1
+    assert means["Tuition"] == pytest.approx(PLAN["tuition"], rel=0.01)
+    assert means["Living"] == pytest.approx(PLAN["living"], rel=0.01)
+    assert means["part-time"] == pytest.approx(-PLAN["part_time"], rel=0.02)
+    assert means["Family Support"] == -PLAN["family_support"]
+    # The scholarship never pays more than the simulated tuition
+    assert (-scenarios.components[:, 3] <= scenarios.components[:, 0] + 1e-4).all()
+
+
+def test_summary_statistics_are_consistent():
+    scenarios = simulate(**PLAN, n=50_000, seed=2)
+    summary = summarize(scenarios)
+    assert summary["scenarios"] == 50_000
+    assert (np.diff(summary["loan"]) >= 0).all() and (summary["loan"] >= 0).all()
+    assert summary["shortfall_probability"] == np.mean(scenarios.net_cost > 0)
+    assert summary["running"].shape == (len(summary["percentiles"]), len(COMPONENTS))
+
+
+def test_repayment_schedule_pays_off_the_loan():
+    schedule = repayment_schedule(20.0, 9.5, 10)
+    assert len(schedule) == 120
+    assert schedule["Principal"].sum() == pytest.approx(20.0)
+    assert schedule["Balance"].iloc[-1] == pytest.approx(0.0, abs=1e-9)
+    assert monthly_payment(12.0, [0.0], [1])[0, 0] == pytest.approx(1.0)
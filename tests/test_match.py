@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradguide.match import UniversityMatcher, profile_strength, top_k
+from gradguide.rankings import ranking_table
+from tests.support.profiles import synthetic_profiles
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    names = [f"University {i}" for i in range(3000)]
+    countries = np.where(np.arange(3000) % 4 == 0, "India", "USA")
+    return UniversityMatcher(ranking_table(names, countries))
+
+
+@pytest.mark.parametrize("k", [1, 10, 499, 500, 800])
+def test_top_k_matches_a_full_sort(k):
+    scores = np.random.default_rng(k).random((20, 500))
+    expected = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    np.testing.assert_array_equal(top_k(scores, k), expected)
+
+
+def test_best_returns_the_highest_affordable_scores(matcher):
+    profiles = synthetic_profiles(50)
+    indices, scores = matcher.best(profiles, k=10)
+
+    full = matcher.scores(profile_strength(profiles), profiles["Budget (INR Lakhs)"])
+    np.testing.assert_array_equal(scores, -np.sort(-full, axis=1)[:, :10])
+    found = indices >= 0
+    picked = np.take_along_axis(full, np.where(found, indices, 0), axis=1)
+    np.testing.assert_array_equal(picked[found], scores[found])
+
+
+def test_nothing_over_budget_is_recommended(matcher):
+    rows = matcher.match(cgpa=9.0, gre=320, toefl=110, gate_score=0, research="Yes", budget=12)
+    assert len(rows) and (rows["Avg Fee (Lakhs)"] <= 12).all()
+    assert list(rows["Match Score"]) == sorted(rows["Match Score"], reverse=True)
+
+
+def test_short_lists_are_padded(matcher):
+    profiles = pd.DataFrame({"cgpa": [8.0], "gre": [300], "toefl": [100], "gate_score": [0],
+                             "research": ["No"], "budget": [5]})
+    indices, scores = matcher.best(profiles, k=3000)
+    affordable = (matcher.fees <= 5).sum()
+    assert (indices[0] >= 0).sum() == affordable
+    assert np.isneginf(scores[0, affordable:]).all()
+    assert len(matcher.match_many(profiles, k=3000)) == affordable
+
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gradguide.rankings import (ACCEPTANCE_RANGE, FEE_RANGE, QS_RANKING_RANGE, STRENGTH_LEVELS,
+                                format_rankings, query_rankings, ranking_table)
+
+NAMES = ["Stanford University", "University of Oxford", "IIT Bombay", "ETH Zurich"]
+COUNTRIES = ["USA", "UK", "India", "Switzerland"]
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_same_name_gets_the_same_figures():
+    table = ranking_table(NAMES, COUNTRIES)
+    pd.testing.assert_frame_equal(table, ranking_table(NAMES, COUNTRIES))
+    # Seeded by the name alone (case and spacing aside), not by position in the list
+    single = ranking_table(["  stanford   UNIVERSITY"], "USA")
+    assert single.iloc[0, 1:].tolist() == table.iloc[0, 1:].tolist()
+
+
+def test_another_process_gets_the_same_figures():
+    script = ("import json, sys; from gradguide.rankings import ranking_table; "
+              "table = ranking_table(json.loads(sys.argv[1]), json.loads(sys.argv[2])); "
+              "print(table.to_json(orient='records'))")
+    # A different str hash seed too: the figures must not depend on hash()
+    env = {**os.environ, "PYTHONHASHSEED": "12345"}
+    output = subprocess.run(
+        [sys.executable, "-c", script, json.dumps(NAMES), json.dumps(COUNTRIES)],
+        capture_output=True, text=True, check=True, cwd=REPO_ROOT, env=env,
+    ).stdout
+    assert output.strip() == ranking_table(NAMES, COUNTRIES).to_json(orient="records")
+
+
+def test_placeholders_stay_in_their_ranges():
+    table = ranking_table([f"University {i}" for i in range(5000)], "USA")
+    assert table["QS Ranking"].between(QS_RANKING_RANGE[0], QS_RANKING_RANGE[1] - 1).all()
+    assert table["Acceptance Rate"].between(ACCEPTANCE_RANGE[0], ACCEPTANCE_RANGE[1] - 1).all()
+    assert table["Avg Fee (Lakhs)"].between(FEE_RANGE[0], FEE_RANGE[1] - 1).all()
+    assert set(table["Program Strength"]) == set(STRENGTH_LEVELS)
+
+
+def test_csv_metrics_win_where_present():
+    metrics = pd.DataFrame({"QS Ranking": [3, np.nan]},
+                           index=["stanford university", "eth zurich"])
+    table = ranking_table(NAMES, COUNTRIES, metrics)
+    placeholder = ranking_table(NAMES, COUNTRIES)
+    assert table["QS Ranking"].tolist() == [3] + placeholder["QS Ranking"].tolist()[1:]
+
+
+def test_query_filters_and_sorts():
+    table = ranking_table([f"University {i}" for i in range(1000)], "USA")
+    result = query_rankings(table, max_fee=50, sort_by="QS Ranking", limit=20)
+    assert len(result) == 20 and (result["Avg Fee (Lakhs)"] <= 50).all()
+    assert result["QS Ranking"].is_monotonic_increasing
+    assert format_rankings(result)["Acceptance Rate"].str.endswith("%").all()
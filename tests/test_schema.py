@@ -0,0 +1,96 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from gradguide.model import load_model
+from gradguide.schema import FeatureSchema, SchemaError
+from tests.support.profiles import PROFILE, synthetic_profiles
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return FeatureSchema.from_model(load_model())
+
+
+def problems(schema, unknown="error", **fields):
+    with pytest.raises(SchemaError) as exc_info:
+        schema.encode_profile({**PROFILE, **fields}, unknown=unknown)
+    return exc_info.value.problems
+
+
+def test_columns_follow_the_fitted_model(schema):
+    encoded = schema.encode_profile(PROFILE)
+    row = dict(zip(schema.feature_names, encoded.matrix[0]))
+    assert schema.feature_names[:3] == ["GRE Score", "TOEFL Score", "University Rating"]
+    assert row["CGPA"] == 8.2 and row["Research"] == 1 and row["Preferred Country"] == 0
+    assert encoded.remapped == {}
+
+
+def test_unknown_labels_are_rejected_by_default(schema):
+    assert problems(schema, pref_country="Canada", career_goal="Entrepreneurship") == [
+        "Career Goal: unknown 'Entrepreneurship'; expected one of Academia, Industry, Research",
+        "Preferred Country: unknown 'Canada'; expected one of USA, UK, Germany, India, Other",
+    ]
+
+
+def test_unknown_labels_fall_back_only_when_asked(schema):
+    encoded = schema.encode_profile({**PROFILE, "pref_country": "Canada"}, unknown="fallback")
+    column = schema.feature_names.index("Preferred Country")
+    assert encoded.matrix[0, column] == 4  # "Other"
+    assert encoded.remapped == {"Preferred Country": ["Canada"]}
+
+
+def test_missing_values_are_reported_not_scored(schema):
+    assert problems(schema, cgpa=float("nan"), research=None) == [
+        "CGPA: missing value", "Research: missing value"]
+    without_gre = {name: value for name, value in PROFILE.items() if name != "gre"}
+    with pytest.raises(SchemaError, match="Missing fields: GRE Score"):
+        schema.encode_profile(without_gre)
+
+
+def test_non_numbers_and_infinities_are_rejected(schema):
+    assert problems(schema, gre="abc", toefl=float("inf")) == [
+        "GRE Score: not a number ('abc')", "TOEFL Score: not a finite number"]
+
+
+def test_non_scalar_fields_are_named(schema):
+    assert problems(schema, sop=[4], lor={"a": 1}, research=True) == [
+        "SOP: expected a single value, got list",
+        "LOR: expected a single value, got dict",
+        "Research: expected a number or label, got a boolean",
+    ]
+
+
+def test_numbers_outside_the_form_ranges_are_rejected(schema):
+    assert problems(schema, cgpa=11, budget=-1) == [
+        "CGPA: expected between 0 and 10, got 11",
+        "Budget (INR Lakhs): expected at least 0, got -1",
+    ]
+
+
+def test_unexpected_fields_are_rejected(schema):
+    assert problems(schema, extra=1) == ["Unexpected fields: extra"]
+
+
+def test_frame_problems_name_their_rows(schema):
+    frame = synthetic_profiles(10)
+    frame.loc[3, "CGPA"] = np.nan
+    frame.loc[7, "Preferred Country"] = "Mars"
+    with pytest.raises(SchemaError) as exc_info:
+        schema.encode_frame(frame, first_row=2)
+    assert exc_info.value.problems == [
+        "CGPA: missing value in row 5",
+        "Preferred Country: unknown 'Mars' in row 9; expected one of USA, UK, Germany, India, Other",
+    ]
+
+
+def test_cache_keys_round_to_the_form_steps(schema):
+    near = schema.encode_profile({**PROFILE, "cgpa": 8.24, "chance": 0.704, "gre": 315.4})
+    assert schema.key(near.matrix[0]) == schema.key(schema.encode_profile(PROFILE).matrix[0])
+
+
+def test_problems_survive_pickling():
+    # Batch workers send SchemaError back to the parent process
+    problems = ["CGPA: missing value", "Research: missing value"]
+    assert pickle.loads(pickle.dumps(SchemaError(problems))).problems == problems
@@ -0,0 +1,68 @@
+import pytest
+import requests
+
+from gradguide.core import Predictor
+from gradguide.serve import PredictionService
+from gradguide.versions import ModelStore
+from tests.support.profiles import PROFILE
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    # An empty store, so the shipped pickle is served whatever ./models holds
+    predictor = Predictor(store=ModelStore(tmp_path_factory.mktemp("models")))
+    with PredictionService(predictor, port=0, max_wait=0.001) as service:
+        yield service
+
+
+def post(service, payload):
+    return requests.post(service.url + "/predict", json=payload, timeout=10)
+
+
+def test_valid_profile_is_scored(service):
+    response = post(service, PROFILE)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["prediction"] in (0, 1) and 0 <= body["probability"] <= 1
+    assert body["model_version"] == "shipped" and "remapped" not in body
+
+
+def test_invalid_profile_lists_every_problem(service):
+    response = post(service, {**PROFILE, "cgpa": 12, "gre": [1, 2], "pref_country": "Canada"})
+    assert response.status_code == 400
+    assert response.json()["problems"] == [
+        "CGPA: expected between 0 and 10, got 12",
+        "Preferred Country: unknown 'Canada'; expected one of USA, UK, Germany, India, Other",
+        "GRE Score: expected a single value, got list",
+    ]
+
+
+@pytest.mark.parametrize("data", [b"[1, 2]", b"{not json", b""])
+def test_non_object_bodies_are_bad_requests(service, data):
+    response = requests.post(service.url + "/predict", data=data, timeout=10)
+    assert response.status_code == 400 and "error" in response.json()
+
+
+def test_unknown_paths_are_not_found(service):
+    assert requests.get(service.url + "/nowhere", timeout=10).status_code == 404
+    assert requests.post(service.url + "/score", json=PROFILE, timeout=10).status_code == 404
+
+
+def test_scoring_failure_is_a_json_500(service, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("model exploded")
+
+    monkeypatch.setattr(service.predictor.current().model, "predict_proba", broken)
+    response = post(service, PROFILE)
+    assert response.status_code == 500
+    assert response.json() == {"error": "Internal error: RuntimeError"}
+
+
+def test_health_and_metrics(service):
+    assert requests.get(service.url + "/health", timeout=10).json() == {
+        "status": "ok", "model_version": "shipped"}
+    metrics = requests.get(service.url + "/metrics", timeout=10).json()
+    assert metrics["requests"] >= 1 and metrics["batches"] >= 1
+    prometheus = requests.get(service.url + "/metrics/prometheus", timeout=10)
+    assert prometheus.status_code == 200
+    assert prometheus.headers["Content-Type"].startswith("text/plain")
@@ -0,0 +1,80 @@
+import logging
+import sys
+import threading
+
+import pytest
+
+from gradguide import telemetry
+
+
+class Interrupted(BaseException):
+    """Stands in for Streamlit's RerunException/StopException."""
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    monkeypatch.setenv("GRADGUIDE_PROFILE", "cprofile")
+    monkeypatch.setenv("GRADGUIDE_PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_profile_is_written_when_the_block_is_interrupted(profiles):
+    with pytest.raises(Interrupted):
+        with telemetry.profile("Career Prediction") as rerun:
+            raise Interrupted
+    assert sys.getprofile() is None
+    assert rerun.path.name.endswith("-Career-Prediction-interrupted.prof")
+
+    # The next rerun profiles again
+    with telemetry.profile("Career Prediction") as rerun:
+        pass
+    assert rerun.path.name.endswith("-Career-Prediction.prof")
+    assert len(list(profiles.iterdir())) == 2
+
+
+def test_profiled_fragment_inside_a_running_profile_adds_no_second_profiler(profiles):
+    @telemetry.profiled("fragment-demo")
+    def fragment():
+        return telemetry.start_profile()
+
+    with telemetry.profile("Progress Tracker") as rerun:
+        assert fragment() is None
+    assert [path.name for path in profiles.iterdir()] == [rerun.path.name]
+
+
+def test_one_profile_at_a_time_across_threads(profiles):
+    # Sessions run on their own threads; a second cProfile must not be enabled meanwhile
+    started, release = threading.Event(), threading.Event()
+
+    def session():
+        with telemetry.profile("other session"):
+            started.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=session)
+    thread.start()
+    started.wait(5)
+    try:
+        assert telemetry.start_profile() is None
+    finally:
+        release.set()
+        thread.join()
+    profiler = telemetry.start_profile()
+    assert profiler is not None
+    telemetry.stop_profile(profiler)
+
+
+def test_unknown_profiler_warns_and_leaves_profiling_off(monkeypatch, caplog):
+    monkeypatch.setenv("GRADGUIDE_PROFILE", "cprofle")
+    with caplog.at_level(logging.WARNING, logger="gradguide.telemetry"):
+        assert telemetry.profile_mode() is None
+        with telemetry.profile("Career Prediction") as rerun:
+            pass
+    assert rerun.path is None
+    assert "cprofle" in caplog.text
+
+
+def test_profiling_off_runs_the_function_unprofiled(monkeypatch):
+    monkeypatch.delenv("GRADGUIDE_PROFILE", raising=False)
+    assert telemetry.profiled("fragment-demo")(lambda: 42)() == 42
+    assert telemetry.start_profile() is None
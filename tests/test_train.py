@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pytest
+
+from gradguide.core import Predictor
+from gradguide.train import TARGET_COLUMN, fit, promote
+from gradguide.versions import METRICS_NAME, ModelStore
+from tests.support.profiles import PROFILE, synthetic_profiles
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ModelStore(tmp_path / "models")
+
+
+@pytest.fixture
+def outcomes(tmp_path):
+    path = tmp_path / "outcomes.csv"
+    frame = synthetic_profiles(400)
+    # A rule a small forest learns exactly: strong GRE means MS abroad
+    frame[TARGET_COLUMN] = np.where(frame["GRE Score"] >= 170, "MS (Abroad)", "MTech (India)")
+    frame.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_promoted_version_is_picked_up_by_refresh(store, outcomes, fast):
+    predictor = Predictor(fast=fast, store=store, refresh_interval=0)
+    assert predictor.version is None
+
+    version, metrics = fit(outcomes, store, n_jobs=1, n_estimators=5)
+    assert version == "v0001" and metrics["data"]["rows"] == 400
+    # Published but not promoted: still serving the shipped pickle
+    assert predictor.refresh(force=True) is False
+
+    assert promote(version, store) == []
+    assert predictor.refresh(force=True) is True
+    assert predictor.version == "v0001"
+    assert predictor.current().load_report["version"] == "v0001"
+    assert predictor.predict(**{**PROFILE, "gre": 330}) == 1
+    assert predictor.predict(**{**PROFILE, "gre": 20}) == 0
+
+
+def test_promote_refuses_a_less_accurate_version(store, outcomes):
+    first, _ = fit(outcomes, store, n_jobs=1, n_estimators=5)
+    promote(first, store)
+    second, _ = fit(outcomes, store, n_jobs=1, n_estimators=5)
+    # Pretend the serving version scored better on its hold-out set
+    path = store.path(first) / METRICS_NAME
+    metrics = json.loads(path.read_text())
+    metrics["quality"]["accuracy"] += 0.1
+    path.write_text(json.dumps(metrics))
+
+    problems = promote(second, store)
+    assert any(problem.startswith("hold-out accuracy") for problem in problems)
+    assert store.current() == first
+    promote(second, store, force=True)
+    assert store.current() == second
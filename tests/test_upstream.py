@@ -0,0 +1,193 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+from gradguide.upstream import CircuitBreaker, CircuitOpenError, UniversityClient
+from tests.support.hipolabs import StubHipolabs
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "universities.json"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def stub():
+    with StubHipolabs(json.loads(FIXTURE.read_text())) as server:
+        yield server
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def client(stub, clock):
+    client = UniversityClient(stub.url, failure_threshold=2, reset_timeout=30, fresh_ttl=60,
+                              stale_ttl=3600, clock=clock)
+    yield client
+    client.close()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_search_returns_stub_results(client):
+    names = [record["name"] for record in client.search(country="Germany")]
+    assert names == ["Technische Universität München", "RWTH Aachen University"]
+
+
+def test_breaker_opens_after_repeated_failures(client, stub):
+    stub.failure_rate = 1.0
+    for country in ("India", "Canada"):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.search(country=country)
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # Refused without touching the service, as a RequestException callers already handle
+    with pytest.raises(CircuitOpenError):
+        client.search(country="Germany")
+    assert isinstance(CircuitOpenError(), requests.exceptions.RequestException)
+    assert stub.requests == 2
+    assert client.stats()["short_circuited"] == 1
+
+
+def test_half_open_trial_success_closes_breaker(client, stub, clock):
+    stub.failure_rate = 1.0
+    for country in ("India", "Canada"):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.search(country=country)
+
+    clock.now += 30
+    assert client.breaker.state == CircuitBreaker.HALF_OPEN
+    stub.failure_rate = 0.0
+    assert len(client.search(country="India")) == 2
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    assert len(client.search(country="Canada")) == 1
+
+
+def test_half_open_trial_failure_reopens_breaker(client, stub, clock):
+    stub.failure_rate = 1.0
+    for country in ("India", "Canada"):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.search(country=country)
+
+    clock.now += 30
+    # One failed trial is enough to open again, and for another full timeout
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.search(country="India")
+    assert client.breaker.state == CircuitBreaker.OPEN
+    clock.now += 29
+    with pytest.raises(CircuitOpenError):
+        client.search(country="India")
+    assert stub.requests == 3
+
+
+def test_half_open_lets_one_trial_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_success()
+    assert breaker.allow() is True
+
+
+def test_concurrent_misses_share_one_upstream_call(client, stub):
+    stub.latency = 0.3
+    start = threading.Barrier(8)
+    results = []
+
+    def search():
+        start.wait()
+        results.append(client.search(country="United States"))
+
+    threads = [threading.Thread(target=search) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stub.requests == 1
+    assert len(results) == 8
+    assert all(result == results[0] and len(result) == 3 for result in results)
+    stats = client.stats()
+    assert stats["upstream_calls"] == 1
+    assert stats["coalesced"] == 7
+
+
+def test_concurrent_failure_reaches_every_waiter(client, stub):
+    stub.latency = 0.3
+    stub.failure_rate = 1.0
+    start = threading.Barrier(4)
+    errors = []
+
+    def search():
+        start.wait()
+        try:
+            client.search(country="India")
+        except requests.exceptions.RequestException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stub.requests == 1
+    assert len(errors) == 4
+
+
+def test_stale_response_served_while_revalidation_fails(client, stub, clock):
+    fresh = client.search(country="India")
+    assert stub.requests == 1
+
+    # Within fresh_ttl: answered from memory
+    clock.now += 59
+    assert client.search(country="India") == fresh
+    assert stub.requests == 1
+
+    # Stale and the service is down: still answered, refreshed in the background
+    clock.now += 2
+    stub.failure_rate = 1.0
+    assert client.search(country="India") == fresh
+    wait_for(lambda: stub.requests == 2 and not client._in_flight)
+    assert client.search(country="India") == fresh
+    assert client.stats()["stale_served"] == 2
+
+
+def test_stale_response_replaced_once_revalidated(client, stub, clock):
+    client.search(country="India")
+    # The service dropped one Indian university and the Canadian one
+    stub.records = stub.records[:-2]
+    clock.now += 61
+    client.search(country="Canada")
+    assert client.search(country="Canada") == []
+    assert len(client.search(country="India")) == 2
+    wait_for(lambda: stub.requests == 3 and not client._in_flight)
+    assert len(client.search(country="India")) == 1
+
+
+def test_stale_entries_expire(client, stub, clock):
+    client.search(country="India")
+    clock.now += 3600
+    stub.failure_rate = 1.0
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.search(country="India")
@@ -0,0 +1,59 @@
+import json
+import logging
+
+import pytest
+
+from gradguide.core import Predictor
+from gradguide.versions import METRICS_NAME, MODEL_NAME, ModelStore, VersionError
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ModelStore(tmp_path / "models")
+
+
+def staged(store, model=b""):
+    staging = store.staging()
+    (staging / METRICS_NAME).write_text(json.dumps({"quality": {"accuracy": 1.0}}))
+    (staging / MODEL_NAME).write_bytes(model)
+    return staging
+
+
+def test_publish_numbers_versions_in_order(store):
+    assert [store.publish(staged(store)) for _ in range(3)] == ["v0001", "v0002", "v0003"]
+    assert store.versions() == ["v0001", "v0002", "v0003"]
+    assert store.current() is None
+
+
+def test_publish_never_lands_on_a_leftover_directory(store):
+    store.publish(staged(store))
+    # An empty directory left by a crashed run; os.rename would silently replace it
+    (store.root / "v0002").mkdir()
+    assert store.publish(staged(store)) == "v0003"
+    assert list((store.root / "v0002").iterdir()) == []
+
+
+def test_publish_refuses_an_incomplete_staging_directory(store):
+    staging = store.staging()
+    with pytest.raises(VersionError):
+        store.publish(staging)
+
+
+def test_refresh_keeps_serving_when_a_promoted_pickle_is_broken(store, caplog):
+    predictor = Predictor(store=store, refresh_interval=0)
+    before = predictor.predict(cgpa=8.5, gre=320, toefl=110, gate_score=0, sop=4, lor=4,
+                               univ_rating=4, chance=0.8, research="Yes",
+                               career_goal="Research", budget=60, pref_country="USA")
+    store.promote(store.publish(staged(store, model=b"\x80\x04truncated")))
+
+    with caplog.at_level(logging.ERROR, logger="gradguide.core"):
+        assert predictor.refresh(force=True) is False
+    assert predictor.version is None
+    assert "v0001" in caplog.text
+    # Not retried on every rerun
+    caplog.clear()
+    assert predictor.refresh(force=True) is False
+    assert caplog.text == ""
+    assert predictor.predict(cgpa=8.5, gre=320, toefl=110, gate_score=0, sop=4, lor=4,
+                             univ_rating=4, chance=0.8, research="Yes",
+                             career_goal="Research", budget=60, pref_country="USA") == before